@@ -15,6 +15,7 @@ from arelle.Locale import getLanguageCodes
 from arelle import PluginManager, PackageManager
 from collections import defaultdict
 osPrcs = None
+currentMemoryProbe = None # function measuring current resident memory, chosen on first use
 isPy3 = (sys.version[0] >= '3')
 
 class Cntlr:
@@ -509,6 +510,54 @@ class Cntlr:
             pass
         return 0
 
+    @property
+    def currentMemoryUsed(self):
+        """(int) -- KB of memory now resident for this process (memoryUsed is the peak on unix, which never goes down),
+        0 if it can not be measured on this platform (the measuring method is chosen on first use and reused)"""
+        global currentMemoryProbe
+        if currentMemoryProbe is None:
+            currentMemoryProbe = self.currentMemoryProbe()
+        try:
+            return currentMemoryProbe()
+        except Exception:
+            currentMemoryProbe = lambda: 0 # don't retry a failing method
+        return 0
+    
+    def currentMemoryProbe(self):
+        # returns a function measuring current resident memory KB, which returns 0 if no method works
+        try:
+            if self.isMSW:
+                probe = lambda: self.memoryUsed # working set size is current usage
+            elif sys.platform.startswith("linux"):
+                pageKB = os.sysconf("SC_PAGE_SIZE") // 1024
+                def probe():
+                    with open("/proc/self/statm") as fh:
+                        return int(fh.read().split()[1]) * pageKB
+            elif sys.platform == "darwin": # mach task info, without spawning a ps process on every use
+                import ctypes, ctypes.util
+                class TimeValue(ctypes.Structure):
+                    _fields_ = [("seconds", ctypes.c_int), ("microseconds", ctypes.c_int)]
+                class MachTaskBasicInfo(ctypes.Structure):
+                    _fields_ = [("virtual_size", ctypes.c_uint64), ("resident_size", ctypes.c_uint64),
+                                ("resident_size_max", ctypes.c_uint64), ("user_time", TimeValue),
+                                ("system_time", TimeValue), ("policy", ctypes.c_int), ("suspend_count", ctypes.c_int)]
+                libc = ctypes.CDLL(ctypes.util.find_library("c"))
+                libc.mach_task_self.restype = ctypes.c_uint
+                taskInfo = MachTaskBasicInfo()
+                MACH_TASK_BASIC_INFO = 20
+                def probe():
+                    count = ctypes.c_uint(ctypes.sizeof(taskInfo) // 4)
+                    if libc.task_info(libc.mach_task_self(), MACH_TASK_BASIC_INFO, ctypes.byref(taskInfo), ctypes.byref(count)) != 0:
+                        raise OSError("task_info unsuccessful")
+                    return taskInfo.resident_size // 1024
+            else: # solaris
+                probe = lambda: int(subprocess.getoutput("ps -p {0} -o rss".format(os.getpid())).rpartition('\n')[2])
+            if probe() > 0:
+                return probe
+        except Exception:
+            pass
+        return lambda: 0
+
 class LogFormatter(logging.Formatter):
     def __init__(self, fmt=None, datefmt=None):
         super(LogFormatter, self).__init__(fmt, datefmt)
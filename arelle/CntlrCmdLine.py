@@ -15,7 +15,7 @@ from optparse import OptionParser, SUPPRESS_HELP
 from arelle import (Cntlr, FileSource, ModelDocument, XmlUtil, Version, 
                     ViewFileDTS, ViewFileFactList, ViewFileFactTable, ViewFileConcepts, 
                     ViewFileFormulae, ViewFileRelationshipSet, ViewFileTests, ViewFileRssFeed,
-                    ViewFileRoleTypes,
+                    ViewFileRoleTypes, ViewFileFormulaProfile,
                     ModelManager)
 from arelle.ModelValue import qname
 from arelle.Locale import format_string
@@ -211,6 +211,11 @@ def parseAndRun(args):
     parser.add_option("--formulavarsetexprresult", action="store_true", dest="formulaVarSetExprResult", help=SUPPRESS_HELP)
     parser.add_option("--formulaVarSetTiming", action="store_true", dest="timeVariableSetEvaluation", help=_("Specify showing times of variable set evaluation."))
     parser.add_option("--formulavarsettiming", action="store_true", dest="timeVariableSetEvaluation", help=SUPPRESS_HELP)
+    parser.add_option("--formulaProfile", action="store", dest="formulaProfileFile",
+                      help=_("Write per variable set profile statistics (compile and evaluation times, evaluations, "
+                             "skipped evaluations, filter times, output facts and memory) of running formulas into FILE "
+                             "(.csv or .json to sort by any column, or .html or .xml)."))
+    parser.add_option("--formulaprofile", action="store", dest="formulaProfileFile", help=SUPPRESS_HELP)
     parser.add_option("--formulaAsserResultCounts", action="store_true", dest="formulaAsserResultCounts", help=_("Specify formula tracing."))
     parser.add_option("--formulaasserresultcounts", action="store_true", dest="formulaAsserResultCounts", help=SUPPRESS_HELP)
     parser.add_option("--formulaFormulaRules", action="store_true", dest="formulaFormulaRules", help=_("Specify formula tracing."))
@@ -252,6 +257,18 @@ def parseAndRun(args):
     parser.add_option("--internetLogDownloads", action="store_true", dest="internetLogDownloads", 
                       help=_("Log info message for downloads to web cache."))
     parser.add_option("--internetlogdownloads", action="store_true", dest="internetLogDownloads", help=SUPPRESS_HELP)
+    parser.add_option("--webCacheStore", action="store", dest="webCacheStore", 
+                      help=_("Specify a single-file (sqlite) store for web cache contents and check times, "
+                             "such as one shared by multiple processes, instead of a file per cached url "
+                             "(documents are loaded from the store, files are only written in the cache directory "
+                             "for plug-ins, packages and archives).  "
+                             "For a store on a network file system (such as NFS) also specify --webCacheStoreShared."))
+    parser.add_option("--webcachestore", action="store", dest="webCacheStore", help=SUPPRESS_HELP)
+    parser.add_option("--webCacheStoreShared", action="store_true", dest="webCacheStoreShared", 
+                      help=_("The web cache store is on a network file system shared by hosts (such as NFS), "
+                             "use lock files (instead of sqlite's file system locks, unreliable on NFS) "
+                             "and no memory mapping.  Requires Python 3.4 or later."))
+    parser.add_option("--webcachestoreshared", action="store_true", dest="webCacheStoreShared", help=SUPPRESS_HELP)
     parser.add_option("--xdgConfigHome", action="store", dest="xdgConfigHome", 
                       help=_("Specify non-standard location for configuration and cache files (overrides environment parameter XDG_CONFIG_HOME)."))
     parser.add_option("--plugins", action="store", dest="plugins",
@@ -275,9 +292,30 @@ def parseAndRun(args):
                              "URLs are full absolute paths.  "
                              "If + is omitted from package file nothing is saved (same as temp).  " ))
     parser.add_option("--abortOnMajorError", action="store_true", dest="abortOnMajorError", help=_("Abort process on major error, such as when load is unable to find an entry or discovered file."))
+    parser.add_option("--precomputeConcepts", action="store_true", dest="precomputeConcepts", 
+                      help=_("Resolve type, substitution group and derived properties of all concepts when the DTS is loaded, "
+                             "instead of lazily when first used."))
+    parser.add_option("--precomputeconcepts", action="store_true", dest="precomputeConcepts", help=SUPPRESS_HELP)
     parser.add_option("--showEnvironment", action="store_true", dest="showEnvironment", help=_("Show Arelle's config and cache directory and host OS environment parameters."))
     parser.add_option("--showenvironment", action="store_true", dest="showEnvironment", help=SUPPRESS_HELP)
     parser.add_option("--collectProfileStats", action="store_true", dest="collectProfileStats", help=_("Collect profile statistics, such as timing of validation activities and formulae."))
+    parser.add_option("--collectProfileAllocations", action="store_true", dest="collectProfileAllocations", 
+                      help=_("Collect profile statistics with the top memory allocation sites of each profiled phase "
+                             "(load, validation, calculations, formula, views) using python tracemalloc (slows processing)."))
+    parser.add_option("--profileStatsFile", action="store", dest="profileStatsFile", 
+                      help=_("Write collected profile statistics, with allocation sites if collected, as JSON into FILE."))
+    parser.add_option("--gcPolicy", choices=("immediate", "models", "memory"), dest="gcPolicy", 
+                      help=_("Specify when garbage of closed models is collected: immediate (default, whenever a loaded model is closed), "
+                             "models (after every --gcModels models have closed, for batch, RSS and conformance runs), "
+                             "or memory (when a model closes and resident memory exceeds --gcMemoryThreshold).  "
+                             "Deferred collections report resident memory before and after collection."))
+    parser.add_option("--gcpolicy", choices=("immediate", "models", "memory"), action="store", dest="gcPolicy", help=SUPPRESS_HELP)
+    parser.add_option("--gcModels", type="int", dest="gcModels", 
+                      help=_("Number of closed models between garbage collections for --gcPolicy models (default 10)."))
+    parser.add_option("--gcmodels", type="int", action="store", dest="gcModels", help=SUPPRESS_HELP)
+    parser.add_option("--gcMemoryThreshold", type="int", dest="gcMemoryThreshold", 
+                      help=_("Resident memory in MB above which garbage is collected for --gcPolicy memory (default 1024)."))
+    parser.add_option("--gcmemorythreshold", type="int", action="store", dest="gcMemoryThreshold", help=SUPPRESS_HELP)
     if hasWebServer:
         parser.add_option("--webserver", action="store", dest="webserver",
                           help=_("start web server on host:port[:server] for REST and web access, e.g., --webserver locahost:8080, "
@@ -376,7 +414,7 @@ def parseAndRun(args):
         if any((options.entrypointFile, options.importFiles, options.diffFile, options.versReportFile,
                 options.factsFile, options.factListCols, options.factTableFile,
                 options.conceptsFile, options.preFile, options.calFile, options.dimFile, options.formulaeFile, options.viewArcrole, options.viewFile,
-                options.roleTypesFile, options.arcroleTypesFile
+                options.roleTypesFile, options.arcroleTypesFile, options.formulaProfileFile
                 )):
             parser.error(_("incorrect arguments with --webserver, please try\n  python CntlrCmdLine.py --help"))
         else:
@@ -608,8 +646,46 @@ class CntlrCmdLine(Cntlr.Cntlr):
             self.modelManager.validateInfoset = True
         if options.abortOnMajorError:
             self.modelManager.abortOnMajorError = True
-        if options.collectProfileStats:
+        if options.precomputeConcepts:
+            self.modelManager.precomputeConcepts = True
+        if options.gcPolicy:
+            # web service parameters are not checked by the option choices (and a bare parameter is True)
+            if options.gcPolicy in ("immediate", "models", "memory"):
+                self.modelManager.gcPolicy = options.gcPolicy
+            else:
+                self.addToLog(_("unrecognized --gcPolicy {0}, proceeding with immediate garbage collection").format(options.gcPolicy),
+                              messageCode="info")
+                self.modelManager.gcPolicy = "immediate"
+        if options.gcModels:
+            try: # web service parameters are strings
+                gcModels = int(options.gcModels)
+                if gcModels < 1:
+                    raise ValueError
+                self.modelManager.gcModels = gcModels
+            except (ValueError, TypeError):
+                self.addToLog(_("invalid --gcModels {0}, proceeding with {1} closed models between garbage collections").format(
+                              options.gcModels, self.modelManager.gcModels),
+                              messageCode="info")
+        if options.gcMemoryThreshold:
+            try:
+                gcMemoryThreshold = int(options.gcMemoryThreshold)
+                if gcMemoryThreshold < 1:
+                    raise ValueError
+                self.modelManager.gcMemoryThreshold = gcMemoryThreshold * 1024 # KB
+            except (ValueError, TypeError):
+                self.addToLog(_("invalid --gcMemoryThreshold {0}, proceeding with {1} MB").format(
+                              options.gcMemoryThreshold, self.modelManager.gcMemoryThreshold // 1024),
+                              messageCode="info")
+        if options.collectProfileStats or options.collectProfileAllocations or options.profileStatsFile:
             self.modelManager.collectProfileStats = True
+        if options.collectProfileAllocations:
+            try:
+                import tracemalloc
+                if not tracemalloc.is_tracing():
+                    tracemalloc.start()
+                self.modelManager.collectProfileAllocations = True
+            except ImportError:
+                self.addToLog(_("Profile allocations require python 3.4 or later (tracemalloc)"), messageCode="info")
         if options.internetConnectivity == "offline":
             self.webCache.workOffline = True
         elif options.internetConnectivity == "online":
@@ -618,6 +694,8 @@ class CntlrCmdLine(Cntlr.Cntlr):
             self.webCache.timeout = (options.internetTimeout or None)  # use None if zero specified to disable timeout
         if options.internetLogDownloads:
             self.webCache.logDownloads = True
+        if options.webCacheStore:
+            self.webCache.useCacheStore(options.webCacheStore, sharedFileSystem=options.webCacheStoreShared)
         fo = FormulaOptions()
         if options.parameters:
             parameterSeparator = (options.parameterSeparator or ',')
@@ -656,6 +734,8 @@ class CntlrCmdLine(Cntlr.Cntlr):
             fo.traceVariableExpressionResult = True
         if options.timeVariableSetEvaluation:
             fo.timeVariableSetEvaluation = True
+        if options.formulaProfileFile:
+            fo.profileVariableSets = True
         if options.formulaVarFilterWinnowing:
             fo.traceVariableFilterWinnowing = True
         if options.formulaVarFiltersResult:
@@ -782,6 +862,7 @@ class CntlrCmdLine(Cntlr.Cntlr):
                 if options.rssReport:
                     ViewFileRssFeed.viewRssFeed(self.modelManager.modelXbrl, options.rssReport, options.rssReportCols)
                     
+                modelXbrl.profileStat()
                 if options.DTSFile:
                     ViewFileDTS.viewDTS(modelXbrl, options.DTSFile)
                 if options.factsFile:
@@ -804,6 +885,9 @@ class CntlrCmdLine(Cntlr.Cntlr):
                     ViewFileRoleTypes.viewRoleTypes(modelXbrl, options.roleTypesFile, "Role Types", isArcrole=False, lang=options.labelLang)
                 if options.arcroleTypesFile:
                     ViewFileRoleTypes.viewRoleTypes(modelXbrl, options.arcroleTypesFile, "Arcrole Types", isArcrole=True, lang=options.labelLang)
+                if options.formulaProfileFile:
+                    ViewFileFormulaProfile.viewFormulaProfile(modelXbrl, options.formulaProfileFile, lang=options.labelLang)
+                modelXbrl.profileStat(_("views"))
                 for pluginXbrlMethod in pluginClassMethods("CntlrCmdLine.Xbrl.Run"):
                     pluginXbrlMethod(self, options, modelXbrl)
                                         
@@ -819,6 +903,8 @@ class CntlrCmdLine(Cntlr.Cntlr):
             modelXbrl.profileStat(_("total"), time.time() - firstStartedAt)
             if options.collectProfileStats and modelXbrl:
                 modelXbrl.logProfileStats()
+            if options.profileStatsFile and modelXbrl:
+                modelXbrl.saveProfileStats(options.profileStatsFile)
             if not options.keepOpen:
                 if modelDiffReport:
                     self.modelManager.close(modelDiffReport)
@@ -56,6 +56,7 @@ def startWebserver(_cntlr, options):
     app.route('/rest/xbrl/<file:path>/roleTypes', GETorPOST, validation)
     app.route('/rest/xbrl/<file:path>/arcroleTypes', GETorPOST, validation)
     app.route('/rest/xbrl/<file:path>/formulae', GETorPOST, validation)
+    app.route('/rest/xbrl/<file:path>/formulaProfile', GETorPOST, validation)
     app.route('/rest/xbrl/validation', GETorPOST, validation)
     app.route('/rest/xbrl/view', GETorPOST, validation)
     app.route('/rest/xbrl/open', GETorPOST, validation)
@@ -184,7 +185,7 @@ class Options():
         for option, defaultValue in optionsPrototype.items():
             setattr(self, option, defaultValue)
             
-supportedViews = {'DTS', 'concepts', 'pre', 'cal', 'dim', 'facts', 'factTable', 'formulae', 'roleTypes', 'arcroleTypes'}
+supportedViews = {'DTS', 'concepts', 'pre', 'cal', 'dim', 'facts', 'factTable', 'formulae', 'roleTypes', 'arcroleTypes', 'formulaProfile'}
 
 def validation(file=None):
     """REST request to validate, by *get* or *post*, to URL patterns including */rest/xbrl/<file:path>/{open|close|validation|DTS...}*,
@@ -549,7 +550,10 @@ formulaCallExprResult, formulaVarSetExprEval, formulaFormulaRules, formulaVarsOr
 formulaVarExpressionSource, formulaVarExpressionCode, formulaVarExpressionEvaluation, formulaVarExpressionResult, formulaVarFiltersResult, and formulaRunIDs.
 </td></tr>
 <tr><td style="text-indent: 1em;">abortOnMajorError</td><td>Abort process on major error, such as when load is unable to find an entry or discovered file.</td></tr> 
+<tr><td style="text-indent: 1em;">precomputeConcepts</td><td>Resolve type, substitution group and derived properties of all concepts when the DTS is loaded.</td></tr> 
+<tr><td style="text-indent: 1em;">gcPolicy</td><td>When garbage of closed models is collected: immediate (default), models (every gcModels closed models), or memory (when resident memory exceeds gcMemoryThreshold MB).</td></tr> 
 <tr><td style="text-indent: 1em;">collectProfileStats</td><td>Collect profile statistics, such as timing of validation activities and formulae.</td></tr> 
+<tr><td style="text-indent: 1em;">collectProfileAllocations</td><td>Collect profile statistics with top memory allocation sites of each profiled phase (slows processing).</td></tr> 
 <tr><td style="text-indent: 1em;">plugins</td><td>Activate plug-ins, specify  '|' separated .py modules (relative to plug-in directory).</td></tr>
 <tr><td style="text-indent: 1em;">packages</td><td>Activate taxonomy packages, specify  '|' separated .zip packages (absolute URLs or file paths).</td></tr>
 
@@ -565,7 +569,8 @@ as follows:</td></tr>
 <tr><th colspan="2">Views</th></tr>
 <tr><td>/rest/xbrl/{file}/{view}</td><td>View document at {file}.</td></tr>
 <tr><td>\u00A0</td><td>{file} may be local or web url, and may have "/" characters replaced by ";" characters (but that is not necessary).</td></tr>
-<tr><td>\u00A0</td><td>{view} may be <code>DTS</code>, <code>concepts</code>, <code>pre</code>, <code>cal</code>, <code>dim</code>, <code>facts</code>, <code>factTable</code>, <code>formulae</code>, <code>roleTypes</code>, or <code>arcroleTypes</code>.</td></tr>
+<tr><td>\u00A0</td><td>{view} may be <code>DTS</code>, <code>concepts</code>, <code>pre</code>, <code>cal</code>, <code>dim</code>, <code>facts</code>, <code>factTable</code>, <code>formulae</code>, <code>roleTypes</code>, <code>arcroleTypes</code>, or <code>formulaProfile</code> 
+(per variable set formula profile statistics, with <code>flavor=formula-compile-and-run</code>).</td></tr>
 <tr><td style="text-align=right;">Example:</td><td><code>/rest/xbrl/c:/a/b/c.xbrl/dim?media=html</code>: View dimensions of 
 document at c:/a/b/c.xbrl (on local drive) and return html result.</td></tr>
 <tr><td>/rest/xbrl/view</td><td>(Alternative syntax) View document, file and view are provided as parameters (see below).</td></tr>
@@ -691,6 +691,7 @@ class CntlrWinMain (Cntlr.Cntlr):
                 modelXbrl = self.modelManager.modelXbrl
                 if modelXbrl:
                     ModelDocument.load(modelXbrl, filesource.url)
+                    modelXbrl.clearLabelIndex() # open views may still refer to the prior relationship sets
                     modelXbrl.relationshipSets.clear() # relationships have to be re-cached
             else:
                 action = _("loaded")
@@ -223,6 +223,7 @@ class DialogPackageManager(Toplevel):
         if self.packagesConfigChanged:
             PackageManager.packagesConfig = self.packagesConfig
             PackageManager.packagesConfigChanged = True
+            PackageManager.packagesRemappings = None # remappings rebuilt from changed packages config
             self.cntlr.onPackageEnablementChanged()
         self.close()
         
@@ -8,7 +8,7 @@ import os, re
 from collections import defaultdict
 from lxml import etree
 from arelle import UrlUtil
-from arelle.UrlUtil import isHttpUrl
+from arelle.UrlUtil import isHttpUrl, UrlPrefixRemappings
 
 def compileAttrPattern(elt, attrName, flags=None):
     attr = elt.get(attrName)
@@ -62,6 +62,7 @@ class DisclosureSystem:
         self.mappingsUrl = os.path.join(self.modelManager.cntlr.configDir, "mappings.xml")
         self.mappedFiles = {}
         self.mappedPaths = []
+        self.pathRemappings = None # UrlPrefixRemappings of mappedPaths, built on first use
         self.utrUrl = "http://www.xbrl.org/utr/utr.xml"
         self.utrTypeEntries = None
         self.identifierSchemePattern = None
@@ -272,21 +273,26 @@ class DisclosureSystem:
                 self.mappedFiles[elt.get("from")] = elt.get("to")
             for elt in xmldoc.iter(tag="mapPath"):
                 self.mappedPaths.append((elt.get("from"), elt.get("to")))
+            self.pathRemappings = None
         except (EnvironmentError,
                 etree.LxmlError) as err:
             self.modelManager.cntlr.addToLog("{0}: import error: {1}".format(basename,err))
             etree.clear_error_log()
             
-    def mappedUrl(self, url):
+    def remappedUrl(self, url):
+        """(str) -- url remapped by mapFile or mapPath mappings, or None if not remapped"""
         if url in self.mappedFiles:
-            mappedUrl = self.mappedFiles[url]
-        else:  # handle mapped paths
-            mappedUrl = url
-            for mapFrom, mapTo in self.mappedPaths:
-                if url.startswith(mapFrom):
-                    mappedUrl = mapTo + url[len(mapFrom):]
-                    break
-        return mappedUrl
+            return self.mappedFiles[url]
+        # handle mapped paths
+        if self.pathRemappings is None:
+            self.pathRemappings = UrlPrefixRemappings(self.mappedPaths)
+        return self.pathRemappings.mappedUrl(url)
+
+    def mappedUrl(self, url):
+        remappedUrl = self.remappedUrl(url)
+        if remappedUrl is None:
+            return url
+        return remappedUrl
 
     def uriAuthorityValid(self, uri):
         return UrlUtil.authority(uri) in self.standardAuthorities
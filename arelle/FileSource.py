@@ -8,7 +8,7 @@ import zipfile, tarfile, os, io, base64, gzip, zlib, re, struct, random, time
 from lxml import etree
 from arelle import XmlUtil
 from arelle.PackageManager import parsePackage
-from arelle.UrlUtil import isHttpUrl
+from arelle.UrlUtil import isHttpUrl, UrlPrefixRemappings
 
 archivePathSeparators = (".zip" + os.sep, ".tar.gz" + os.sep, ".eis" + os.sep, ".xml" + os.sep, ".xfd" + os.sep, ".frm" + os.sep, '.taxonomyPackage.xml' + os.sep) + \
                         ((".zip/", ".tar.gz/", ".eis/", ".xml/", ".xfd/", ".frm/", '.taxonomyPackage.xml/') if os.sep != "/" else ()) #acomodate windows and http styles
@@ -325,19 +325,29 @@ class FileSource:
     def isInArchive(self,filepath):
         return self.fileSourceContainingFilepath(filepath) is not None
     
+    @property
+    def mappedPaths(self):
+        return self._mappedPaths
+    
+    @mappedPaths.setter
+    def mappedPaths(self, mappedPaths):
+        self._mappedPaths = mappedPaths
+        self._remappings = UrlPrefixRemappings(mappedPaths.items()) if mappedPaths else None
+    
+    def remappedUrl(self, url):
+        """(str) -- url remapped by taxonomy package of this file source, or None if not remapped"""
+        if self._remappings is not None:
+            return self._remappings.mappedUrl(url)
+        return None
+    
     def isMappedUrl(self, url):
-        if self.mappedPaths is not None:
-            return any(url.startswith(mapFrom) 
-                       for mapFrom in self.mappedPaths)
-        return False        
+        return self.remappedUrl(url) is not None
 
     def mappedUrl(self, url):
-        if self.mappedPaths:
-            for mapFrom, mapTo in self.mappedPaths.items():
-                if url.startswith(mapFrom):
-                    url = mapTo + url[len(mapFrom):]
-                    break
-        return url
+        remappedUrl = self.remappedUrl(url)
+        if remappedUrl is None:
+            return url
+        return remappedUrl
     
     def fileSourceContainingFilepath(self, filepath):
         if self.isOpen:
@@ -539,7 +549,7 @@ class FileSource:
             
 def openFileStream(cntlr, filepath, mode='r', encoding=None):
     if isHttpUrl(filepath) and cntlr:
-        filepath = cntlr.webCache.getfilename(filepath)
+        filepath = cntlr.webCache.getfilename(filepath, storedContentOk=True)
     # file path may be server (or memcache) or local file system
     if filepath.startswith(SERVER_WEB_CACHE) and cntlr:
         filestream = None
@@ -559,6 +569,12 @@ def openFileStream(cntlr, filepath, mode='r', encoding=None):
             filestream.close()
             filestream = FileNamedStringIO(filepath, contents.decode(encoding or 'utf-8'))
         return filestream
+    # web cache store content (not in a per-url file)
+    storedContent = cntlr.webCache.storedContent(filepath) if cntlr and cntlr.webCache.cacheStore is not None else None
+    if storedContent is not None:
+        if 'b' in mode:
+            return io.BytesIO(storedContent)
+        return FileNamedStringIO(filepath, storedContent.decode(encoding or XmlUtil.encoding(storedContent)))
     # local file system
     elif encoding is None and 'b' not in mode:
         openedFileStream = io.open(filepath, mode='rb')
@@ -576,7 +592,8 @@ def openXmlFileStream(cntlr, filepath, stripDeclaration=False):
     # check encoding
     hdrBytes = openedFileStream.read(512)
     encoding = XmlUtil.encoding(hdrBytes)
-    if encoding.lower() in ('utf-8','utf8','utf-8-sig') and (cntlr is None or not cntlr.isGAE) and not stripDeclaration:
+    if (encoding.lower() in ('utf-8','utf8','utf-8-sig') and (cntlr is None or not cntlr.isGAE) and not stripDeclaration and
+        not isinstance(openedFileStream, io.BytesIO)): # reopen only files, not web cache store contents
         text = None
         openedFileStream.close()
     else:
@@ -23,6 +23,27 @@ ModelDimensionValue = None
 
 expressionVariablesPattern = re.compile(r"([^$]*)([$]\w[\w:.-]*)([^$]*)")
 
+class VariableSetProfile():
+    """Compilation and evaluation statistics of a variable set, collected when formulaOptions.profileVariableSets"""
+    __slots__ = ("compileTime", "evaluationTime", "evaluations", "skippedEvaluations", "preconditionBlockedEvaluations",
+                 "filterTimes", "filterCalls", "filterTime", "filterDepth", "implicitFilterTime", "outputFacts", 
+                 "memoryChange")
+    def __init__(self):
+        self.compileTime = self.evaluationTime = self.implicitFilterTime = 0.0
+        self.evaluations = self.skippedEvaluations = self.preconditionBlockedEvaluations = self.outputFacts = 0
+        self.filterTimes = defaultdict(float) # by filter object, including time of boolean filters' sub-filters
+        self.filterCalls = defaultdict(int)
+        self.filterTime = 0.0 # time of top level filters (sub-filter time is within their boolean filter's time)
+        self.filterDepth = 0 # nesting of boolean filters being filtered
+        self.memoryChange = 0 # KB change of resident memory during evaluations
+        
+def variableSetProfile(modelXbrl, varSet):
+    try:
+        return modelXbrl.variableSetProfiles[varSet]
+    except KeyError:
+        profile = modelXbrl.variableSetProfiles[varSet] = VariableSetProfile()
+        return profile
+
 def evaluate(xpCtx, varSet, variablesInScope=False, uncoveredAspectFacts=None):
     # for each dependent variable, find bindings
     if variablesInScope:
@@ -38,6 +59,9 @@ def evaluate(xpCtx, varSet, variablesInScope=False, uncoveredAspectFacts=None):
             varSet.evaluationsCount = 0
         if xpCtx.formulaOptions.timeVariableSetEvaluation:
             varSet.timeEvaluationStarted = timeEvaluationsStarted = time.time()
+        if xpCtx.formulaOptions.profileVariableSets:
+            profileEvaluationStarted = time.time()
+            profileMemoryStarted = xpCtx.modelXbrl.modelManager.cntlr.currentMemoryUsed
         varSet.evaluationNumber = 0
         initialTraceCount = xpCtx.modelXbrl.logCount.get(logging.getLevelName('INFO'), 0)
         evaluateVar(xpCtx, varSet, 0, {}, uncoveredAspectFacts)
@@ -79,6 +103,10 @@ def evaluate(xpCtx, varSet, variablesInScope=False, uncoveredAspectFacts=None):
                  _("Variable set %(xlinkLabel)s time for %(count)s evaluations: %(time)s"), 
                  modelObject=varSet, xlinkLabel=varSet.xlinkLabel, count=varSet.evaluationNumber,
                  time=format_string(xpCtx.modelXbrl.modelManager.locale, "%.3f", time.time() - timeEvaluationsStarted))
+        if xpCtx.formulaOptions.profileVariableSets:
+            profile = variableSetProfile(xpCtx.modelXbrl, varSet)
+            profile.evaluationTime += time.time() - profileEvaluationStarted
+            profile.memoryChange += xpCtx.modelXbrl.modelManager.cntlr.currentMemoryUsed - profileMemoryStarted
         xpCtx.variableSet = None
     except XPathContext.XPathException as err:
         xpCtx.modelXbrl.error(err.code,
@@ -115,6 +143,8 @@ def evaluateVar(xpCtx, varSet, varIndex, cachedFilteredFacts, uncoveredAspectFac
                 xpCtx.modelXbrl.info("formula:trace",
                      _("Variable set %(xlinkLabel)s skipped evaluation, all fact variables have fallen back"),
                      modelObject=varSet, xlinkLabel=varSet.xlinkLabel)
+            if xpCtx.formulaOptions.profileVariableSets:
+                variableSetProfile(xpCtx.modelXbrl, varSet).skippedEvaluations += 1
             return
         # record completed evaluation, for fallback blocking purposes
         fbVars = set(vb.qname for vb in xpCtx.varBindings.values() if vb.isFallback)
@@ -132,6 +162,8 @@ def evaluateVar(xpCtx, varSet, varIndex, cachedFilteredFacts, uncoveredAspectFac
                      modelObject=varSet, xlinkLabel=varSet.xlinkLabel, count=varSet.evaluationNumber,
                      time=format_string(xpCtx.modelXbrl.modelManager.locale, "%.3f", now - varSet.timeEvaluationStarted))
                 varSet.timeEvaluationStarted = now
+            if xpCtx.formulaOptions.profileVariableSets:
+                variableSetProfile(xpCtx.modelXbrl, varSet).skippedEvaluations += 1
             if xpCtx.isRunTimeExceeded: raise XPathContext.RunTimeExceededException()
             xpCtx.modelXbrl.profileActivity("...   evaluation {0} (skipped)".format(varSet.evaluationNumber), minTimeToShow=10.0)
             return
@@ -156,6 +188,8 @@ def evaluateVar(xpCtx, varSet, varIndex, cachedFilteredFacts, uncoveredAspectFac
                          modelObject=varSet, xlinkLabel=varSet.xlinkLabel, count=varSet.evaluationNumber,
                          time=format_string(xpCtx.modelXbrl.modelManager.locale, "%.3f", now - varSet.timeEvaluationStarted))
                     varSet.timeEvaluationStarted = now
+                if xpCtx.formulaOptions.profileVariableSets:
+                    variableSetProfile(xpCtx.modelXbrl, varSet).preconditionBlockedEvaluations += 1
                 if xpCtx.isRunTimeExceeded: raise XPathContext.RunTimeExceededException()
                 return
             
@@ -202,6 +236,11 @@ def evaluateVar(xpCtx, varSet, varIndex, cachedFilteredFacts, uncoveredAspectFac
                 from arelle import FormulaConsisAsser
                 FormulaConsisAsser.evaluate(xpCtx, varSet, newFact)
                 
+            if xpCtx.formulaOptions.profileVariableSets:
+                profile = variableSetProfile(xpCtx.modelXbrl, varSet)
+                profile.evaluations += 1
+                if newFact is not None:
+                    profile.outputFacts += 1
             if xpCtx.formulaOptions.timeVariableSetEvaluation:
                 varSet.evaluationNumber += 1
                 now = time.time()
@@ -291,7 +330,12 @@ def evaluateVar(xpCtx, varSet, varIndex, cachedFilteredFacts, uncoveredAspectFac
                 uncoveredAspects = vb.aspectsDefined - vb.aspectsCovered - {Aspect.DIMENSIONS}
                 if any((_vb.isFactVar and not _vb.isFallback) for _vb in xpCtx.varBindings.values()):
                     factCount = len(facts)
-                    facts = implicitFilter(xpCtx, vb, facts, uncoveredAspects, uncoveredAspectFacts)
+                    if xpCtx.formulaOptions.profileVariableSets:
+                        implicitFilterStarted = time.time()
+                        facts = implicitFilter(xpCtx, vb, facts, uncoveredAspects, uncoveredAspectFacts)
+                        variableSetProfile(xpCtx.modelXbrl, varSet).implicitFilterTime += time.time() - implicitFilterStarted
+                    else:
+                        facts = implicitFilter(xpCtx, vb, facts, uncoveredAspects, uncoveredAspectFacts)
                     if (considerFallback and varHasNoVariableDependencies and 
                         factCount and
                         factCount - len(facts) == 0 and
@@ -363,10 +407,27 @@ def filterFacts(xpCtx, vb, facts, filterRelationships, filterType):
     groupFilter = filterType == "group"
     if orFilter: 
         factSet = set()
+    if xpCtx.formulaOptions.profileVariableSets and xpCtx.variableSet is not None:
+        profile = variableSetProfile(xpCtx.modelXbrl, xpCtx.variableSet)
+    else:
+        profile = None
     for varFilterRel in filterRelationships:
         _filter = varFilterRel.toModelObject
         if isinstance(_filter,ModelFilter):  # relationship not constrained to real filters
-            result = _filter.filter(xpCtx, vb, facts, varFilterRel.isComplemented)
+            if profile is not None:
+                filterStarted = time.time()
+                profile.filterDepth += 1
+                try:
+                    result = _filter.filter(xpCtx, vb, facts, varFilterRel.isComplemented)
+                finally:
+                    profile.filterDepth -= 1
+                filterTime = time.time() - filterStarted
+                profile.filterTimes[_filter] += filterTime
+                profile.filterCalls[_filter] += 1
+                if profile.filterDepth == 0:
+                    profile.filterTime += filterTime
+            else:
+                result = _filter.filter(xpCtx, vb, facts, varFilterRel.isComplemented)
             if xpCtx.formulaOptions.traceVariableFilterWinnowing:
                 xpCtx.modelXbrl.info("formula:trace",
                     _("Fact Variable %(variable)s %(filterType)s %(filter)s filter %(xlinkLabel)s passes %(factCount)s facts"), 
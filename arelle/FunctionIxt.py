@@ -309,3 +309,17 @@ ixtNamespaceURIs = {
     'http://www.xbrl.org/inlineXBRL/transformation/2011-07-31',
     'http://www.xbrl.org/2008/inlineXBRL/transformation' # the CR/PR pre-REC namespace
 }
+
+formatTransforms = {} # transform function (or None if not an ixt transform) by format QName
+
+def ixtTransform(formatQname):
+    ''' returns the ixt transform function of a format QName, or None if not an ixt transform '''
+    try:
+        return formatTransforms[formatQname]
+    except KeyError:
+        if formatQname.namespaceURI in ixtNamespaceURIs:
+            transform = ixtFunctions.get(formatQname.localName)
+        else:
+            transform = None
+        formatTransforms[formatQname] = transform
+        return transform
@@ -8,13 +8,19 @@ system-wide settings.  (The system settings can remain in 'C' locale.)
 @author: Mark V Systems Limited (incorporating python locale module code)
 (original python authors: Martin von Loewis, improved by Georg Brandl)
 
+Formatting parses each format spec, picture and grouping once, into a compiled formatter
+(kept in a least recently used cache of FORMATTER_CACHE_SIZE entries), so that formatting
+many values (such as of viewed or exported facts) doesn't repeat parsing for each value.
+
 (c) Copyright 2011 Mark V Systems Limited, All rights reserved.
 '''
 import re, sys
 import collections
 import unicodedata
+from itertools import islice
 
 CHAR_MAX = 127
+FORMATTER_CACHE_SIZE = 512
 LC_ALL = 6
 LC_COLLATE = 3
 LC_CTYPE = 0
@@ -253,6 +259,23 @@ def rtlString(source, lang):
     else:
         return source
 
+_formatters = collections.OrderedDict()
+
+def _formatter(key, compile, *args):
+    # returns formatter of key from least recently used cache, or compiled by compile(*args)
+    # (key has id of conv, if any, and formatter references conv, so that its id isn't reused while cached)
+    try:
+        formatter = _formatters.pop(key)
+    except KeyError:
+        formatter = compile(*args)
+        if len(_formatters) >= FORMATTER_CACHE_SIZE:
+            try:
+                _formatters.popitem(last=False)
+            except KeyError: # emptied by another thread
+                pass
+    _formatters[key] = formatter
+    return formatter
+
 # Iterate over grouping intervals
 def _grouping_intervals(grouping):
     last_interval = 3 # added by Mark V to prevent compile error but not necessary semantically
@@ -299,6 +322,46 @@ def _group(conv, s, monetary=False):
         len(thousands_sep) * (len(groups) - 1)
     )
 
+def _compile_group(conv, monetary=False):
+    # returns function performing _group with thousands separator and grouping intervals of conv
+    thousands_sep = conv[monetary and 'mon_thousands_sep' or 'thousands_sep']
+    grouping = conv[monetary and 'mon_grouping' or 'grouping']
+    if not grouping:
+        return None
+    intervals = list(islice(_grouping_intervals(grouping), 65))
+    if len(intervals) > 64: # grouping repeats indefinitely, longer strings are grouped by _group
+        del intervals[64:]
+        maxDigits = sum(intervals)
+    else:
+        maxDigits = None
+    def group(s):
+        if maxDigits is not None and len(s) > maxDigits:
+            return _group(conv, s, monetary)
+        if s[-1] == ' ':
+            stripped = s.rstrip()
+            right_spaces = s[len(stripped):]
+            s = stripped
+        else:
+            right_spaces = ''
+        left_spaces = ''
+        groups = []
+        for interval in intervals:
+            if not s or s[-1] not in "0123456789":
+                # only non-digit characters remain (sign, spaces)
+                left_spaces = s
+                s = ''
+                break
+            groups.append(s[-interval:])
+            s = s[:-interval]
+        if s:
+            groups.append(s)
+        groups.reverse()
+        return (
+            left_spaces + thousands_sep.join(groups) + right_spaces,
+            len(thousands_sep) * (len(groups) - 1)
+        )
+    return group
+
 # Strip a given amount of excess padding from the given string
 def _strip_padding(s, amount):
     lpos = 0
@@ -320,63 +383,68 @@ def format(conv, percent, value, grouping=False, monetary=False, *additional):
 
     additional is for format strings which contain one or more
     '*' modifiers."""
-    # this is only for one-percent-specifier strings and this should be checked
-    match = _percent_re.match(percent)
-    if not match or len(match.group())!= len(percent):
-        raise ValueError(("format() must be given exactly one %%char "
-                         "format specifier, %s not valid") % repr(percent))
-    return _format(conv, percent, value, grouping, monetary, *additional)
+    return _formatter(("format", id(conv), percent, bool(grouping), bool(monetary), True),
+                      _compile_format, conv, percent, grouping, monetary, True)(value, additional)
 
 def _format(conv, percent, value, grouping=False, monetary=False, *additional):
-    if additional:
-        formatted = percent % ((value,) + additional)
-    else:
-        formatted = percent % value
+    return _formatter(("format", id(conv), percent, bool(grouping), bool(monetary), False),
+                      _compile_format, conv, percent, grouping, monetary, False)(value, additional)
+
+def _compile_format(conv, percent, grouping, monetary, check):
+    if check:
+        # this is only for one-percent-specifier strings and this should be checked
+        match = _percent_re.match(percent)
+        if not match or len(match.group())!= len(percent):
+            raise ValueError(("format() must be given exactly one %%char "
+                             "format specifier, %s not valid") % repr(percent))
     # floats and decimal ints need special action!
-    if percent[-1] in 'eEfFgG':
-        seps = 0
-        parts = formatted.split('.')
-        if grouping:
-            parts[0], seps = _group(conv, parts[0], monetary=monetary)
-        decimal_point = conv[monetary and 'mon_decimal_point'
-                                              or 'decimal_point']
-        formatted = decimal_point.join(parts)
-        if seps:
-            formatted = _strip_padding(formatted, seps)
-    elif percent[-1] in 'diu':
+    isFloat = percent[-1] in 'eEfFgG'
+    group = _compile_group(conv, monetary) if grouping and (isFloat or percent[-1] in 'diu') else None
+    decimal_point = conv[monetary and 'mon_decimal_point'
+                                          or 'decimal_point']
+    def formatter(value, additional):
+        if additional:
+            formatted = percent % ((value,) + additional)
+        else:
+            formatted = percent % value
         seps = 0
-        if grouping:
-            formatted, seps = _group(conv, formatted, monetary=monetary)
+        if isFloat:
+            parts = formatted.split('.')
+            if group is not None:
+                parts[0], seps = group(parts[0])
+            formatted = decimal_point.join(parts)
+        elif group is not None:
+            formatted, seps = group(formatted)
         if seps:
             formatted = _strip_padding(formatted, seps)
-    return formatted
+        return formatted
+    formatter.conv = conv
+    return formatter
 
 def format_string(conv, f, val, grouping=False):
     """Formats a string in the same way that the % formatting would use,
     but takes the current locale into account.
     Grouping is applied if the third parameter is true."""
-    percents = list(_percent_re.finditer(f))
-    new_f = _percent_re.sub('%s', f)
+    new_f, percents = _formatter(("string", f), _compile_format_string, f)
 
     if isinstance(val, collections.Mapping):
         new_val = []
-        for perc in percents:
-            if perc.group()[-1]=='%':
+        for perc, starcount in percents:
+            if perc[-1]=='%':
                 new_val.append('%')
             else:
-                new_val.append(format(conv, perc.group(), val, grouping))
+                new_val.append(format(conv, perc, val, grouping))
     else:
         if not isinstance(val, tuple):
             val = (val,)
         new_val = []
         i = 0
-        for perc in percents:
-            if perc.group()[-1]=='%':
+        for perc, starcount in percents:
+            if perc[-1]=='%':
                 new_val.append('%')
             else:
-                starcount = perc.group('modifiers').count('*')
                 new_val.append(_format(conv,
-                                       perc.group(),
+                                       perc,
                                        val[i],
                                        grouping,
                                        False,
@@ -386,6 +454,11 @@ def format_string(conv, f, val, grouping=False):
 
     return new_f % val
 
+def _compile_format_string(f):
+    return (_percent_re.sub('%s', f),
+            tuple((perc.group(), perc.group('modifiers').count('*'))
+                  for perc in _percent_re.finditer(f)))
+
 def currency(conv, val, symbol=True, grouping=False, international=False):
     """Formats val according to the currency settings
     in the current locale."""
@@ -455,14 +528,6 @@ def atoi(conv, str):
 from decimal import getcontext, Decimal
 
 def format_picture(conv, value, picture):
-    monetary = False
-    decimal_point = conv['decimal_point']
-    thousands_sep = conv[monetary and 'mon_thousands_sep' or 'thousands_sep']
-    percent = '%'
-    per_mille = '\u2030'
-    minus_sign = '-'
-    #grouping = conv[monetary and 'mon_grouping' or 'grouping']
-
     if isinstance(value, float):
         value = Decimal.from_float(value)
     elif isinstance(value, _STR_NUM_TYPES):
@@ -474,6 +539,26 @@ def format_picture(conv, value, picture):
         return 'NaN'
     
     isNegative = value.is_signed()
+    decimal_point = conv['decimal_point']
+    thousands_sep = conv['thousands_sep']
+    multiplier, intPlaces, fractPlaces, grouping, prefix, neg, suffix = _formatter(
+        ("picture", decimal_point, thousands_sep, picture, isNegative),
+        _compile_picture, decimal_point, thousands_sep, picture, isNegative)
+    if multiplier != 1:
+        value *= multiplier
+    
+    return format_decimal(None, value, intPlaces=intPlaces, fractPlaces=fractPlaces, 
+                          sep=thousands_sep, dp=decimal_point, grouping=grouping,
+                          pos=prefix,
+                          neg=neg,
+                          trailpos=suffix,
+                          trailneg=suffix)
+
+def _compile_picture(decimal_point, thousands_sep, picture, isNegative):
+    # returns format_decimal arguments of picture for positive or negative values
+    percent = '%'
+    per_mille = '\u2030'
+    minus_sign = '-'
     
     pic, sep, negPic = picture.partition(';')
     if negPic and ';' in negPic:
@@ -484,9 +569,11 @@ def format_picture(conv, value, picture):
     if len([c for c in pic if c in (percent, per_mille) ]) > 1:
         raise ValueError(_('Picture contains multiple percent or per_mille charcters {0}').format(picture))
     if percent in pic:
-        value *= 100
+        multiplier = 100
     elif per_mille in pic:
-        value *= 1000
+        multiplier = 1000
+    else:
+        multiplier = 1
         
     intPart, sep, fractPart = pic.partition(decimal_point)
     prefix = ''
@@ -532,12 +619,45 @@ def format_picture(conv, value, picture):
     if intPlaces == 0 and fractPlaces == 0:
         intPlaces = 1
     
-    return format_decimal(None, value, intPlaces=intPlaces, fractPlaces=fractPlaces, 
-                          sep=thousands_sep, dp=decimal_point, grouping=grouping,
-                          pos=prefix,
-                          neg=prefix if negPic else prefix + minus_sign,
-                          trailpos=suffix,
-                          trailneg=suffix)
+    return (multiplier, intPlaces, fractPlaces, grouping, 
+            prefix, prefix if negPic else prefix + minus_sign, suffix)
+
+_quantums = {}
+
+def _decimal_conv_options(conv, dp, sep, grouping, pos, neg, trailpos, trailneg):
+    # resolves format_decimal options not specified from conv (conv is returned to keep it referenced)
+    if dp is None:
+        dp = conv['decimal_point'] or '.'
+    if sep is None:
+        sep = conv['thousands_sep'] or ','
+    if pos is None and trailpos is None:
+        possign = conv['positive_sign']
+        pospos = conv['p_sign_posn']
+        if pospos in('0', 0):
+            pos = '('; trailpos = ')'
+        elif pospos in ('1', 1, '3', 3):
+            pos = possign; trailpos = ''
+        elif pospos in ('2', 2, '4', 4):
+            pos = ''; trailpos = possign
+        else:
+            pos = ''; trailpos = ''
+    if neg is None and trailneg is None:
+        negsign = conv['negative_sign']
+        negpos = conv['n_sign_posn']
+        if negpos in ('0', 0):
+            neg = '('; trailneg = ')'
+        elif negpos in ('1', 1, '3', 3):
+            neg = negsign; trailneg = ''
+        elif negpos in ('2', 2, '4', 4):
+            neg = ''; trailneg = negsign
+        elif negpos == 127:
+            neg = '-'; trailneg = ''
+        else:
+            neg = ''; trailneg = ''
+    if grouping is None:
+        groups = conv['grouping']
+        grouping = groups[0] if groups else 3
+    return (dp, sep, grouping, pos, neg, trailpos, trailneg, conv)
 
 def format_decimal(conv, value, intPlaces=1, fractPlaces=2, curr='', sep=None, grouping=None, dp=None, pos=None, neg=None, trailpos=None, trailneg=None):
     """Convert Decimal to a formatted string including currency if any.
@@ -566,37 +686,9 @@ def format_decimal(conv, value, intPlaces=1, fractPlaces=2, curr='', sep=None, g
 
     """
     if conv is not None:
-        if dp is None:
-            dp = conv['decimal_point'] or '.'
-        if sep is None:
-            sep = conv['thousands_sep'] or ','
-        if pos is None and trailpos is None:
-            possign = conv['positive_sign']
-            pospos = conv['p_sign_posn']
-            if pospos in('0', 0):
-                pos = '('; trailpos = ')'
-            elif pospos in ('1', 1, '3', 3):
-                pos = possign; trailpos = ''
-            elif pospos in ('2', 2, '4', 4):
-                pos = ''; trailpos = possign
-            else:
-                pos = ''; trailpos = ''
-        if neg is None and trailneg is None:
-            negsign = conv['negative_sign']
-            negpos = conv['n_sign_posn']
-            if negpos in ('0', 0):
-                neg = '('; trailneg = ')'
-            elif negpos in ('1', 1, '3', 3):
-                neg = negsign; trailneg = ''
-            elif negpos in ('2', 2, '4', 4):
-                neg = ''; trailneg = negsign
-            elif negpos == 127:
-                neg = '-'; trailneg = ''
-            else:
-                neg = ''; trailneg = ''
-        if grouping is None:
-            groups = conv['grouping']
-            grouping = groups[0] if groups else 3
+        dp, sep, grouping, pos, neg, trailpos, trailneg, _conv = _formatter(
+            ("decimal", id(conv), dp, sep, grouping, pos, neg, trailpos, trailneg),
+            _decimal_conv_options, conv, dp, sep, grouping, pos, neg, trailpos, trailneg)
     else:
         if dp is None:
             dp = '.'
@@ -606,7 +698,10 @@ def format_decimal(conv, value, intPlaces=1, fractPlaces=2, curr='', sep=None, g
             neg = '-'; trailneg = ''
         if grouping is None:
             grouping = 3
-    q = Decimal(10) ** -fractPlaces      # 2 places --> '0.01'
+    try:
+        q = _quantums[fractPlaces]
+    except KeyError:
+        q = _quantums[fractPlaces] = Decimal(10) ** -fractPlaces      # 2 places --> '0.01'
     sign, digits, exp = value.quantize(q).as_tuple()
     result = []
     digits = list(map(str, digits))
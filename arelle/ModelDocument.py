@@ -19,6 +19,17 @@ from arelle.PrototypeDtsObject import LinkPrototype, LocPrototype, ArcPrototype
 from arelle.PluginManager import pluginClassMethods
 creationSoftwareNames = None
 
+def mappedUrl(modelXbrl, normalizedUri):
+    """Returns normalizedUri remapped by the file source (archive taxonomy package), else by installed 
+    taxonomy packages, else by disclosure system mappings, each a single memoized prefix trie lookup.
+    """
+    mappedUri = modelXbrl.fileSource.remappedUrl(normalizedUri)
+    if mappedUri is None:
+        mappedUri = PackageManager.remappedUrl(normalizedUri)
+        if mappedUri is None:
+            mappedUri = modelXbrl.modelManager.disclosureSystem.mappedUrl(normalizedUri)
+    return mappedUri
+
 def load(modelXbrl, uri, base=None, referringElement=None, isEntry=False, isDiscovered=False, isIncluded=None, namespace=None, reloadCache=False, **kwargs):
     """Returns a new modelDocument, performing DTS discovery for instance, inline XBRL, schema, 
     linkbase, and versioning report entry urls.
@@ -62,12 +73,7 @@ def load(modelXbrl, uri, base=None, referringElement=None, isEntry=False, isDisc
             modelXbrl.urlUnloadableDocs[normalizedUri] = blocked
         if blocked:
             return None
-    if modelXbrl.fileSource.isMappedUrl(normalizedUri):
-        mappedUri = modelXbrl.fileSource.mappedUrl(normalizedUri)
-    elif PackageManager.isMappedUrl(normalizedUri):
-        mappedUri = PackageManager.mappedUrl(normalizedUri)
-    else:
-        mappedUri = modelXbrl.modelManager.disclosureSystem.mappedUrl(normalizedUri)
+    mappedUri = mappedUrl(modelXbrl, normalizedUri)
         
     if isEntry:
         modelXbrl.entryLoadingUrl = mappedUri   # for error loggiong during loading
@@ -77,7 +83,7 @@ def load(modelXbrl, uri, base=None, referringElement=None, isEntry=False, isDisc
     if modelXbrl.fileSource.isInArchive(mappedUri):
         filepath = mappedUri
     else:
-        filepath = modelXbrl.modelManager.cntlr.webCache.getfilename(mappedUri, reload=reloadCache)
+        filepath = modelXbrl.modelManager.cntlr.webCache.getfilename(mappedUri, reload=reloadCache, storedContentOk=True)
         if filepath:
             uri = modelXbrl.modelManager.cntlr.webCache.normalizeUrl(filepath)
     if filepath is None: # error such as HTTPerror is already logged
@@ -1146,24 +1152,43 @@ class ModelDocument:
         pass
     
 # inline document set level compilation
+def inlineIxdsHarvest(htmlElement):
+    """Returns the ix elements of an inline document, as lists by kind (tuples, continuations, facts, 
+    footnotes, relationships), each in document order, from a single traversal of the document.
+    """
+    ixNStag = htmlElement.modelDocument.ixNStag
+    tuples = []; continuations = []; facts = []; footnotes = []; relationships = []
+    eltLists = {ixNStag + "tuple": tuples,
+                ixNStag + "continuation": continuations,
+                ixNStag + "nonNumeric": facts,
+                ixNStag + "nonFraction": facts,
+                ixNStag + "fraction": facts,
+                ixNStag + "footnote": footnotes,
+                ixNStag + "relationship": relationships}
+    for elt in htmlElement.iterdescendants(*eltLists.keys()):
+        if isinstance(elt,ModelObject):
+            eltLists[elt.tag].append(elt)
+    return (tuples, continuations, facts, footnotes, relationships)
+
 def inlineIxdsDiscover(modelXbrl):
     # compile inline result set
     footnoteRefs = defaultdict(list)
     tupleElements = []
     continuationElements = {}
     tuplesByTupleID = {}
-    for htmlElement in modelXbrl.ixdsHtmlElements:  
-        mdlDoc = htmlElement.modelDocument
-        for modelInlineTuple in htmlElement.iterdescendants(tag=mdlDoc.ixNStag + "tuple"):
-            if isinstance(modelInlineTuple,ModelObject):
-                modelInlineTuple.unorderedTupleFacts = []
-                if modelInlineTuple.tupleID:
-                    tuplesByTupleID[modelInlineTuple.tupleID] = modelInlineTuple
-                tupleElements.append(modelInlineTuple)
-                for r in modelInlineTuple.footnoteRefs:
-                    footnoteRefs[r].append(modelInlineTuple)
-        for elt in htmlElement.iterdescendants(tag=mdlDoc.ixNStag + "continuation"):
-            if isinstance(elt,ModelObject) and elt.id:
+    # one pass over each document for its ix elements, merged in document set order
+    ixdsHarvests = [(htmlElement.modelDocument, inlineIxdsHarvest(htmlElement))
+                    for htmlElement in modelXbrl.ixdsHtmlElements]
+    for mdlDoc, (tuples, continuations, facts, footnotes, relationships) in ixdsHarvests:
+        for modelInlineTuple in tuples:
+            modelInlineTuple.unorderedTupleFacts = []
+            if modelInlineTuple.tupleID:
+                tuplesByTupleID[modelInlineTuple.tupleID] = modelInlineTuple
+            tupleElements.append(modelInlineTuple)
+            for r in modelInlineTuple.footnoteRefs:
+                footnoteRefs[r].append(modelInlineTuple)
+        for elt in continuations:
+            if elt.id:
                 continuationElements[elt.id] = elt
                     
     def locateFactInTuple(modelFact, tuplesByTupleID, ixNStag):
@@ -1206,39 +1231,35 @@ def inlineIxdsDiscover(modelXbrl):
                     element._continuationElement = contElt
                     locateContinuation(contElt, chain)
 
-    for htmlElement in modelXbrl.ixdsHtmlElements:  
-        mdlDoc = htmlElement.modelDocument
-        ixNStag = mdlDoc.ixNStag
-        # hook up tuples to their container
-        for tupleFact in tupleElements:
-            locateFactInTuple(tupleFact, tuplesByTupleID, ixNStag)
+    # hook up tuples to their container (once for the document set, not again for each document)
+    for tupleFact in tupleElements:
+        locateFactInTuple(tupleFact, tuplesByTupleID, tupleFact.modelDocument.ixNStag)
 
-        factTags = set(ixNStag + ln for ln in ("nonNumeric", "nonFraction", "fraction"))
-        for tag in factTags:
-            for modelInlineFact in htmlElement.iterdescendants(tag=tag):
-                if isinstance(modelInlineFact,ModelObject):
-                    mdlDoc.modelXbrl.factsInInstance.add( modelInlineFact )
-                    locateFactInTuple(modelInlineFact, tuplesByTupleID, ixNStag)
-                    locateContinuation(modelInlineFact)
-                    for r in modelInlineFact.footnoteRefs:
-                        footnoteRefs[r].append(modelInlineFact)
-        # order tuple facts
-        for tupleFact in tupleElements:
-            tupleFact.modelTupleFacts = [
-                 mdlDoc.modelXbrl.modelObject(objectIndex) 
-                 for order,objectIndex in sorted(tupleFact.unorderedTupleFacts)]
-                        
-        # validate particle structure of elements after transformations and established tuple structure
-        for rootModelFact in modelXbrl.facts:
-            # validate XBRL (after complete document set is loaded)
-            XmlValidate.validate(modelXbrl, rootModelFact, ixFacts=True)
+    for mdlDoc, (tuples, continuations, facts, footnotes, relationships) in ixdsHarvests:
+        ixNStag = mdlDoc.ixNStag
+        for modelInlineFact in facts:
+            modelXbrl.factsInInstance.add( modelInlineFact )
+            locateFactInTuple(modelInlineFact, tuplesByTupleID, ixNStag)
+            locateContinuation(modelInlineFact)
+            for r in modelInlineFact.footnoteRefs:
+                footnoteRefs[r].append(modelInlineFact)
+                
+    # order tuple facts
+    for tupleFact in tupleElements:
+        tupleFact.modelTupleFacts = [
+             modelXbrl.modelObject(objectIndex) 
+             for order,objectIndex in sorted(tupleFact.unorderedTupleFacts)]
+                    
+    # validate particle structure of elements after transformations and established tuple structure
+    for rootModelFact in modelXbrl.facts:
+        # validate XBRL (after complete document set is loaded)
+        XmlValidate.validate(modelXbrl, rootModelFact, ixFacts=True)
             
     footnoteLinkPrototypes = {}
-    for htmlElement in modelXbrl.ixdsHtmlElements:  
-        mdlDoc = htmlElement.modelDocument
+    for mdlDoc, (tuples, continuations, facts, footnotes, relationships) in ixdsHarvests:
         # inline 1.0 ixFootnotes, build resources (with ixContinuation)
-        for modelInlineFootnote in htmlElement.iterdescendants(tag="{http://www.xbrl.org/2008/inlineXBRL}footnote"):
-            if isinstance(modelInlineFootnote,ModelObject):
+        for modelInlineFootnote in footnotes:
+            if modelInlineFootnote.namespaceURI == XbrlConst.ixbrl:
                 # link
                 linkrole = modelInlineFootnote.get("footnoteLinkRole", XbrlConst.defaultLinkRole)
                 arcrole = modelInlineFootnote.get("arcrole", XbrlConst.factFootnote)
@@ -1269,16 +1290,16 @@ def inlineIxdsDiscover(modelXbrl):
                                                                 linkrole, arcrole))
                 
         # inline 1.1 ixRelationships and ixFootnotes
-        for modelInlineFootnote in htmlElement.iterdescendants(tag="{http://www.xbrl.org/CR-2013-08-21/inlineXBRL}footnote"):
-            if isinstance(modelInlineFootnote,ModelObject):
+        for modelInlineFootnote in footnotes:
+            if modelInlineFootnote.namespaceURI == XbrlConst.ixbrl11:
                 locateContinuation(modelInlineFootnote)
                 linkPrototype = LinkPrototype(mdlDoc, mdlDoc.xmlRootElement, XbrlConst.qnLinkFootnoteLink, XbrlConst.defaultLinkRole)
                 baseSetKey = (XbrlConst.factFootnote,XbrlConst.defaultLinkRole,XbrlConst.qnLinkFootnoteLink, XbrlConst.qnLinkFootnoteArc)
                 modelXbrl.baseSets[baseSetKey].append(linkPrototype) # allows generating output instance with this loc
                 linkPrototype.childElements.append(modelInlineFootnote)
 
-        for modelInlineRel in htmlElement.iterdescendants(tag="{http://www.xbrl.org/CR-2013-08-21/inlineXBRL}relationship"):
-            if isinstance(modelInlineRel,ModelObject):
+        for modelInlineRel in relationships:
+            if modelInlineRel.namespaceURI == XbrlConst.ixbrl11:
                 linkrole = modelInlineRel.get("linkRole", XbrlConst.defaultLinkRole)
                 arcrole = modelInlineRel.get("arcrole", XbrlConst.factFootnote)
                 linkPrototype = LinkPrototype(mdlDoc, mdlDoc.xmlRootElement, XbrlConst.qnLinkFootnoteLink, linkrole)
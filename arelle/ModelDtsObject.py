@@ -443,15 +443,23 @@ class ModelConcept(ModelNamableTerm, ModelParticle):
         
     def instanceOfType(self, typeqname):
         """(bool) -- True if element is declared by, or derived from type of given qname"""
+        try:
+            return self._instanceOfTypes[typeqname]
+        except AttributeError:
+            self._instanceOfTypes = {}
+        except KeyError:
+            pass
         if typeqname == self.typeQname:
-            return True
-        type = self.type
-        if type is not None and self.type.isDerivedFrom(typeqname):
-            return True
-        subs = self.substitutionGroup
-        if subs is not None: 
-            return subs.instanceOfType(typeqname)
-        return False
+            isInstance = True
+        else:
+            type = self.type
+            if type is not None and type.isDerivedFrom(typeqname):
+                isInstance = True
+            else:
+                subs = self.substitutionGroup
+                isInstance = subs is not None and subs.instanceOfType(typeqname)
+        self._instanceOfTypes[typeqname] = isInstance
+        return isInstance
     
     @property
     def isNumeric(self):
@@ -525,14 +533,24 @@ class ModelConcept(ModelNamableTerm, ModelParticle):
     @property
     def substitutionGroupQnames(self):   # ordered list of all substitution group qnames
         """([QName]) -- Ordered list of QNames of substitution groups (recursively)"""
-        qnames = []
-        subs = self
-        subNext = subs.substitutionGroup
-        while subNext is not None:
-            qnames.append(subNext.qname)
-            subs = subNext
+        return list(self.substitutionGroupQnamesChain)
+    
+    @property
+    def substitutionGroupQnamesChain(self):
+        """((QName)) -- Tuple of QNames of substitution groups (recursively), resolved once"""
+        try:
+            return self._substitutionGroupQnamesChain
+        except AttributeError:
+            qnames = []
+            subs = self
             subNext = subs.substitutionGroup
-        return qnames
+            while subNext is not None:
+                qnames.append(subNext.qname)
+                subs = subNext
+                subNext = subs.substitutionGroup
+            self._substitutionGroupQnamesChain = tuple(qnames)
+            self._subGroupHeadQname = subs.qname
+            return self._substitutionGroupQnamesChain
     
     @property
     def isQualifiedForm(self): # used only in determining qname, which itself is cached
@@ -753,24 +771,39 @@ class ModelConcept(ModelNamableTerm, ModelParticle):
 
     def substitutesForQname(self, subsQname):
         """(bool) -- True if element substitutes for specified qname"""
-        subs = self
-        subNext = subs.substitutionGroup
-        while subNext is not None:
-            if subsQname == subs.substitutionGroupQname:
-                return True
-            subs = subNext
-            subNext = subs.substitutionGroup
-        return False
+        return subsQname in self.substitutionGroupQnamesChain
         
     @property
     def subGroupHeadQname(self):
         """(QName) -- Head of substitution lineage of element (e.g., xbrli:item)"""
-        subs = self
-        subNext = subs.substitutionGroup
-        while subNext is not None:
-            subs = subNext
-            subNext = subs.substitutionGroup
-        return subs.qname
+        try:
+            return self._subGroupHeadQname
+        except AttributeError:
+            self.substitutionGroupQnamesChain # resolves head with the chain
+            return self._subGroupHeadQname
+    
+    def precompute(self):
+        """Resolves and caches type chain, substitution group closure and derived properties (otherwise
+        resolved lazily on first use), so that later use by validation, formula and rendering doesn't 
+        walk type and substitution group chains."""
+        self.typeQname
+        self.type
+        self.baseXsdType
+        self.baseXbrliType
+        self.baseXbrliTypeQname
+        self.substitutionGroupQname
+        self.substitutionGroupQnamesChain
+        self.isNumeric
+        self.isFraction
+        self.isMonetary
+        self.isShares
+        self.isItem
+        self.isTuple
+        self.isLinkPart
+        self.isPrimaryItem
+        self.isHypercubeItem
+        self.isDimensionItem
+        self.isTypedDimension
 
     def dereference(self):
         """(ModelConcept) -- If element is a ref (instead of name), provides referenced modelConcept object, else self"""
@@ -136,6 +136,7 @@ class FormulaOptions():
         self.traceVariableSetExpressionEvaluation = False
         self.traceVariableSetExpressionResult = False
         self.timeVariableSetEvaluation = False
+        self.profileVariableSets = False
         self.traceAssertionResultCounts = False
         self.traceFormulaRules = False
         self.traceVariablesDependencies = False
@@ -44,6 +44,11 @@ Aspect = None
 utrEntries = None
 POSINF = float("inf")
 NEGINF = float("-inf")
+# transformed inline values are memoized per model (modelXbrl.ixValueMemo, least recently used evicted)
+# by (element localName, format, inner text, scale, sign), as inline documents mostly repeat a small set 
+# of short values (dates, zeros, dashes), only successful transforms of formatted or numeric short values
+ixValueMemoSize = 16384 # maximum memoized values, 0 to not memoize
+ixValueMemoMaxTextLength = 64
 
 class NewFactItemOptions():
     """
@@ -163,7 +168,7 @@ class ModelFact(ModelObject):
     
     @property
     def utrEntries(self):
-        """(set(UtrEntry)) -- set of UtrEntry objects that match this fact and unit"""
+        """(frozenset(UtrEntry)) -- set of UtrEntry objects that match this fact and unit"""
         if self.unit is not None and self.concept is not None:
             return self.unit.utrEntries(self.concept.type)
         return None
@@ -510,15 +515,28 @@ class ModelInlineValueObject:
                                   ixContinuation=(self.elementQname == XbrlConst.qnIXbrl11NonNumeric),
                                   strip=True) # transforms are whitespace-collapse
             f = self.format
+            localName = self.localName
+            ixValueMemo = self.modelXbrl.ixValueMemo
+            if (ixValueMemoSize and len(v) <= ixValueMemoMaxTextLength and 
+                (f is not None or localName == "nonFraction")):
+                key = (localName, f, v, self.scale, self.sign)
+                try:
+                    self._ixValue = ixValueMemo.pop(key)
+                    ixValueMemo[key] = self._ixValue # most recently used
+                    return self._ixValue
+                except KeyError:
+                    pass
+            else:
+                key = None
             if f is not None:
-                if (f.namespaceURI in FunctionIxt.ixtNamespaceURIs and
-                    f.localName in FunctionIxt.ixtFunctions):
+                transform = FunctionIxt.ixtTransform(f)
+                if transform is not None:
                     try:
-                        v = FunctionIxt.ixtFunctions[f.localName](v)
+                        v = transform(v)
                     except Exception as err:
                         self._ixValue = ModelValue.INVALIDixVALUE
                         raise err
-            if self.localName == "nonNumeric" or self.localName == "tuple":
+            if localName == "nonNumeric" or localName == "tuple":
                 self._ixValue = v
             else:  # determine string value of transformed value
                 negate = -1 if self.sign else 1
@@ -528,7 +546,7 @@ class ModelInlineValueObject:
                     num = Decimal(v)
                 except (ValueError, InvalidOperation):
                     self._ixValue = ModelValue.INVALIDixVALUE
-                    raise ValueError("Invalid value for {} number: {}".format(self.localName, v))
+                    raise ValueError("Invalid value for {} number: {}".format(localName, v))
                 try:
                     scale = self.scale
                     if scale is not None:
@@ -536,7 +554,11 @@ class ModelInlineValueObject:
                     self._ixValue = "{}".format(num * negate)
                 except (ValueError, InvalidOperation):
                     self._ixValue = ModelValue.INVALIDixVALUE
-                    raise ValueError("Invalid value for {} scale {} for number {}".format(self.localName, scale, v))
+                    raise ValueError("Invalid value for {} scale {} for number {}".format(localName, scale, v))
+            if key is not None:
+                if len(ixValueMemo) >= ixValueMemoSize:
+                    ixValueMemo.popitem(last=False) # least recently used
+                ixValueMemo[key] = self._ixValue
             return self._ixValue
 
     @property
@@ -44,6 +44,13 @@ class ModelManager:
         .. attribute:: defaultLang
         
         The default language code for labels selection and views (e.g. 'en-US'), set from the operating system defaults on startup.
+        
+        .. attribute:: gcPolicy
+        
+        When cyclic garbage of closed modelXbrls is collected: 'immediate' (on each close by the model manager), 
+        'models' (after every gcModels modelXbrls have closed) or 'memory' (when a modelXbrl closes and resident 
+        memory exceeds gcMemoryThreshold KB).  Any other value is treated as 'immediate', as is 'memory' where
+        resident memory can not be measured (with a warning when the first modelXbrl closes).
     """
     
     def __init__(self, cntlr):
@@ -56,8 +63,14 @@ class ModelManager:
         self.validateUtr = False
         self.skipDTS = False
         self.abortOnMajorError = False
+        self.precomputeConcepts = False
         self.collectProfileStats = False
+        self.collectProfileAllocations = False # tracemalloc allocation sites of each profiled phase
         self.loadedModelXbrls = []
+        self.gcPolicy = "immediate"
+        self.gcModels = 10
+        self.gcMemoryThreshold = 1024 * 1024 # KB
+        self.modelXbrlsClosedSinceGc = 0
         from arelle import Locale
         self.locale = Locale.getUserLocale(cntlr.config.get("userInterfaceLocaleOverride",""))
         self.defaultLang = Locale.getLanguageCode()
@@ -204,5 +217,38 @@ class ModelManager:
                 else:
                     self.modelXbrl = None
             modelXbrl.close()
-            gc.collect()
+            if self.gcPolicy not in ("models", "memory"): # immediate, or unrecognized policy
+                self.collectGarbage()
+                
+    def modelXbrlClosed(self):
+        """Called by each modelXbrl upon close, after it has dereferenced its model objects (so that most of
+        its memory is freed by reference counting), to collect remaining cyclic garbage when due by gcPolicy.
+        """
+        self.modelXbrlsClosedSinceGc += 1
+        if self.gcPolicy == "memory":
+            memoryUsed = self.cntlr.currentMemoryUsed
+            if not memoryUsed: # can't be measured, collect on each close by the model manager instead
+                self.addToLog(_("resident memory can not be measured on this platform, proceeding with immediate garbage collection"),
+                              messageCode="arelle:gcPolicy", level=logging.WARNING)
+                self.gcPolicy = "immediate"
+            elif memoryUsed >= self.gcMemoryThreshold:
+                self.collectGarbage()
+        elif self.gcPolicy == "models" and self.modelXbrlsClosedSinceGc >= self.gcModels:
+            self.collectGarbage()
+            
+    def collectGarbage(self):
+        """Collects cyclic garbage, reporting resident memory before and after (when profiling or when
+        collection is deferred by gcPolicy), so that memory not freed by closed modelXbrls is visible.
+        """
+        report = self.collectProfileStats or self.gcPolicy in ("models", "memory")
+        if report:
+            memBefore = self.cntlr.currentMemoryUsed
+        collected = gc.collect()
+        if report:
+            memAfter = self.cntlr.currentMemoryUsed
+            self.addToLog(_("garbage collection after {0} closed models: {1} objects collected, "
+                            "resident memory {2:,} KB before, {3:,} KB after")
+                          .format(self.modelXbrlsClosedSinceGc, collected, memBefore, memAfter),
+                          messageCode="info:garbageCollection")
+        self.modelXbrlsClosedSinceGc = 0
 
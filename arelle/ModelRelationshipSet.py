@@ -101,7 +101,8 @@ def baseSetRelationship(arcElement):
 class ModelRelationshipSet:
     __slots__ = ("isChanged", "modelXbrl", "arcrole", "linkrole", "linkqname", "arcqname",
                  "modelRelationshipsFrom", "modelRelationshipsTo", "modelConceptRoots", "modellinkRoleUris",
-                 "modelRelationships", "_testHintedLabelLinkrole")
+                 "modelRelationships", "modelClosureIndex", "modelLabelIndex",
+                 "_testHintedLabelLinkrole")
     
     # arcrole can either be a single string or a tuple or frozenset of strings
     def __init__(self, modelXbrl, arcrole, linkrole=None, linkqname=None, arcqname=None, includeProhibits=False):
@@ -179,6 +180,8 @@ class ModelRelationshipSet:
         self.modelRelationshipsTo = None
         self.modelConceptRoots = None
         self.modellinkRoleUris = None
+        self.modelClosureIndex = None
+        self.modelLabelIndex = {}
         orderRels = defaultdict(list)
         for modelRel in relationships.values():
             if (modelRel is not USING_EQUIVALENCE_KEY and 
@@ -199,6 +202,8 @@ class ModelRelationshipSet:
             self.modelRelationshipsFrom.clear()
         if self.modelConceptRoots is not None:
             del self.modelConceptRoots[:]
+        self.modelClosureIndex = None
+        self.clearLabelIndex()
         self.linkqname = self.arcqname = None
         
     def __bool__(self):  # some modelRelationships exist
@@ -261,6 +266,12 @@ class ModelRelationshipSet:
                                       if modelRelFrom not in self.modelRelationshipsTo]
         return self.modelConceptRoots
     
+    @property
+    def closureIndex(self):
+        if self.modelClosureIndex is None:
+            self.modelClosureIndex = RelationshipClosureIndex(self)
+        return self.modelClosureIndex
+    
     # if modelFrom and modelTo are provided determine that they have specified relationship
     # if only modelFrom, determine that there are relationships present of specified axis
     def isRelated(self, modelFrom, axis, modelTo=None, visited=None, isDRS=False): # either model concept or qname
@@ -288,6 +299,8 @@ class ModelRelationshipSet:
             axis = axis[7:] # remove sibling, else recursion will loop
             return any(self.isRelated(modelRel.fromModelObject, axis, modelTo)
                        for modelRel in self.toModelObject(modelFrom))
+        if isDescendantAxis and modelTo is not None and not isDRS: # reachability within this relationship set
+            return self.closureIndex.isReachable(modelFrom, modelTo)
         for modelRel in self.fromModelObject(modelFrom):
             toConcept = modelRel.toModelObject
             if modelTo is None or modelTo == toConcept:
@@ -308,6 +321,22 @@ class ModelRelationshipSet:
         return False
     
     def label(self, modelFrom, role, lang, returnMultiple=False, returnText=True, linkroleHint=None):
+        # resolved labels (after priority and language fallback) are indexed by the parameters requested,
+        # so views and messages requesting the same labels don't resolve them again
+        key = (modelFrom, role, lang, returnMultiple, returnText, linkroleHint)
+        try:
+            label = self.modelLabelIndex[key]
+        except KeyError:
+            label = self.modelLabelIndex[key] = self.resolveLabel(modelFrom, role, lang, returnMultiple, returnText, linkroleHint)
+        if returnMultiple and label: # don't return indexed list
+            return list(label)
+        return label
+    
+    def clearLabelIndex(self):
+        # labels must be resolved again after editing labels or label relationships
+        self.modelLabelIndex.clear()
+        
+    def resolveLabel(self, modelFrom, role, lang, returnMultiple=False, returnText=True, linkroleHint=None):
         shorterLangInLabel = longerLangInLabel = None
         shorterLangLabels = longerLangLabels = None
         langLabels = []
@@ -366,3 +395,123 @@ class ModelRelationshipSet:
             if returnMultiple: return longerLangLabels
             else: return longerLangLabels[0]
         return None
+
+class RelationshipClosureIndex:
+    """Reachability (transitive closure) index of a relationship set, for descendant queries.
+    
+    Cycles are collapsed into strongly connected components, the components are numbered by pre and 
+    post order of a depth first spanning forest, so that a tree descendant is found by interval 
+    containment, and for each component the targets of relationships from its spanning subtree 
+    which are outside of its interval (multiple parents) are kept for the cases not in the spanning tree.
+    """
+    __slots__ = ("component", "cyclic", "pre", "post", "exits")
+    
+    def __init__(self, modelRelationshipSet):
+        successors = dict((modelFrom, [rel.toModelObject for rel in rels if rel.toModelObject is not None])
+                          for modelFrom, rels in modelRelationshipSet.fromModelObjects().items())
+        # strongly connected components (Tarjan, iterative), found in reverse topological order
+        self.component = component = {}
+        self.cyclic = cyclic = set()
+        index = {}
+        lowlink = {}
+        sccStack = []
+        onSccStack = set()
+        numComponents = 0
+        for root in successors.keys():
+            if root in index:
+                continue
+            index[root] = lowlink[root] = len(index)
+            sccStack.append(root)
+            onSccStack.add(root)
+            dfsStack = [(root, iter(successors[root]))]
+            while dfsStack:
+                node, children = dfsStack[-1]
+                for child in children:
+                    if child not in index:
+                        index[child] = lowlink[child] = len(index)
+                        sccStack.append(child)
+                        onSccStack.add(child)
+                        dfsStack.append((child, iter(successors.get(child, ()))))
+                        break
+                    elif child in onSccStack and index[child] < lowlink[node]:
+                        lowlink[node] = index[child]
+                else:
+                    dfsStack.pop()
+                    if dfsStack:
+                        parent = dfsStack[-1][0]
+                        if lowlink[node] < lowlink[parent]:
+                            lowlink[parent] = lowlink[node]
+                    if lowlink[node] == index[node]:
+                        while True:
+                            member = sccStack.pop()
+                            onSccStack.discard(member)
+                            component[member] = numComponents
+                            if member is node:
+                                break
+                            cyclic.add(numComponents) # more than one member
+                        numComponents += 1
+        componentSuccessors = [set() for i in range(numComponents)]
+        for modelFrom, toObjects in successors.items():
+            fromComponent = component[modelFrom]
+            for modelTo in toObjects:
+                toComponent = component[modelTo]
+                if toComponent == fromComponent:
+                    cyclic.add(fromComponent) # includes relationship to self
+                else:
+                    componentSuccessors[fromComponent].add(toComponent)
+        # pre and post order numbering of spanning forest, visiting components in topological order
+        self.pre = pre = [None] * numComponents
+        self.post = post = [None] * numComponents
+        self.exits = exits = {}
+        order = 0
+        for root in range(numComponents - 1, -1, -1):
+            if pre[root] is not None:
+                continue
+            pre[root] = order
+            order += 1
+            dfsStack = [(root, iter(componentSuccessors[root]), [])]
+            while dfsStack:
+                c, children, nonTreeTargets = dfsStack[-1]
+                for child in children:
+                    if pre[child] is None:
+                        pre[child] = order
+                        order += 1
+                        dfsStack.append((child, iter(componentSuccessors[child]), []))
+                        break
+                    nonTreeTargets.append(child)
+                else:
+                    dfsStack.pop()
+                    post[c] = order
+                    order += 1
+                    cPre = pre[c]
+                    cExits = set(t for t in nonTreeTargets if not (cPre < pre[t] and post[t] < order))
+                    if cExits:
+                        exits[c] = tuple(cExits)
+                    if dfsStack: # parent's subtree exits include those of this child
+                        dfsStack[-1][2].extend(cExits)
+    
+    def isReachable(self, modelFrom, modelTo):
+        # true if modelTo is a descendant of modelFrom (by one or more relationships)
+        component = self.component
+        fromComponent = component.get(modelFrom)
+        toComponent = component.get(modelTo)
+        if fromComponent is None or toComponent is None:
+            return False
+        if fromComponent == toComponent:
+            return fromComponent in self.cyclic
+        pre = self.pre
+        post = self.post
+        exits = self.exits
+        toPre = pre[toComponent]
+        toPost = post[toComponent]
+        stack = [fromComponent]
+        visited = set(stack)
+        while stack:
+            c = stack.pop()
+            if pre[c] <= toPre and toPost <= post[c]:
+                return True
+            for t in exits.get(c, ()):
+                if t not in visited:
+                    visited.add(t)
+                    stack.append(t)
+        return False
@@ -7,6 +7,25 @@ Created on Jan 4, 2011
 import re, copy, datetime
 XmlUtil = None
 
+# QNames are immutable values, so those made by the qname functions are interned: identical qnames 
+# share one object (and its hash), and compare by identity before comparing namespace and local name
+qnamePool = {} # (prefix, namespaceURI, localName): QName
+clarkNameQnames = {} # clark name: QName
+qnamePoolMaxSize = 1000000 # pools are cleared on reaching this size, 0 to not intern
+
+def internedQName(prefix, namespaceURI, localName):
+    key = (prefix, namespaceURI, localName)
+    try:
+        return qnamePool[key]
+    except KeyError:
+        qn = QName(prefix, namespaceURI, localName)
+        if qnamePoolMaxSize:
+            if len(qnamePool) >= qnamePoolMaxSize:
+                qnamePool.clear()
+                clarkNameQnames.clear()
+            qnamePool[key] = qn
+        return qn
+
 def qname(value, name=None, noPrefixIsNoNamespace=False, castException=None, prefixException=None):
     # either value can be an etree ModelObject element: if no name then qname is element tag quanem
     #     if name provided qname uses element as xmlns reference and name as prefixed name
@@ -19,7 +38,7 @@ def qname(value, name=None, noPrefixIsNoNamespace=False, castException=None, pre
             value = name
             name = None
         else:
-            return QName(value.prefix, value.namespaceURI, value.localName)
+            return internedQName(value.prefix, value.namespaceURI, value.localName)
     elif isinstance(name, ModelObject):
         element = name
         name = None
@@ -56,11 +75,11 @@ def qname(value, name=None, noPrefixIsNoNamespace=False, castException=None, pre
         if not prefix:
             prefix = None # don't want '' but instead None if no prefix
             if noPrefixIsNoNamespace:
-                return QName(None, None, localName)
+                return internedQName(None, None, localName)
     if namespaceURI:
-        return QName(prefix, namespaceURI, localName)
+        return internedQName(prefix, namespaceURI, localName)
     elif namespaceDict and prefix in namespaceDict:
-        return QName(prefix, namespaceDict[prefix], localName)
+        return internedQName(prefix, namespaceDict[prefix], localName)
     elif element is not None:
         # same as XmlUtil.xmlns but local for efficiency
         namespaceURI = element.nsmap.get(prefix)
@@ -71,17 +90,24 @@ def qname(value, name=None, noPrefixIsNoNamespace=False, castException=None, pre
             if prefixException: raise prefixException
             return None  # error, prefix not found
         namespaceURI = None # cancel namespace if it is a zero length string
-    return QName(prefix, namespaceURI, localName)
+    return internedQName(prefix, namespaceURI, localName)
 
 def qnameNsLocalName(namespaceURI, localName):  # does not handle localNames with prefix
-    return QName(None, namespaceURI or None, localName)
+    return internedQName(None, namespaceURI or None, localName)
 
 def qnameClarkName(clarkname):  # does not handle clark names with prefix
+    try:
+        return clarkNameQnames[clarkname]
+    except KeyError:
+        pass
     if clarkname and clarkname[0] == '{': # clark notation (with optional prefix)
         namespaceURI,sep,localName = clarkname[1:].rpartition('}')
-        return QName(None, namespaceURI or None, localName)
+        qn = internedQName(None, namespaceURI or None, localName)
     else:
-        return QName(None, None, clarkname)
+        qn = internedQName(None, None, clarkname)
+    if qnamePoolMaxSize:
+        clarkNameQnames[clarkname] = qn
+    return qn
 
 def qnameEltPfxName(element, prefixedName, prefixException=None):
     prefix,sep,localName = prefixedName.rpartition(':')
@@ -97,10 +123,10 @@ def qnameEltPfxName(element, prefixedName, prefixException=None):
                 return None
         else:
             namespaceURI = None # cancel namespace if it is a zero length string
-    return QName(prefix, namespaceURI, localName)
+    return internedQName(prefix, namespaceURI, localName)
 
 class QName:
-    __slots__ = ("prefix", "namespaceURI", "localName", "qnameValueHash")
+    __slots__ = ("prefix", "namespaceURI", "localName", "qnameValueHash", "_clarkNotation")
     def __init__(self,prefix,namespaceURI,localName):
         self.prefix = prefix
         self.namespaceURI = namespaceURI
@@ -110,10 +136,14 @@ class QName:
         return self.qnameValueHash
     @property
     def clarkNotation(self):
-        if self.namespaceURI:
-            return '{{{0}}}{1}'.format(self.namespaceURI, self.localName)
-        else:
-            return self.localName
+        try:
+            return self._clarkNotation
+        except AttributeError:
+            if self.namespaceURI:
+                self._clarkNotation = '{{{0}}}{1}'.format(self.namespaceURI, self.localName)
+            else:
+                self._clarkNotation = self.localName
+            return self._clarkNotation
     def __repr__(self):
         return self.__str__() 
     def __str__(self):
@@ -122,6 +152,8 @@ class QName:
         else:
             return self.localName
     def __eq__(self,other):
+        if self is other: # interned qnames
+            return True
         try:
             return (self.qnameValueHash == other.qnameValueHash and 
                     self.namespaceURI == other.namespaceURI and self.localName == other.localName)
@@ -128,6 +128,8 @@ class ModelVersReport(ModelDocument.ModelDocument):
         self.relationshipSetChanges = []
         self.instanceAspectChanges = []
         self.typedDomainsCorrespond = {}
+        self.relSetSignatures = {} # (isToDTS, arcrole, linkrole, concept, isConsecutive): signature id
+        self.relSetSignatureIds = {} # signature: signature id
         
     def close(self, *args, **kwargs):
         """Closes any views, formula output instances, modelDocument(s), and dereferences all memory used 
@@ -644,7 +646,71 @@ class ModelVersReport(ModelDocument.ModelDocument):
                                 self.relSetAddedEvent = self.createRelationshipSetEvent("relationshipSet", eventParent=relSetEvent, linkrole=toRelationshipSet.linkrole, arcrole=toRelationshipSet.arcrole)
                             self.createRelationshipSetEvent("relationships", eventParent=self.relSetAddedEvent, fromConcept=toRoot, axis="descendant-or-self", comment="root relationship")
 
+    def relSetSignature(self, dts, arcrole, linkrole, concept, isConsecutive, visiting=None):
+        """Returns an id of the canonical signature of the relationships tree descending from concept, 
+        which is in fromDTS namespaces for either DTS (so equal ids of from and to trees mean no 
+        differences), or None if the tree can't be signed (cycles, dangling or unhashable arcs).
+        
+        Each tree node's signature is the ordered tuple of its relationships' (target qname, arc attributes,
+        target signature id); ids are memoized per node, so subtrees shared by many parents (such as 
+        dimension domains of many primary items) are only signed once.
+        """
+        isToDTS = dts is self.toDTS
+        key = (isToDTS, arcrole, linkrole, concept, isConsecutive)
+        try:
+            return self.relSetSignatures[key]
+        except KeyError:
+            pass
+        if concept is None:
+            return None
+        if visiting is None:
+            visiting = set()
+        if key in visiting: # cycle, not memoized until its root completes
+            return None
+        visiting.add(key)
+        if isToDTS:
+            mappedQname = self.fromDTSqname
+            ns2ns1Tbl = self.namespaceRenameToURI
+        else:
+            mappedQname = None
+            ns2ns1Tbl = None
+        childArcrole = XbrlConst.domainMember if arcrole == XbrlConst.dimensionDomain else arcrole #consec rel set
+        signature = []
+        for rel in dts.relationshipSet(arcrole, linkrole).fromModelObject(concept):
+            tgtConcept = rel.toModelObject
+            tgtSignature = self.relSetSignature(dts, childArcrole, 
+                                                rel.consecutiveLinkrole if isConsecutive else linkrole, 
+                                                tgtConcept, isConsecutive, visiting)
+            if tgtSignature is None:
+                signature = None
+                break
+            signature.append((mappedQname(tgtConcept.qname) if mappedQname else tgtConcept.qname,
+                              XbrlUtil.attributes(self.modelXbrl, rel.arcElement,
+                                                  exclusions=relationshipSetArcAttributesExclusion,
+                                                  ns2ns1Tbl=ns2ns1Tbl),
+                              tgtSignature))
+        visiting.discard(key)
+        if signature is not None:
+            signature = tuple(signature)
+            try:
+                signatureId = self.relSetSignatureIds.setdefault(signature, len(self.relSetSignatureIds))
+            except TypeError: # unhashable arc attribute value
+                signatureId = None
+        else:
+            signatureId = None
+        self.relSetSignatures[key] = signatureId
+        return signatureId
+    
+    def relSetsCorrespond(self, fromConcept, fromLinkrole, toConcept, toLinkrole, arcrole, isConsecutive):
+        # true if both relationship trees are known identical by their signatures (no diffing needed)
+        fromSignature = self.relSetSignature(self.fromDTS, arcrole, fromLinkrole, fromConcept, isConsecutive)
+        return (fromSignature is not None and 
+                fromSignature == self.relSetSignature(self.toDTS, arcrole, toLinkrole, toConcept, isConsecutive))
+    
     def diffRelationships(self, fromConcept, toConcept, fromRelationshipSet, toRelationshipSet):
+        if self.relSetsCorrespond(fromConcept, fromRelationshipSet.linkrole, toConcept, toRelationshipSet.linkrole, 
+                                  fromRelationshipSet.arcrole, False):
+            return
         fromRels = fromRelationshipSet.fromModelObject(fromConcept)
         toRels = toRelationshipSet.fromModelObject(toConcept)
         for i, fromRel in enumerate(fromRels):
@@ -878,6 +944,8 @@ class ModelVersReport(ModelDocument.ModelDocument):
     
     def DRSdiff(self, fromConcept, fromLinkrole, toConcept, toLinkrole, arcrole, diffs=None):
         if diffs is None: diffs = []
+        if self.relSetsCorrespond(fromConcept, fromLinkrole, toConcept, toLinkrole, arcrole, True):
+            return diffs
         fromRels = self.fromDTS.relationshipSet(arcrole, fromLinkrole).fromModelObject(fromConcept)
         toRels = self.toDTS.relationshipSet(arcrole, toLinkrole).fromModelObject(toConcept)
         if arcrole == XbrlConst.dimensionDomain: arcrole = XbrlConst.domainMember #consec rel set
@@ -4,7 +4,7 @@ Created on Oct 3, 2010
 @author: Mark V Systems Limited
 (c) Copyright 2010 Mark V Systems Limited, All rights reserved.
 '''
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
 import os, sys, traceback, uuid
 import logging
 from arelle import UrlUtil, XmlUtil, ModelValue, XbrlConst, XmlValidate
@@ -57,6 +57,8 @@ def load(modelManager, url, nextaction=None, base=None, useFileSource=None, erro
     modelXbrl.modelDocument = ModelDocument.load(modelXbrl, url, base, isEntry=True, **kwargs)
     del modelXbrl.entryLoadingUrl
     loadSchemalocatedSchemas(modelXbrl)
+    if modelManager.precomputeConcepts:
+        modelXbrl.precomputeConcepts()
     
     #from arelle import XmlValidate
     #uncomment for trial use of lxml xml schema validation of entry document
@@ -280,6 +282,13 @@ class ModelXbrl:
         self.formulaOutputInstance = None
         self.logger = logging.getLogger("arelle")
         self.profileStats = {}
+        self.profileAllocations = {}
+        if self.modelManager.collectProfileAllocations:
+            self.profileAllocationsStat(None) # baseline for allocations of first phase
+        self.variableSetProfiles = {} # VariableSetProfile by variable set when profiling formula variable sets
+        self.utrResolver = None # ValidateUtr with UTR entries resolved per type and unit, when used
+        self.lexicalValidators = {} # XmlValidate.LexicalValidator by (base xsd type, facets)
+        self.ixValueMemo = OrderedDict() # transformed inline values, least recently used first (ModelInlineValueObject.value)
         self.schemaDocsToValidate = set()
         self.modelXbrl = self # for consistency in addressing modelXbrl
 
@@ -294,11 +303,13 @@ class ModelXbrl:
                 self.fileSource.close()
             modelDocument = getattr(self,"modelDocument",None)
             urlDocs = getattr(self,"urlDocs",None)
+            modelManager = self.modelManager
             for relSet in self.relationshipSets.values():
                 relSet.clear()
             self.__dict__.clear() # dereference everything before closing document
             if modelDocument:
                 modelDocument.close(urlDocs=urlDocs)
+            modelManager.modelXbrlClosed()
             
     @property
     def isClosed(self):
@@ -321,6 +332,16 @@ class ModelXbrl:
         self.modelManager.showStatus(_("xbrl loading finished, {0}...").format(nextaction),5000)
         self.modelManager.reloadViews(self)
             
+    def precomputeConcepts(self):
+        """Resolves and caches type chains, substitution group closures and derived type properties of
+        all concepts of the DTS in one pass (instead of lazily on first use by later processing).
+        """
+        self.modelManager.showStatus(_("precomputing concept properties"))
+        self.profileActivity()
+        for concept in set(self.qnameConcepts.values()):
+            concept.precompute()
+        self.profileActivity("... concept properties precomputed", minTimeToShow=1.0)
+            
     def closeViews(self):
         """Close views associated with this modelXbrl
         """
@@ -352,6 +373,13 @@ class ModelXbrl:
             ModelRelationshipSet.create(self, arcrole, linkrole, linkqname, arcqname, includeProhibits)
         return self.relationshipSets[key]
     
+    def clearLabelIndex(self):
+        """Clears labels resolved by relationship sets, for use after editing labels or label relationships 
+        (relationship sets are cached, and index the labels they have resolved).
+        """
+        for relationshipSet in self.relationshipSets.values():
+            relationshipSet.clearLabelIndex()
+    
     def baseSetModelLink(self, linkElement):
         for modelLink in self.baseSets[("XBRL-footnotes",None,None,None)]:
             if modelLink == linkElement:
@@ -760,6 +788,42 @@ class ModelXbrl:
                         fbdq[DEFAULT].add(fact)
             return fbdq[memQname]
         
+    def factsByQnameContextUnit(self, qname, context, unit): # indexed by fact qname, context hash and unit hash
+        """Facts in the instance of specified QName with context and unit equal to those specified, 
+        located by a cached index of fact QName, context hash and unit hash (such as for matching summation
+        item facts to their total fact without comparing to every fact of the item concept)
+
+        :param qname: Fact (concept) QName
+        :type qname: QName
+        :param context: Context to match (dimensional if instance has XDT, else s-equal segment and scenario)
+        :type context: ModelContext
+        :param unit: Unit to match, or None to match facts without unit
+        :type unit: ModelUnit
+        :returns: list -- ModelFacts in document order
+        """
+        try:
+            fbqcu = self._factsByQnameContextUnit
+        except AttributeError:
+            self._factsByQnameContextUnit = fbqcu = defaultdict(list)
+            dimensionalAspectModel = self.hasXDT # as used by context isEqualTo
+            for f in self.factsInInstance:
+                c = f.context
+                if c is not None:
+                    u = f.unit
+                    fbqcu[f.qname, 
+                          c.contextDimAwareHash if dimensionalAspectModel else c.contextNonDimAwareHash,
+                          u.hash if u is not None else None].append(f)
+        if context is None:
+            return []
+        key = (qname, 
+               context.contextDimAwareHash if self.hasXDT else context.contextNonDimAwareHash,
+               unit.hash if unit is not None else None)
+        if key not in fbqcu:
+            return []
+        # hashes only select candidates, equality is confirmed as in a full comparison
+        return [f for f in fbqcu[key]
+                if context.isEqualTo(f.context) and (unit.isEqualTo(f.unit) if unit is not None else f.unit is None)]
+
     def matchFact(self, otherFact, unmatchedFactsStack=None):
         """Finds matching fact, by XBRL 2.1 duplicate definition (if tuple), or by
         QName and VEquality (if an item), lang and accuracy equality, as in formula and test case usage
@@ -1070,14 +1134,72 @@ class ModelXbrl:
             try:
                 if name:
                     thisTime = stat if stat is not None else time.time() - self._startedTimeStat
-                    mem = self.modelXbrl.modelManager.cntlr.memoryUsed
+                    mem = self.modelXbrl.modelManager.cntlr.currentMemoryUsed
                     prevTime = self.profileStats.get(name, (0,0,0))[1]
                     self.profileStats[name] = (profileStatNumber, thisTime + prevTime, mem)
                     profileStatNumber += 1
             except AttributeError:
                 pass
+            if self.modelManager.collectProfileAllocations and (name or stat is None):
+                self.profileAllocationsStat(name)
             if stat is None:
                 self._startedTimeStat = time.time()
+                
+    def profileAllocationsStat(self, name, topAllocations=25):
+        """Records the top allocation sites (by change in allocated size) since the prior profile stat,
+        when python tracemalloc is tracing, and starts a new allocations baseline for the next stat.
+        
+        :param name: Profile stat name, or None to only start a new baseline
+        :type name: str
+        """
+        try:
+            import tracemalloc
+        except ImportError: # python before 3.4
+            return
+        if not tracemalloc.is_tracing():
+            return
+        snapshot = tracemalloc.take_snapshot().filter_traces((tracemalloc.Filter(False, tracemalloc.__file__),))
+        priorSnapshot = getattr(self, "_profileAllocationsSnapshot", None)
+        if name:
+            if priorSnapshot is not None:
+                statistics = snapshot.compare_to(priorSnapshot, "lineno")
+            else:
+                statistics = snapshot.statistics("lineno")
+            tracedSize, tracedPeak = tracemalloc.get_traced_memory()
+            self.profileAllocations[name] = {
+                "tracedKB": tracedSize // 1024,
+                "tracedPeakKB": tracedPeak // 1024,
+                "sizeDiffKB": sum(getattr(s, "size_diff", s.size) for s in statistics) // 1024,
+                "topAllocations": [{"file": s.traceback[0].filename,
+                                    "line": s.traceback[0].lineno,
+                                    "sizeDiffKB": getattr(s, "size_diff", s.size) / 1024.0,
+                                    "countDiff": getattr(s, "count_diff", s.count),
+                                    "sizeKB": s.size / 1024.0}
+                                   for s in statistics[:topAllocations]]}
+        self._profileAllocationsSnapshot = snapshot
+        if hasattr(tracemalloc, "reset_peak"): # python 3.9+
+            tracemalloc.reset_peak()
+            
+    def saveProfileStats(self, filename):
+        """Saves profile stats (and allocation sites, if collected) as a JSON file, phases in order of collection
+        
+        :param filename: File name to save JSON profile statistics
+        :type filename: str
+        """
+        import json, io
+        phases = []
+        for statName, statValue in sorted(self.profileStats.items(), key=lambda item: item[1]):
+            phase = {"name": statName,
+                     "time": statValue[1],
+                     "memoryKB": statValue[2]}
+            if statName in self.profileAllocations:
+                phase["allocations"] = self.profileAllocations[statName]
+            phases.append(phase)
+        with io.open(filename, "wt", encoding="utf-8") as fh:
+            fh.write(_STR_UNICODE(json.dumps({"entryPoint": self.modelDocument.uri if self.modelDocument is not None else None,
+                                              "phases": phases}, 
+                                             ensure_ascii=False, indent=1)))
+        self.info("info", _("Saved profile statistics to %(file)s"), modelXbrl=self, file=filename)
         
     def profileActivity(self, activityCompleted=None, minTimeToShow=0):
         """Used to provide interactive GUI messages of long-running processes.
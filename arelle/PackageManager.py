@@ -12,7 +12,7 @@ else:
     from urlparse import urljoin
 openFileSource = None
 from arelle import Locale
-from arelle.UrlUtil import isHttpUrl
+from arelle.UrlUtil import isHttpUrl, UrlPrefixRemappings
 try:
     from collections import OrderedDict
 except ImportError:
@@ -104,10 +104,11 @@ packagesJsonFile = None
 packagesConfig = None
 packagesConfigChanged = False
 packagesMappings = {}
+packagesRemappings = None # UrlPrefixRemappings of enabled packages, rebuilt when packages change
 _cntlr = None
 
 def init(cntlr):
-    global packagesJsonFile, packagesConfig, packagesMappings, _cntlr
+    global packagesJsonFile, packagesConfig, packagesMappings, packagesRemappings, _cntlr
     try:
         packagesJsonFile = cntlr.userAppDir + os.sep + "taxonomyPackages.json"
         with io.open(packagesJsonFile, 'rt', encoding='utf-8') as f:
@@ -121,11 +122,14 @@ def init(cntlr):
         }
         packagesConfigChanged = False # don't save until something is added to pluginConfig
     pluginMethodsForClasses = {} # dict by class of list of ordered callable function objects
+    packagesRemappings = None
     _cntlr = cntlr
     
 def reset():  # force reloading modules and plugin infos
+    global packagesRemappings
     packagesConfig.clear()  # dict of loaded module pluginInfo objects by module names
     packagesMappings.clear() # dict by class of list of ordered callable function objects
+    packagesRemappings = None
     
 def orderedPackagesConfig():
     return OrderedDict(
@@ -152,8 +156,9 @@ def save(cntlr):
 def close():  # close all loaded methods
     packagesConfig.clear()
     packagesMappings.clear()
-    global webCache
+    global webCache, packagesRemappings
     webCache = None
+    packagesRemappings = None
     
 ''' packagesConfig structure
 
@@ -240,6 +245,7 @@ def packageInfo(URL, reload=False):
     return None
 
 def rebuildRemappings():
+    global packagesRemappings
     remappings = packagesConfig["remappings"]
     remappings.clear()
     for _packageInfo in packagesConfig["packages"]:
@@ -247,19 +253,25 @@ def rebuildRemappings():
             for prefix, remapping in _packageInfo['remappings'].items():
                 if prefix not in remappings:
                     remappings[prefix] = remapping
+    packagesRemappings = None # memoized remappings are rebuilt on next use
+
+def remappedUrl(url):
+    """(str) -- url remapped by enabled packages, or None if no package prefix applies"""
+    global packagesRemappings
+    if packagesConfig is None:
+        return None
+    if packagesRemappings is None:
+        packagesRemappings = UrlPrefixRemappings(packagesConfig.get('remappings', EMPTYDICT).items())
+    return packagesRemappings.mappedUrl(url)
 
 def isMappedUrl(url):
-    return (packagesConfig is not None and 
-            any(url.startswith(mapFrom) 
-                for mapFrom in packagesConfig.get('remappings', EMPTYDICT).keys()))
+    return remappedUrl(url) is not None
 
 def mappedUrl(url):
-    if packagesConfig is not None:
-        for mapFrom, mapTo in packagesConfig.get('remappings', EMPTYDICT).items():
-            if url.startswith(mapFrom):
-                url = mapTo + url[len(mapFrom):]
-                break
-    return url
+    _remappedUrl = remappedUrl(url)
+    if _remappedUrl is None:
+        return url
+    return _remappedUrl
 
 def addPackage(url):
     newPackageInfo = packageInfo(url)
@@ -389,3 +389,43 @@ def relativeUri(baseUri, relativeUri): # return uri relative to this modelDocume
     else:
         return os.path.relpath(relativeUri, os.path.dirname(baseUri)).replace('\\','/')
 
+
+class UrlPrefixRemappings:
+    """Prefix trie of url remappings (from prefix, to prefix), with memoized results per url.
+    
+    When more than one prefix applies the earliest listed remapping wins, as for a linear
+    scan of url.startswith(prefix) over the remappings in order.
+    """
+    __slots__ = ("trie", "mappedUrls")
+    def __init__(self, remappings=()):
+        self.trie = {}
+        self.mappedUrls = {}
+        for i, remapping in enumerate(remappings):
+            mapFrom, mapTo = remapping
+            node = self.trie
+            for char in mapFrom:
+                node = node.setdefault(char, {})
+            if None not in node: # None key holds remapping ending at this node
+                node[None] = (i, len(mapFrom), mapTo)
+    
+    def mappedUrl(self, url):
+        """(str) -- remapped url, or None if no prefix applies to url"""
+        try:
+            return self.mappedUrls[url]
+        except KeyError:
+            pass
+        node = self.trie
+        remapping = node.get(None) # empty prefix
+        for char in url:
+            node = node.get(char)
+            if node is None:
+                break
+            _remapping = node.get(None)
+            if _remapping is not None and (remapping is None or _remapping[0] < remapping[0]):
+                remapping = _remapping
+        if remapping is None:
+            mappedUrl = None
+        else:
+            mappedUrl = remapping[2] + url[remapping[1]:]
+        self.mappedUrls[url] = mappedUrl
+        return mappedUrl
@@ -0,0 +1,114 @@
+'''
+Created on Oct 18, 2026
+
+@author: Mark V Systems Limited
+(c) Copyright 2026 Mark V Systems Limited, All rights reserved.
+
+Registry of per-fact, per-context and per-unit validation callbacks, run in a single
+(fused) traversal of the instance, so that validations which each need to visit every
+fact don't each walk the facts (and resolve their concepts, contexts and units) again.
+
+Fact visitors are called as visitor(fact, concept, context, unit), in document order,
+descending into tuple contents unless registered with nestedFacts=False (for checks
+which only apply to top level facts).  During a fact visit, parentTuples is a dict by
+qname of the tuple facts enclosing the fact being visited.  Context and unit visitors
+are then called with each context and unit, followed by finalizers.
+
+The pass doesn't compute fact hashes: none of its visitors compares facts, and the hash
+for comparing facts (ModelFact.conceptContextUnitLangHash, with the context and unit
+hashes it combines) is kept by the fact when first used, so it is computed once per fact
+however many validations use it.
+
+Messages are logged in the order of the pass, so each fact's messages (of all of its
+visitors) are together in document order, followed by those of contexts and units, rather
+than being grouped by validation.
+
+Visitors registered with a profileStatName have their time accumulated and recorded
+as that profile stat (when collecting profile stats) after the pass.
+
+ValidateXbrl runs the XBRL 2.1, dimensional and UTR fact, context and unit checks in
+one such pass, and plugins may add their own visitors by the Validate.XBRL.FactVisitors
+method, which is called with (val, factVisitors) before the pass.
+'''
+import time
+
+class FactVisitors:
+    def __init__(self, modelXbrl):
+        self.modelXbrl = modelXbrl
+        self.factVisitors = [] # (visitor, nestedFacts)
+        self.contextVisitors = []
+        self.unitVisitors = []
+        self.finalizers = []
+        self.parentTuples = {}
+        self.profileTimes = {} # time of visitors by profileStatName
+
+    def __bool__(self): # python 3
+        return bool(self.factVisitors or self.contextVisitors or self.unitVisitors or self.finalizers)
+
+    __nonzero__ = __bool__ # python 2
+
+    def addFactVisitor(self, visitor, nestedFacts=True, profileStatName=None):
+        self.factVisitors.append((self.profiledVisitor(visitor, profileStatName), nestedFacts))
+
+    def addContextVisitor(self, visitor, profileStatName=None):
+        self.contextVisitors.append(self.profiledVisitor(visitor, profileStatName))
+
+    def addUnitVisitor(self, visitor, profileStatName=None):
+        self.unitVisitors.append(self.profiledVisitor(visitor, profileStatName))
+
+    def addFinalizer(self, finalizer, profileStatName=None):
+        self.finalizers.append(self.profiledVisitor(finalizer, profileStatName))
+        
+    def profiledVisitor(self, visitor, profileStatName):
+        if not profileStatName or not self.modelXbrl.modelManager.collectProfileStats:
+            return visitor
+        profileTimes = self.profileTimes
+        profileTimes.setdefault(profileStatName, 0.0)
+        def profiledVisitor(*args):
+            startedAt = time.time()
+            try:
+                return visitor(*args)
+            finally:
+                profileTimes[profileStatName] += time.time() - startedAt
+        return profiledVisitor
+
+    def visit(self):
+        modelXbrl = self.modelXbrl
+        if self.factVisitors:
+            self.visitFacts(modelXbrl.facts)
+        if self.contextVisitors:
+            for cntx in modelXbrl.contexts.values():
+                for visitor in self.contextVisitors:
+                    visitor(cntx)
+        if self.unitVisitors:
+            for unit in modelXbrl.units.values():
+                for visitor in self.unitVisitors:
+                    visitor(unit)
+        for finalizer in self.finalizers:
+            finalizer()
+        for profileStatName, profileTime in self.profileTimes.items():
+            modelXbrl.profileStat(profileStatName, profileTime)
+
+    def visitFacts(self, facts, parentTuples=None):
+        # visit facts (and their tuple contents) without running context and unit visitors or finalizers
+        self.parentTuples = parentTuples if parentTuples is not None else {}
+        self._visitFacts(facts,
+                         tuple(visitor for visitor, nestedFacts in self.factVisitors),
+                         tuple(visitor for visitor, nestedFacts in self.factVisitors if nestedFacts))
+
+    def _visitFacts(self, facts, visitors, nestedVisitors):
+        parentTuples = self.parentTuples
+        for f in facts:
+            concept = f.concept
+            context = f.context
+            unit = f.unit
+            for visitor in visitors:
+                visitor(f, concept, context, unit)
+            if nestedVisitors and f.modelTupleFacts:
+                priorParent = parentTuples.get(f.qname)
+                parentTuples[f.qname] = f
+                self._visitFacts(f.modelTupleFacts, nestedVisitors, nestedVisitors)
+                if priorParent is None:
+                    del parentTuples[f.qname]
+                else:
+                    parentTuples[f.qname] = priorParent
@@ -570,23 +570,29 @@ class ValidateFiling(ValidateXbrl.ValidateXbrl):
             requiredFactLang = disclosureSystem.defaultXmlLang
 
             #6.5.12 equivalent facts
-            factsForLang = {}
+            keysDefaultLang = set()
             factForConceptContextUnitLangHash = {}
             keysNotDefaultLang = {}
+            insignificances = {} # (lexical value, decimals, value type): insignificant digits, for repeated values
             iF1 = 1
             for f1 in modelXbrl.facts:
                 # build keys table for 6.5.14
                 if not f1.isNil:
-                    langTestKey = "{0},{1},{2}".format(f1.qname, f1.contextID, f1.unitID)
-                    factsForLang.setdefault(langTestKey, []).append(f1)
+                    langTestKey = (f1.qname, f1.contextID, f1.unitID)
                     lang = f1.xmlLang
-                    if lang and lang != requiredFactLang: # not lang.startswith(factLangStartsWith):
+                    if lang == requiredFactLang:
+                        keysDefaultLang.add(langTestKey)
+                    elif lang: # not lang.startswith(factLangStartsWith):
                         keysNotDefaultLang[langTestKey] = f1
                         
                     # 6.5.37 test (insignificant digits due to rounding)
                     if f1.isNumeric and f1.decimals and f1.decimals != "INF" and not f1.isNil and getattr(f1,"xValid", 0) == 4:
                         try:
-                            insignificance = insignificantDigits(f1.xValue, decimals=f1.decimals)
+                            insignificanceKey = (f1.value, f1.decimals, type(f1.xValue))
+                            try:
+                                insignificance = insignificances[insignificanceKey]
+                            except KeyError:
+                                insignificance = insignificances[insignificanceKey] = insignificantDigits(f1.xValue, decimals=f1.decimals)
                             if insignificance: 
                                 modelXbrl.error(("EFM.6.05.37", "GFM.1.02.26"),
                                     _("Fact %(fact)s of context %(contextID)s decimals %(decimals)s value %(value)s has nonzero digits in insignificant portion %(value2)s."),
@@ -609,17 +615,12 @@ class ValidateFiling(ValidateXbrl.ValidateXbrl):
                 else:
                     factForConceptContextUnitLangHash[h] = f1
                 iF1 += 1
-            del factForConceptContextUnitLangHash
+            del factForConceptContextUnitLangHash, insignificances
             self.modelXbrl.profileActivity("... filer fact checks", minTimeToShow=1.0)
     
             #6.5.14 facts without english text
             for keyNotDefaultLang, factNotDefaultLang in keysNotDefaultLang.items():
-                anyDefaultLangFact = False
-                for fact in factsForLang[keyNotDefaultLang]:
-                    if fact.xmlLang == requiredFactLang: #.startswith(factLangStartsWith):
-                        anyDefaultLangFact = True
-                        break
-                if not anyDefaultLangFact:
+                if keyNotDefaultLang not in keysDefaultLang:
                     self.modelXbrl.error(("EFM.6.05.14", "GFM.1.02.13"),
                         _("Fact %(fact)s of context %(contextID)s has text of xml:lang '%(lang)s' without corresponding %(lang2)s text"),
                         modelObject=factNotDefaultLang, fact=factNotDefaultLang.qname, contextID=factNotDefaultLang.contextID, 
@@ -2133,11 +2134,10 @@ class ValidateFiling(ValidateXbrl.ValidateXbrl):
                     compatibleItemConcepts = set()
                     compatibleFacts = {totalFact}
                     for itemConcept in contributingItems:
-                        for itemFact in self.modelXbrl.factsByQname[itemConcept.qname]:
-                            if (totalFactContext.isEqualTo(itemFact.context) and
-                                totalFactUnit.isEqualTo(itemFact.unit)):
-                                compatibleItemConcepts.add(itemConcept)
-                                compatibleFacts.add(itemFact)
+                        itemFacts = self.modelXbrl.factsByQnameContextUnit(itemConcept.qname, totalFactContext, totalFactUnit)
+                        if itemFacts:
+                            compatibleItemConcepts.add(itemConcept)
+                            compatibleFacts.update(itemFacts)
                     if len(compatibleItemConcepts) >= 2: # 6.15.2 requires 2 or more line items along with their net or total
                         compatibleItemsFacts[frozenset(compatibleItemConcepts)].update(compatibleFacts)
             for compatibleItemConcepts, compatibleFacts in compatibleItemsFacts.items():
@@ -411,8 +411,16 @@ def validate(val, xpathContext=None, parametersOnly=False, statusMsg='', compile
     if parametersOnly:
         return
 
-    for modelVariableSet in val.modelXbrl.modelVariableSets:
-        modelVariableSet.compile()
+    if formulaOptions.profileVariableSets:
+        from arelle.FormulaEvaluator import variableSetProfile
+        val.modelXbrl.variableSetProfiles.clear()
+        for modelVariableSet in val.modelXbrl.modelVariableSets:
+            compileStarted = time.time()
+            modelVariableSet.compile()
+            variableSetProfile(val.modelXbrl, modelVariableSet).compileTime += time.time() - compileStarted
+    else:
+        for modelVariableSet in val.modelXbrl.modelVariableSets:
+            modelVariableSet.compile()
     val.modelXbrl.profileStat(_("formulaCompilation"))
 
     produceOutputXbrlInstance = False
@@ -7,6 +7,7 @@ Created on Dec 30, 2010
 import os
 from lxml import etree
 from arelle import ModelDocument
+from arelle.ValidateFactVisitors import FactVisitors
 from collections import defaultdict
 
 class UtrEntry(): # use slotted class for execution efficiency
@@ -70,58 +71,96 @@ def xmlEltMatch(node, localName, namespaceUri):
 '''
 
 def validateFacts(modelXbrl):
-    ValidateUtr(modelXbrl).validateFacts()
+    utrResolver(modelXbrl).validateFacts()
     
 def utrEntries(modelType, modelUnit):
-    return ValidateUtr(modelType.modelXbrl).utrEntries(modelType, modelUnit)
+    return utrResolver(modelType.modelXbrl).utrEntries(modelType, modelUnit)
+
+def utrResolver(modelXbrl):
+    # one resolver per DTS, so type and unit resolutions are shared by validation, formula and rendering
+    if modelXbrl.utrResolver is None:
+        modelXbrl.utrResolver = ValidateUtr(modelXbrl)
+    return modelXbrl.utrResolver
+    
+def unitMeasuresKey(unit):
+    measures = unit.measures
+    return (tuple(measures[0]), tuple(measures[1]))
     
 class ValidateUtr:
     def __init__(self, modelXbrl):
         self.modelXbrl = modelXbrl
+        self.utrItemTypeEntries = None
+        
+    def loadUtrItemTypeEntries(self):
+        disclosureSystem = self.modelXbrl.modelManager.disclosureSystem
+        if not hasattr(disclosureSystem, "utrItemTypeEntries"): 
+            loadUtr(self.modelXbrl.modelManager)
+        utrItemTypeEntries = getattr(disclosureSystem, "utrItemTypeEntries", {})
+        if utrItemTypeEntries is not self.utrItemTypeEntries: # first use or UTR (re)loaded
+            self.utrItemTypeEntries = utrItemTypeEntries
+            self.typeUtrEntryLevels = {} # modelType: matching utr entries of each type in derivation chain having any
+            self.typeUnitSatisfied = {} # (modelType, unit measures): unit satisfies type's constraining utr entries
+            self.typeUnitUtrEntries = {} # (modelType, unit measures): satisfying utr entries of type's derivation chain
         
     def validateFacts(self):
         modelXbrl = self.modelXbrl
         if modelXbrl.modelDocument.type in (ModelDocument.Type.INSTANCE, ModelDocument.Type.INLINEXBRL):
-            if not hasattr(modelXbrl.modelManager.disclosureSystem, "utrItemTypeEntries"): 
-                loadUtr(modelXbrl.modelManager)
-            self.utrItemTypeEntries = modelXbrl.modelManager.disclosureSystem.utrItemTypeEntries
-            modelXbrl.modelManager.cntlr.showStatus(_("Validating for Unit Type Registry").format())     
-            utrInvalidFacts = []
-            for f in modelXbrl.facts:
-                concept = f.concept
-                if concept is not None and concept.isNumeric:
-                    unit = f.unit
-                    bConstrained = False
-                    if f.unitID is not None and unit is not None:  # Would have failed XBRL validation otherwise
-                        bSatisfied = True
-                        utrMatchingEntries = []
-                        _type = concept.type
-                        while _type is not None:
-                            if _type.name in self.utrItemTypeEntries:
-                                for utrEntry in self.utrItemTypeEntries[_type.name].values():
-                                    if utrEntry.itemType is None or utrEntry.itemType == _type.name:
-                                        if utrEntry.nsItemType is None or utrEntry.nsItemType == _type.modelDocument.targetNamespace:
-                                            utrMatchingEntries.append(utrEntry)                                                
-                            if utrMatchingEntries:
-                                bConstrained = True
-                                _type = None # No more looking for registry entries
-                                bSatisfied = any(self.unitSatisfies(utrEntry, unit)
-                                                 for utrEntry in utrMatchingEntries)
-                                break # while
-                            #print(_("type={0}\ntype.qnameDerivedFrom={1}".format(_type,_type.qnameDerivedFrom)))
-                            _type = _type.typeDerivedFrom
-                            if isinstance(_type,list): # union type
-                                _type = _type[0] # for now take first of union's types
-                            #print(_("type={0}").format(_type))
-                        # end while
-                    # end if
-                    if bConstrained and not bSatisfied:
-                        utrInvalidFacts.append(f)
-            # end for
-            for fact in utrInvalidFacts:
-                modelXbrl.error("utre:error-NumericFactUtrInvalid",
-                                _("Unit %(unitID)s disallowed on fact %(element)s of type %(typeName)s"),
-                                modelObject=fact, unitID=fact.unitID, element=fact.qname, typeName=fact.concept.type.name)
+            factVisitors = FactVisitors(modelXbrl)
+            self.addFactVisitors(factVisitors)
+            factVisitors.visit()
+            
+    def addFactVisitors(self, factVisitors):
+        # UTR fact checks as part of a (fused) fact visitors pass, reporting after all facts are visited
+        self.loadUtrItemTypeEntries()
+        self.modelXbrl.modelManager.cntlr.showStatus(_("Validating for Unit Type Registry").format())     
+        self.utrInvalidFacts = []
+        factVisitors.addFactVisitor(self.checkFact, nestedFacts=False, profileStatName=_("validateUTR"))
+        factVisitors.addFinalizer(self.reportInvalidFacts, profileStatName=_("validateUTR"))
+        
+    def checkFact(self, f, concept, context, unit):
+        if (concept is not None and concept.isNumeric and 
+            f.unitID is not None and unit is not None and  # Would have failed XBRL validation otherwise
+            not self.unitSatisfiesType(concept.type, unit)):
+            self.utrInvalidFacts.append(f)
+                
+    def reportInvalidFacts(self):
+        for fact in self.utrInvalidFacts:
+            self.modelXbrl.error("utre:error-NumericFactUtrInvalid",
+                            _("Unit %(unitID)s disallowed on fact %(element)s of type %(typeName)s"),
+                            modelObject=fact, unitID=fact.unitID, element=fact.qname, typeName=fact.concept.type.name)
+        self.utrInvalidFacts = []
+        
+    def utrEntryLevels(self, modelType):
+        try:
+            return self.typeUtrEntryLevels[modelType]
+        except KeyError:
+            levels = []
+            _type = modelType
+            while _type is not None:
+                if _type.name in self.utrItemTypeEntries:
+                    utrMatchingEntries = [utrEntry
+                                          for utrEntry in self.utrItemTypeEntries[_type.name].values()
+                                          if utrEntry.itemType is None or utrEntry.itemType == _type.name
+                                          if utrEntry.nsItemType is None or utrEntry.nsItemType == _type.modelDocument.targetNamespace]
+                    if utrMatchingEntries:
+                        levels.append(utrMatchingEntries)
+                _type = _type.typeDerivedFrom
+                if isinstance(_type,list): # union type
+                    _type = _type[0] # for now take first of union's types
+            self.typeUtrEntryLevels[modelType] = levels
+            return levels
+        
+    def unitSatisfiesType(self, modelType, unit):
+        # a type is constrained by the utr entries of the nearest type in its derivation chain having any
+        key = (modelType, unitMeasuresKey(unit))
+        try:
+            return self.typeUnitSatisfied[key]
+        except KeyError:
+            levels = self.utrEntryLevels(modelType)
+            satisfied = not levels or any(self.unitSatisfies(utrEntry, unit)
+                                          for utrEntry in levels[0])
+            self.typeUnitSatisfied[key] = satisfied
+            return satisfied
 
     def unitSatisfies(self, utrEntry, unit): # Return true if entry is satisfied by unit
         if utrEntry.isSimple: # Entry requires a measure
@@ -185,24 +224,15 @@ class ValidateUtr:
         return bResult
 
     def utrEntries(self, modelType, unit):
-        utrSatisfyingEntries = set()
-        modelXbrl = self.modelXbrl
-        if not hasattr(modelXbrl.modelManager.disclosureSystem, "utrItemTypeEntries"): 
-            loadUtr(modelXbrl.modelManager)
-        self.utrItemTypeEntries = modelXbrl.modelManager.disclosureSystem.utrItemTypeEntries
-        _type = modelType
-        while _type is not None:
-            if _type.name in self.utrItemTypeEntries:
-                utrMatchingEntries = [utrEntry
-                                      for utrEntry in self.utrItemTypeEntries[_type.name].values()
-                                      if utrEntry.itemType is None or utrEntry.itemType == _type.name
-                                      if utrEntry.nsItemType is None or utrEntry.nsItemType == _type.modelDocument.targetNamespace]
-                if utrMatchingEntries:
-                    for utrEntry in utrMatchingEntries:
-                        if self.unitSatisfies(utrEntry, unit):
-                            utrSatisfyingEntries.add(utrEntry)
-            _type = _type.typeDerivedFrom
-            if isinstance(_type,list): # union type
-                _type = _type[0] # for now take first of union's types
-        return utrSatisfyingEntries
-
+        self.loadUtrItemTypeEntries()
+        key = (modelType, unitMeasuresKey(unit))
+        try:
+            return self.typeUnitUtrEntries[key]
+        except KeyError:
+            # frozenset, as the same entries are returned for every fact of the type and unit
+            utrSatisfyingEntries = frozenset(utrEntry
+                                             for utrMatchingEntries in self.utrEntryLevels(modelType)
+                                             for utrEntry in utrMatchingEntries
+                                             if self.unitSatisfies(utrEntry, unit))
+            self.typeUnitUtrEntries[key] = utrSatisfyingEntries
+            return utrSatisfyingEntries
@@ -12,6 +12,7 @@ from arelle.ModelObject import ModelObject
 from arelle.ModelInstanceObject import ModelInlineFact
 from arelle.ModelValue import qname
 from arelle.PluginManager import pluginClassMethods
+from arelle.ValidateFactVisitors import FactVisitors
 from arelle.XmlValidate import VALID
 from collections import defaultdict
 validateUniqueParticleAttribution = None # dynamic import
@@ -221,26 +222,18 @@ class ValidateXbrl:
         modelXbrl.modelManager.showStatus(_("validating instance"))
         if modelXbrl.modelDocument.type == ModelDocument.Type.INSTANCE or \
            modelXbrl.modelDocument.type == ModelDocument.Type.INLINEXBRL:
-            self.checkFacts(modelXbrl.facts)
-            self.checkContexts(self.modelXbrl.contexts.values())
-            self.checkUnits(self.modelXbrl.units.values())
+            # fact, context and unit checks of XBRL 2.1, dimensions, UTR and plugins are done in a single pass
+            # (the validateInstance profile stat includes the validateDimensions and validateUTR times)
+            factVisitors = FactVisitors(modelXbrl)
+            self.addFactVisitors(factVisitors)
+            if self.validateUTR:
+                ValidateUtr.utrResolver(modelXbrl).addFactVisitors(factVisitors)
+            for pluginXbrlMethod in pluginClassMethods("Validate.XBRL.FactVisitors"):
+                pluginXbrlMethod(self, factVisitors)
+            factVisitors.visit()
 
             modelXbrl.profileStat(_("validateInstance"))
 
-            if modelXbrl.hasXDT:            
-                modelXbrl.modelManager.showStatus(_("validating dimensions"))
-                ''' uncomment if using otherFacts in checkFact
-                dimCheckableFacts = set(f 
-                                        for f in modelXbrl.factsInInstance
-                                        if f.concept.isItem and f.context is not None)
-                while (dimCheckableFacts): # check one and all of its compatible family members
-                    f = dimCheckableFacts.pop()
-                    ValidateXbrlDimensions.checkFact(self, f, dimCheckableFacts)
-                del dimCheckableFacts
-                '''
-                self.checkFactsDimensions(modelXbrl.facts) # check fact dimensions in document order
-                self.checkContextsDimensions(modelXbrl.contexts.values())
-                modelXbrl.profileStat(_("validateDimensions"))
                     
         # dimensional validity
         #concepts checks
@@ -366,10 +359,6 @@ class ValidateXbrl:
             ValidateXbrlCalcs.validate(modelXbrl, inferDecimals=self.validateInferDecimals)
             modelXbrl.profileStat(_("validateCalculations"))
             
-        if self.validateUTR:
-            ValidateUtr.validateFacts(modelXbrl)
-            modelXbrl.profileStat(_("validateUTR"))
-            
         if self.validateIXDS:
             modelXbrl.modelManager.showStatus(_("Validating inline document set"))
             ixdsIdObjects = defaultdict(list)
@@ -614,162 +603,170 @@ class ValidateXbrl:
             resourceArcTos = None # dereference arcs
         
     def checkFacts(self, facts, inTuple=None):  # do in document order
-        for f in facts:
-            concept = f.concept
-            if concept is not None:
-                if concept.isNumeric:
-                    unit = f.unit
-                    if f.unitID is None or unit is None:
-                        self.modelXbrl.error("xbrl.4.6.2:numericUnit",
-                             _("Fact %(fact)s context %(contextID)s is numeric and must have a unit"),
-                             modelObject=f, fact=f.qname, contextID=f.contextID)
-                    else:
-                        if concept.isMonetary:
-                            measures = unit.measures
-                            if not measures or len(measures[0]) != 1 or len(measures[1]) != 0:
-                                self.modelXbrl.error("xbrl.4.8.2:monetaryFactUnit-notSingleMeasure",
-                                    _("Fact %(fact)s context %(contextID)s must have a single unit measure which is monetary %(unitID)s"),
-                                     modelObject=f, fact=f.qname, contextID=f.contextID, unitID=f.unitID)
-                            elif (measures[0][0].namespaceURI != XbrlConst.iso4217 or
-                                  not self.isoCurrencyPattern.match(measures[0][0].localName)):
-                                self.modelXbrl.error("xbrl.4.8.2:monetaryFactUnit-notMonetaryMeasure",
-                                    _("Fact %(fact)s context %(contextID)s must have a monetary unit measure %(unitID)s"),
-                                     modelObject=f, fact=f.qname, contextID=f.contextID, unitID=f.unitID)
-                        elif concept.isShares:
-                            measures = unit.measures
-                            if not measures or len(measures[0]) != 1 or len(measures[1]) != 0:
-                                self.modelXbrl.error("xbrl.4.8.2:sharesFactUnit-notSingleMeasure",
-                                    _("Fact %(fact)s context %(contextID)s must have a single xbrli:shares unit %(unitID)s"),
-                                    modelObject=f, fact=f.qname, contextID=f.contextID, unitID=f.unitID)
-                            elif measures[0][0] != XbrlConst.qnXbrliShares:
-                                self.modelXbrl.error("xbrl.4.8.2:sharesFactUnit-notSharesMeasure",
-                                    _("Fact %(fact)s context %(contextID)s must have a xbrli:shares unit %(unitID)s"),
-                                    modelObject=f, fact=f.qname, contextID=f.contextID, unitID=f.unitID)
-                precision = f.precision
-                hasPrecision = precision is not None
-                if hasPrecision and precision != "INF" and not precision.isdigit():
-                    self.modelXbrl.error("xbrl.4.6.4:precision",
-                        _("Fact %(fact)s context %(contextID)s precision %(precision)s is invalid"),
-                        modelObject=f, fact=f.qname, contextID=f.contextID, precision=precision)
-                decimals = f.decimals
-                hasDecimals = decimals is not None
-                if hasPrecision and not self.precisionPattern.match(precision):
-                    self.modelXbrl.error("xbrl.4.6.4:precision",
-                        _("Fact %(fact)s context %(contextID)s precision %(precision)s is invalid"),
-                        modelObject=f, fact=f.qname, contextID=f.contextID, precision=precision)
-                if hasPrecision and hasDecimals:
-                    self.modelXbrl.error("xbrl.4.6.3:bothPrecisionAndDecimals",
-                        _("Fact %(fact)s context %(contextID)s can not have both precision and decimals"),
-                        modelObject=f, fact=f.qname, contextID=f.contextID)
-                if hasDecimals and not self.decimalsPattern.match(decimals):
-                    self.modelXbrl.error("xbrl.4.6.5:decimals",
-                        _("Fact %(fact)s context %(contextID)s decimals %(decimals)s is invalid"),
-                        modelObject=f, fact=f.qname, contextID=f.contextID, decimals=decimals)
-                if concept.isItem:
-                    context = f.context
-                    if context is None:
-                        self.modelXbrl.error("xbrl.4.6.1:itemContextRef",
-                            _("Item %(fact)s must have a context"),
-                            modelObject=f, fact=f.qname)
-                    else:
-                        periodType = concept.periodType
-                        if (periodType == "instant" and not context.isInstantPeriod) or \
-                           (periodType == "duration" and not (context.isStartEndPeriod or context.isForeverPeriod)):
-                            self.modelXbrl.error("xbrl.4.7.2:contextPeriodType",
-                                _("Fact %(fact)s context %(contextID)s has period type %(periodType)s conflict with context"),
-                                modelObject=f, fact=f.qname, contextID=f.contextID, periodType=periodType)
-                            
-                    # check precision and decimals
-                    if f.xsiNil == "true":
-                        if hasPrecision or hasDecimals:
-                            self.modelXbrl.error("xbrl.4.6.3:nilPrecisionDecimals",
-                                _("Fact %(fact)s context %(contextID)s can not be nil and have either precision or decimals"),
-                                modelObject=f, fact=f.qname, contextID=f.contextID)
-                    elif concept.isFraction:
-                        if hasPrecision or hasDecimals:
-                            self.modelXbrl.error("xbrl.4.6.3:fractionPrecisionDecimals",
-                                _("Fact %(fact)s context %(contextID)s is a fraction concept and cannot have either precision or decimals"),
-                                modelObject=f, fact=f.qname, contextID=f.contextID)
-                            numerator, denominator = f.fractionValue
-                            if not (numerator == "INF" or numerator.isnumeric()):
-                                self.modelXbrl.error("xbrl.5.1.1:fractionPrecisionDecimals",
-                                    _("Fact %(fact)s context %(contextID)s is a fraction with invalid numerator %(numerator)s"),
-                                    modelObject=f, fact=f.qname, contextID=f.contextID, numerator=numerator)
-                            if not denominator.isnumeric() or _INT(denominator) == 0:
-                                self.modelXbrl.error("xbrl.5.1.1:fractionPrecisionDecimals",
-                                    _("Fact %(fact)s context %(contextID)s is a fraction with invalid denominator %(denominator)")).format(
-                                    modelObject=f, fact=f.qname, contextID=f.contextID, denominator=denominator)
-                    else:
-                        if self.modelXbrl.modelDocument.type != ModelDocument.Type.INLINEXBRL:
-                            for child in f.iterchildren():
-                                if isinstance(child,ModelObject):
-                                    self.modelXbrl.error("xbrl.5.1.1:itemMixedContent",
-                                        _("Fact %(fact)s context %(contextID)s may not have child elements %(childElementName)s"),
-                                        modelObject=f, fact=f.qname, contextID=f.contextID, childElementName=child.prefixedName)
-                                    break
-                        if concept.isNumeric and not hasPrecision and not hasDecimals:
-                            self.modelXbrl.error("xbrl.4.6.3:missingPrecisionDecimals",
-                                _("Fact %(fact)s context %(contextID)s is a numeric concept and must have either precision or decimals"),
-                                modelObject=f, fact=f.qname, contextID=f.contextID)
-                        # not a real check
-                        #if f.isNumeric and not f.isNil and f.precision :
-                        #    try:
-                        #        ValidateXbrlCalcs.roundValue(f.value, f.precision, f.decimals)
-                        #    except Exception as err:
-                        #        self.modelXbrl.error("arelle:info",
-                        #            _("Fact %(fact)s value %(value)s context %(contextID)s rounding exception %(error)s"),
-                        #            modelObject=f, fact=f.qname, value=f.value, contextID=f.contextID, error = err)
-                    if self.validateEnum and concept.isEnumeration and getattr(f,"xValid", 0) == 4 and not f.isNil:
-                        memConcept = self.modelXbrl.qnameConcepts.get(f.xValue)
-                        if not ValidateXbrlDimensions.enumerationMemberUsable(self, concept, memConcept):
-                            self.modelXbrl.error("enumie:InvalidFactValue",
-                                _("Fact %(fact)s context %(contextID)s enumeration %(value)s is not in the domain of %(concept)s"),
-                                modelObject=f, fact=f.qname, contextID=f.contextID, value=f.xValue, concept=f.qname)
-                elif concept.isTuple:
-                    if f.contextID:
-                        self.modelXbrl.error("xbrl.4.6.1:tupleContextRef",
-                            _("Tuple %(fact)s must not have a context"),
-                            modelObject=f, fact=f.qname)
+        factVisitors = FactVisitors(self.modelXbrl)
+        self.addFactVisitors(factVisitors, checkDimensions=False)
+        factVisitors.visitFacts(facts, parentTuples=inTuple)
+                
+    def addFactVisitors(self, factVisitors, checkDimensions=True):
+        self.factVisitors = factVisitors # checkFact uses its parentTuples
+        factVisitors.addFactVisitor(self.checkFact)
+        factVisitors.addContextVisitor(self.checkContext)
+        factVisitors.addUnitVisitor(self.checkUnit)
+        if checkDimensions and self.modelXbrl.hasXDT:
+            factVisitors.addFactVisitor(self.checkFactDimensions, profileStatName=_("validateDimensions"))
+            factVisitors.addContextVisitor(self.checkContextDimensions, profileStatName=_("validateDimensions"))
+        
+    def checkFact(self, f, concept, context, unit):
+        if concept is not None:
+            if concept.isNumeric:
+                if f.unitID is None or unit is None:
+                    self.modelXbrl.error("xbrl.4.6.2:numericUnit",
+                         _("Fact %(fact)s context %(contextID)s is numeric and must have a unit"),
+                         modelObject=f, fact=f.qname, contextID=f.contextID)
+                else:
+                    if concept.isMonetary:
+                        measures = unit.measures
+                        if not measures or len(measures[0]) != 1 or len(measures[1]) != 0:
+                            self.modelXbrl.error("xbrl.4.8.2:monetaryFactUnit-notSingleMeasure",
+                                _("Fact %(fact)s context %(contextID)s must have a single unit measure which is monetary %(unitID)s"),
+                                 modelObject=f, fact=f.qname, contextID=f.contextID, unitID=f.unitID)
+                        elif (measures[0][0].namespaceURI != XbrlConst.iso4217 or
+                              not self.isoCurrencyPattern.match(measures[0][0].localName)):
+                            self.modelXbrl.error("xbrl.4.8.2:monetaryFactUnit-notMonetaryMeasure",
+                                _("Fact %(fact)s context %(contextID)s must have a monetary unit measure %(unitID)s"),
+                                 modelObject=f, fact=f.qname, contextID=f.contextID, unitID=f.unitID)
+                    elif concept.isShares:
+                        measures = unit.measures
+                        if not measures or len(measures[0]) != 1 or len(measures[1]) != 0:
+                            self.modelXbrl.error("xbrl.4.8.2:sharesFactUnit-notSingleMeasure",
+                                _("Fact %(fact)s context %(contextID)s must have a single xbrli:shares unit %(unitID)s"),
+                                modelObject=f, fact=f.qname, contextID=f.contextID, unitID=f.unitID)
+                        elif measures[0][0] != XbrlConst.qnXbrliShares:
+                            self.modelXbrl.error("xbrl.4.8.2:sharesFactUnit-notSharesMeasure",
+                                _("Fact %(fact)s context %(contextID)s must have a xbrli:shares unit %(unitID)s"),
+                                modelObject=f, fact=f.qname, contextID=f.contextID, unitID=f.unitID)
+            precision = f.precision
+            hasPrecision = precision is not None
+            if hasPrecision and precision != "INF" and not precision.isdigit():
+                self.modelXbrl.error("xbrl.4.6.4:precision",
+                    _("Fact %(fact)s context %(contextID)s precision %(precision)s is invalid"),
+                    modelObject=f, fact=f.qname, contextID=f.contextID, precision=precision)
+            decimals = f.decimals
+            hasDecimals = decimals is not None
+            if hasPrecision and not self.precisionPattern.match(precision):
+                self.modelXbrl.error("xbrl.4.6.4:precision",
+                    _("Fact %(fact)s context %(contextID)s precision %(precision)s is invalid"),
+                    modelObject=f, fact=f.qname, contextID=f.contextID, precision=precision)
+            if hasPrecision and hasDecimals:
+                self.modelXbrl.error("xbrl.4.6.3:bothPrecisionAndDecimals",
+                    _("Fact %(fact)s context %(contextID)s can not have both precision and decimals"),
+                    modelObject=f, fact=f.qname, contextID=f.contextID)
+            if hasDecimals and not self.decimalsPattern.match(decimals):
+                self.modelXbrl.error("xbrl.4.6.5:decimals",
+                    _("Fact %(fact)s context %(contextID)s decimals %(decimals)s is invalid"),
+                    modelObject=f, fact=f.qname, contextID=f.contextID, decimals=decimals)
+            if concept.isItem:
+                if context is None:
+                    self.modelXbrl.error("xbrl.4.6.1:itemContextRef",
+                        _("Item %(fact)s must have a context"),
+                        modelObject=f, fact=f.qname)
+                else:
+                    periodType = concept.periodType
+                    if (periodType == "instant" and not context.isInstantPeriod) or \
+                       (periodType == "duration" and not (context.isStartEndPeriod or context.isForeverPeriod)):
+                        self.modelXbrl.error("xbrl.4.7.2:contextPeriodType",
+                            _("Fact %(fact)s context %(contextID)s has period type %(periodType)s conflict with context"),
+                            modelObject=f, fact=f.qname, contextID=f.contextID, periodType=periodType)
+                        
+                # check precision and decimals
+                if f.xsiNil == "true":
                     if hasPrecision or hasDecimals:
-                        self.modelXbrl.error("xbrl.4.6.3:tuplePrecisionDecimals",
-                            _("Fact %(fact)s is a tuple and cannot have either precision or decimals"),
-                            modelObject=f, fact=f.qname)
-                    # custom attributes may be allowed by anyAttribute but not by 2.1
-                    for attrQname, attrValue in XbrlUtil.attributes(self.modelXbrl, f):
-                        if attrQname.namespaceURI in (XbrlConst.xbrli, XbrlConst.link, XbrlConst.xlink, XbrlConst.xl):
-                            self.modelXbrl.error("xbrl.4.9:tupleAttribute",
-                                _("Fact %(fact)s is a tuple and must not have attribute in this namespace %(attribute)s"),
-                                modelObject=f, fact=f.qname, attribute=attrQname), 
+                        self.modelXbrl.error("xbrl.4.6.3:nilPrecisionDecimals",
+                            _("Fact %(fact)s context %(contextID)s can not be nil and have either precision or decimals"),
+                            modelObject=f, fact=f.qname, contextID=f.contextID)
+                elif concept.isFraction:
+                    if hasPrecision or hasDecimals:
+                        self.modelXbrl.error("xbrl.4.6.3:fractionPrecisionDecimals",
+                            _("Fact %(fact)s context %(contextID)s is a fraction concept and cannot have either precision or decimals"),
+                            modelObject=f, fact=f.qname, contextID=f.contextID)
+                        numerator, denominator = f.fractionValue
+                        if not (numerator == "INF" or numerator.isnumeric()):
+                            self.modelXbrl.error("xbrl.5.1.1:fractionPrecisionDecimals",
+                                _("Fact %(fact)s context %(contextID)s is a fraction with invalid numerator %(numerator)s"),
+                                modelObject=f, fact=f.qname, contextID=f.contextID, numerator=numerator)
+                        if not denominator.isnumeric() or _INT(denominator) == 0:
+                            self.modelXbrl.error("xbrl.5.1.1:fractionPrecisionDecimals",
+                                _("Fact %(fact)s context %(contextID)s is a fraction with invalid denominator %(denominator)")).format(
+                                modelObject=f, fact=f.qname, contextID=f.contextID, denominator=denominator)
                 else:
-                    self.modelXbrl.error("xbrl.4.6:notItemOrTuple",
-                        _("Fact %(fact)s must be an item or tuple"),
+                    if self.modelXbrl.modelDocument.type != ModelDocument.Type.INLINEXBRL:
+                        for child in f.iterchildren():
+                            if isinstance(child,ModelObject):
+                                self.modelXbrl.error("xbrl.5.1.1:itemMixedContent",
+                                    _("Fact %(fact)s context %(contextID)s may not have child elements %(childElementName)s"),
+                                    modelObject=f, fact=f.qname, contextID=f.contextID, childElementName=child.prefixedName)
+                                break
+                    if concept.isNumeric and not hasPrecision and not hasDecimals:
+                        self.modelXbrl.error("xbrl.4.6.3:missingPrecisionDecimals",
+                            _("Fact %(fact)s context %(contextID)s is a numeric concept and must have either precision or decimals"),
+                            modelObject=f, fact=f.qname, contextID=f.contextID)
+                    # not a real check
+                    #if f.isNumeric and not f.isNil and f.precision :
+                    #    try:
+                    #        ValidateXbrlCalcs.roundValue(f.value, f.precision, f.decimals)
+                    #    except Exception as err:
+                    #        self.modelXbrl.error("arelle:info",
+                    #            _("Fact %(fact)s value %(value)s context %(contextID)s rounding exception %(error)s"),
+                    #            modelObject=f, fact=f.qname, value=f.value, contextID=f.contextID, error = err)
+                if self.validateEnum and concept.isEnumeration and getattr(f,"xValid", 0) == 4 and not f.isNil:
+                    memConcept = self.modelXbrl.qnameConcepts.get(f.xValue)
+                    if not ValidateXbrlDimensions.enumerationMemberUsable(self, concept, memConcept):
+                        self.modelXbrl.error("enumie:InvalidFactValue",
+                            _("Fact %(fact)s context %(contextID)s enumeration %(value)s is not in the domain of %(concept)s"),
+                            modelObject=f, fact=f.qname, contextID=f.contextID, value=f.xValue, concept=f.qname)
+            elif concept.isTuple:
+                if f.contextID:
+                    self.modelXbrl.error("xbrl.4.6.1:tupleContextRef",
+                        _("Tuple %(fact)s must not have a context"),
                         modelObject=f, fact=f.qname)
-                    
-            if isinstance(f, ModelInlineFact):
-                if not inTuple and f.order is not None: 
-                    self.modelXbrl.error("ix:tupleOrder",
-                        _("Fact %(fact)s must not have an order (%(order)s) unless in a tuple"),
-                        modelObject=f, fact=f.qname, order=f.order)
-                if f.isTuple or f.tupleID:
-                    if inTuple is None:
-                        inTuple = dict()
-                    inTuple[f.qname] = f
-                    self.checkIxTupleContent(f, inTuple)
-            if f.modelTupleFacts:
-                self.checkFacts(f.modelTupleFacts, inTuple=inTuple)
-            if isinstance(f, ModelInlineFact) and (f.isTuple or f.tupleID):
-                del inTuple[f.qname]
-             
-            # uncomment if anybody uses this   
-            #for pluginXbrlMethod in pluginClassMethods("Validate.XBRL.Fact"):
-            #    pluginXbrlMethod(self, f)
+                if hasPrecision or hasDecimals:
+                    self.modelXbrl.error("xbrl.4.6.3:tuplePrecisionDecimals",
+                        _("Fact %(fact)s is a tuple and cannot have either precision or decimals"),
+                        modelObject=f, fact=f.qname)
+                # custom attributes may be allowed by anyAttribute but not by 2.1
+                for attrQname, attrValue in XbrlUtil.attributes(self.modelXbrl, f):
+                    if attrQname.namespaceURI in (XbrlConst.xbrli, XbrlConst.link, XbrlConst.xlink, XbrlConst.xl):
+                        self.modelXbrl.error("xbrl.4.9:tupleAttribute",
+                            _("Fact %(fact)s is a tuple and must not have attribute in this namespace %(attribute)s"),
+                            modelObject=f, fact=f.qname, attribute=attrQname), 
+            else:
+                self.modelXbrl.error("xbrl.4.6:notItemOrTuple",
+                    _("Fact %(fact)s must be an item or tuple"),
+                    modelObject=f, fact=f.qname)
+                
+        if isinstance(f, ModelInlineFact):
+            parentTuples = self.factVisitors.parentTuples
+            if not parentTuples and f.order is not None: 
+                self.modelXbrl.error("ix:tupleOrder",
+                    _("Fact %(fact)s must not have an order (%(order)s) unless in a tuple"),
+                    modelObject=f, fact=f.qname, order=f.order)
+            if f.isTuple or f.tupleID:
+                parentTuples = parentTuples.copy()
+                parentTuples[f.qname] = f
+                self.checkIxTupleContent(f, parentTuples)
+         
+        # uncomment if anybody uses this   
+        #for pluginXbrlMethod in pluginClassMethods("Validate.XBRL.Fact"):
+        #    pluginXbrlMethod(self, f)
                 
     def checkFactsDimensions(self, facts): # check fact dimensions in document order
-        for f in facts:
-            if f.concept.isItem and f.context is not None:
-                ValidateXbrlDimensions.checkFact(self, f)
-            elif f.modelTupleFacts:
-                self.checkFactsDimensions(f.modelTupleFacts)
+        factVisitors = FactVisitors(self.modelXbrl)
+        factVisitors.addFactVisitor(self.checkFactDimensions)
+        factVisitors.visitFacts(facts)
+                
+    def checkFactDimensions(self, f, concept, context, unit):
+        if concept is not None and concept.isItem and context is not None:
+            ValidateXbrlDimensions.checkFact(self, f)
                 
     def checkIxTupleContent(self, tf, parentTuples):
         if tf.isNil:
@@ -807,47 +804,56 @@ class ValidateXbrl:
                 
     def checkContexts(self, contexts):
         for cntx in contexts:
-            if cntx.isStartEndPeriod:
-                try: # if no datetime value would have been a schema error at loading time
-                    if (cntx.endDatetime is not None and cntx.startDatetime is not None and
-                        cntx.endDatetime <= cntx.startDatetime):
-                        self.modelXbrl.error("xbrl.4.7.2:periodStartBeforeEnd",
-                            _("Context %(contextID)s must have startDate less than endDate"),
-                            modelObject=cntx, contextID=cntx.id)
-                except (TypeError, ValueError) as err:
-                    self.modelXbrl.error("xbrl.4.7.2:contextDateError",
-                        _("Context %(contextID) startDate or endDate: %(error)s"),
-                        modelObject=cntx, contextID=cntx.id, error=err)
-            elif cntx.isInstantPeriod:
-                try:
-                    cntx.instantDatetime #parse field
-                except ValueError as err:
-                    self.modelXbrl.error("xbrl.4.7.2:contextDateError",
-                        _("Context %(contextID)s instant date: %(error)s"),
-                        modelObject=cntx, contextID=cntx.id, error=err)
-            self.segmentScenario(cntx.segment, cntx.id, "segment", "4.7.3.2")
-            self.segmentScenario(cntx.scenario, cntx.id, "scenario", "4.7.4")
+            self.checkContext(cntx)
+            
+    def checkContext(self, cntx):
+        if cntx.isStartEndPeriod:
+            try: # if no datetime value would have been a schema error at loading time
+                if (cntx.endDatetime is not None and cntx.startDatetime is not None and
+                    cntx.endDatetime <= cntx.startDatetime):
+                    self.modelXbrl.error("xbrl.4.7.2:periodStartBeforeEnd",
+                        _("Context %(contextID)s must have startDate less than endDate"),
+                        modelObject=cntx, contextID=cntx.id)
+            except (TypeError, ValueError) as err:
+                self.modelXbrl.error("xbrl.4.7.2:contextDateError",
+                    _("Context %(contextID) startDate or endDate: %(error)s"),
+                    modelObject=cntx, contextID=cntx.id, error=err)
+        elif cntx.isInstantPeriod:
+            try:
+                cntx.instantDatetime #parse field
+            except ValueError as err:
+                self.modelXbrl.error("xbrl.4.7.2:contextDateError",
+                    _("Context %(contextID)s instant date: %(error)s"),
+                    modelObject=cntx, contextID=cntx.id, error=err)
+        self.segmentScenario(cntx.segment, cntx.id, "segment", "4.7.3.2")
+        self.segmentScenario(cntx.scenario, cntx.id, "scenario", "4.7.4")
                 
     def checkContextsDimensions(self, contexts):
         for cntx in contexts:
-            ValidateXbrlDimensions.checkContext(self,cntx)
+            self.checkContextDimensions(cntx)
+            
+    def checkContextDimensions(self, cntx):
+        ValidateXbrlDimensions.checkContext(self,cntx)
         
     def checkUnits(self, units):
         for unit in units:
-            mulDivMeasures = unit.measures
-            if mulDivMeasures:
-                for measures in mulDivMeasures:
-                    for measure in measures:
-                        if measure.namespaceURI == XbrlConst.xbrli and not \
-                            measure in (XbrlConst.qnXbrliPure, XbrlConst.qnXbrliShares):
-                                self.modelXbrl.error("xbrl.4.8.2:measureElement",
-                                    _("Unit %(unitID)s illegal measure: %(measure)s"),
-                                    modelObject=unit, unitID=unit.id, measure=measure)
-                for numeratorMeasure in mulDivMeasures[0]:
-                    if numeratorMeasure in mulDivMeasures[1]:
-                        self.modelXbrl.error("xbrl.4.8.4:measureBothNumDenom",
-                            _("Unit %(unitID)s numerator measure: %(measure)s also appears as denominator measure"),
-                            modelObject=unit, unitID=unit.id, measure=numeratorMeasure)        
+            self.checkUnit(unit)
+            
+    def checkUnit(self, unit):
+        mulDivMeasures = unit.measures
+        if mulDivMeasures:
+            for measures in mulDivMeasures:
+                for measure in measures:
+                    if measure.namespaceURI == XbrlConst.xbrli and not \
+                        measure in (XbrlConst.qnXbrliPure, XbrlConst.qnXbrliShares):
+                            self.modelXbrl.error("xbrl.4.8.2:measureElement",
+                                _("Unit %(unitID)s illegal measure: %(measure)s"),
+                                modelObject=unit, unitID=unit.id, measure=measure)
+            for numeratorMeasure in mulDivMeasures[0]:
+                if numeratorMeasure in mulDivMeasures[1]:
+                    self.modelXbrl.error("xbrl.4.8.4:measureBothNumDenom",
+                        _("Unit %(unitID)s numerator measure: %(measure)s also appears as denominator measure"),
+                        modelObject=unit, unitID=unit.id, measure=numeratorMeasure)        
     
         
     def fwdCycle(self, relsSet, rels, noUndirected, fromConcepts, cycleType="directed", revCycleRel=None):
@@ -0,0 +1,54 @@
+'''
+Created on Oct 18, 2026
+
+@author: Mark V Systems Limited
+(c) Copyright 2026 Mark V Systems Limited, All rights reserved.
+'''
+from arelle import ViewFile
+from arelle.ModelFormulaObject import ModelFormula, ModelExistenceAssertion, ModelValueAssertion
+
+def viewFormulaProfile(modelXbrl, outfile, lang=None):
+    modelXbrl.modelManager.showStatus(_("viewing formula profile"))
+    view = ViewFormulaProfile(modelXbrl, outfile, "Formula Profile", lang)
+    view.view()
+    view.close()
+
+class ViewFormulaProfile(ViewFile.View):
+    def __init__(self, modelXbrl, outfile, header, lang):
+        super(ViewFormulaProfile, self).__init__(modelXbrl, outfile, header, lang)
+
+    def view(self):
+        self.addRow(["Variable Set", "Type", "Label", "Total Time", "Compile Time", "Evaluation Time",
+                     "Evaluations", "Skipped Evaluations", "Precondition Blocked Evaluations",
+                     "Filter Time", "Implicit Filter Time", "Output Facts", "Memory Change KB", "Filter Times"],
+                    asHeader=True)
+        # most expensive variable sets first, report may be resorted by any column (times are in seconds)
+        for varSet, profile in sorted(self.modelXbrl.variableSetProfiles.items(),
+                                      key=lambda item: item[1].compileTime + item[1].evaluationTime,
+                                      reverse=True):
+            if isinstance(varSet, ModelValueAssertion):
+                varSetType = "valueAssertion"
+            elif isinstance(varSet, ModelExistenceAssertion):
+                varSetType = "existenceAssertion"
+            elif isinstance(varSet, ModelFormula):
+                varSetType = "formula"
+            else:
+                varSetType = varSet.localName
+            filterTimes = sorted(profile.filterTimes.items(), key=lambda item: item[1], reverse=True)
+            self.addRow([varSet.id or varSet.xlinkLabel,
+                         varSetType,
+                         varSet.logLabel() or "",
+                         "{0:.6f}".format(profile.compileTime + profile.evaluationTime),
+                         "{0:.6f}".format(profile.compileTime),
+                         "{0:.6f}".format(profile.evaluationTime),
+                         str(profile.evaluations),
+                         str(profile.skippedEvaluations),
+                         str(profile.preconditionBlockedEvaluations),
+                         "{0:.6f}".format(profile.filterTime),
+                         "{0:.6f}".format(profile.implicitFilterTime),
+                         str(profile.outputFacts),
+                         str(profile.memoryChange),
+                         "; ".join("{0} {1}: {2:.6f} ({3} calls)".format(_filter.localName, _filter.xlinkLabel,
+                                                                          filterTime, profile.filterCalls[_filter])
+                                   for _filter, filterTime in filterTimes)],
+                        xmlRowElementName="variableSet")
@@ -30,6 +30,43 @@ from collections import defaultdict
 
 emptySet = set()
 emptyList = []
+UNINDEXABLE = object() # aspect value which cannot be used as a cell fact index key
+TYPED_DIMENSION = object() # index key for any typed dimension value (members compared after lookup)
+indexableAspects = {Aspect.CONCEPT, Aspect.PERIOD, Aspect.ENTITY_IDENTIFIER, Aspect.UNIT}
+
+def cellIndexKey(fact, aspect):
+    # hashable value of aspect for fact (or fact prototype), equal whenever aspectMatches would be True
+    if aspect == Aspect.CONCEPT:
+        return fact.qname
+    elif aspect == Aspect.UNIT:
+        unit = fact.unit
+        if unit is None:
+            return None
+        return ("unit", unit.hash)
+    cntx = fact.context
+    if cntx is None:
+        return UNINDEXABLE
+    try:
+        if aspect == Aspect.PERIOD:
+            if cntx.isForeverPeriod + cntx.isStartEndPeriod + cntx.isInstantPeriod != 1:
+                return UNINDEXABLE # prototype period matching more than one kind of period
+            if cntx.isForeverPeriod:
+                return ("forever",)
+            elif cntx.isStartEndPeriod:
+                return ("duration", cntx.startDatetime, cntx.endDatetime)
+            return ("instant", cntx.instantDatetime)
+        elif aspect == Aspect.ENTITY_IDENTIFIER:
+            return cntx.entityIdentifierHash
+        elif isinstance(aspect, QName): # dimension, explicit members and defaults are keyed by member qname
+            dimValue = cntx.dimValue(aspect)
+            if dimValue is None or isinstance(dimValue, QName):
+                return dimValue
+            elif dimValue.isExplicit:
+                return dimValue.memberQname
+            return TYPED_DIMENSION
+    except AttributeError: # incomplete prototype
+        pass
+    return UNINDEXABLE
 
 def viewRenderedGrid(modelXbrl, outfile, lang=None, viewTblELR=None, sourceView=None, diffToFile=False, cssExtras=""):
     modelXbrl.modelManager.showStatus(_("saving rendering"))
@@ -161,6 +198,8 @@ class ViewRenderedGrid(ViewFile.View):
                             self.cellsParentElt = etree.SubElement(self.cellsParentElt, self.tableModelQName("cells"),
                                                                   attrib={"axis": "x"})
                             '''
+                    # cell fact indexes are built once per table z slice
+                    self.cellFactIndexes = {}
                     # rows/cols only on firstTime for infoset XML, but on each time for xhtml
                     zAspectStructuralNodes = defaultdict(set)
                     self.zAxis(1, zTopStructuralNode, zAspectStructuralNodes, False)
@@ -629,6 +668,40 @@ class ViewRenderedGrid(ViewFile.View):
             return (nestedBottomRow, row)
             
     
+    def cellFactCandidates(self, fp, matchableAspects):
+        # facts of table z slice with cell's concept, period, entity, unit and dimension members (by hash lookup),
+        # returns None if cell aspects are not indexable; candidates still need aspectMatches for remaining aspects
+        if fp.isTuple:
+            return None
+        keyAspects = tuple(sorted((aspect
+                                   for aspect in matchableAspects
+                                   if aspect in indexableAspects or isinstance(aspect, QName)),
+                                  key=aspectStr))
+        cellKey = tuple(cellIndexKey(fp, aspect) for aspect in keyAspects)
+        if any(aspectKey is UNINDEXABLE for aspectKey in cellKey):
+            return None
+        try:
+            factIndex, unindexedFacts = self.cellFactIndexes[keyAspects]
+        except KeyError:
+            facts = self.modelXbrl.factsInInstance
+            if self.hasTableFilters:
+                facts = self.modelTable.filterFacts(self.rendrCntx, facts)
+            factIndex = defaultdict(list)
+            unindexedFacts = [] # tuples and facts without context, matched against every cell
+            for fact in facts:
+                if fact.isTuple:
+                    unindexedFacts.append(fact)
+                    continue
+                factKey = tuple(cellIndexKey(fact, aspect) for aspect in keyAspects)
+                if any(aspectKey is UNINDEXABLE for aspectKey in factKey):
+                    unindexedFacts.append(fact)
+                else:
+                    factIndex[factKey].append(fact)
+            self.cellFactIndexes[keyAspects] = factIndex, unindexedFacts
+        if unindexedFacts:
+            return factIndex.get(cellKey, emptyList) + unindexedFacts
+        return factIndex.get(cellKey, emptyList)
+
     def bodyCells(self, row, yParentStructuralNode, xStructuralNodes, zAspectStructuralNodes, yChildrenFirst):
         if yParentStructuralNode is not None:
             dimDefaults = self.modelXbrl.qnameDimensionDefaults
@@ -690,25 +763,27 @@ class ViewRenderedGrid(ViewFile.View):
                         justify = None
                         fp = FactPrototype(self, cellAspectValues)
                         if conceptNotAbstract:
-                            # reduce set of matchable facts to those with pri item qname and have dimension aspects
-                            facts = self.modelXbrl.factsByQname[priItemQname] if priItemQname else self.modelXbrl.factsInInstance
-                            if self.hasTableFilters:
-                                facts = self.modelTable.filterFacts(self.rendrCntx, facts)
-                            for aspect in matchableAspects:  # trim down facts with explicit dimensions match or just present
-                                if isinstance(aspect, QName):
-                                    aspectValue = cellAspectValues.get(aspect, None)
-                                    if isinstance(aspectValue, ModelDimensionValue):
-                                        if aspectValue.isExplicit:
-                                            dimMemQname = aspectValue.memberQname # match facts with this explicit value
+                            facts = self.cellFactCandidates(fp, matchableAspects)
+                            if facts is None:
+                                # cell aspects not indexable, reduce set of matchable facts to those with pri item qname and have dimension aspects
+                                facts = self.modelXbrl.factsByQname[priItemQname] if priItemQname else self.modelXbrl.factsInInstance
+                                if self.hasTableFilters:
+                                    facts = self.modelTable.filterFacts(self.rendrCntx, facts)
+                                for aspect in matchableAspects:  # trim down facts with explicit dimensions match or just present
+                                    if isinstance(aspect, QName):
+                                        aspectValue = cellAspectValues.get(aspect, None)
+                                        if isinstance(aspectValue, ModelDimensionValue):
+                                            if aspectValue.isExplicit:
+                                                dimMemQname = aspectValue.memberQname # match facts with this explicit value
+                                            else:
+                                                dimMemQname = None  # match facts that report this dimension
+                                        elif isinstance(aspectValue, QName): 
+                                            dimMemQname = aspectValue  # match facts that have this explicit value
+                                        elif aspectValue is None: # match typed dims that don't report this value
+                                            dimMemQname = DEFAULT
                                         else:
-                                            dimMemQname = None  # match facts that report this dimension
-                                    elif isinstance(aspectValue, QName): 
-                                        dimMemQname = aspectValue  # match facts that have this explicit value
-                                    elif aspectValue is None: # match typed dims that don't report this value
-                                        dimMemQname = DEFAULT
-                                    else:
-                                        dimMemQname = None # match facts that report this dimension
-                                    facts = facts & self.modelXbrl.factsByDimMemQname(aspect, dimMemQname)
+                                            dimMemQname = None # match facts that report this dimension
+                                        facts = facts & self.modelXbrl.factsByDimMemQname(aspect, dimMemQname)
                             for fact in facts:
                                 if (all(aspectMatches(self.rendrCntx, fact, fp, aspect) 
                                         for aspect in matchableAspects) and
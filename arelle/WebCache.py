@@ -4,7 +4,7 @@ Created on Oct 5, 2010
 @author: Mark V Systems Limited
 (c) Copyright 2010 Mark V Systems Limited, All rights reserved.
 '''
-import os, posixpath, sys, re, shutil, time, calendar, io, json, logging
+import os, posixpath, sys, re, shutil, time, calendar, io, json, logging, threading
 if sys.version[0] >= '3':
     from urllib.parse import quote, unquote
     from urllib.error import URLError, HTTPError, ContentTooShortError
@@ -109,8 +109,42 @@ class WebCache:
         else:
             self.cachedUrlCheckTimes = {}
         self.cachedUrlCheckTimesModified = False
+        self.cacheStore = None # optional single-file WebCacheStore
+        self.storedFilepathUrls = {} # cache filepath: url, for cache store contents not in per-url files
             
 
+    def useCacheStore(self, storeFile, sharedFileSystem=False):
+        ''' keep web cache contents and check times in a shared single-file store (None to revert to per-url files),
+        sharedFileSystem for a store on a network file system (such as NFS) '''
+        if self.cacheStore is not None and storeFile == self.cacheStore.storeFile:
+            return # already in use
+        if self.cacheStore is not None:
+            self.cacheStore.close()
+            self.cacheStore = None
+            self.storedFilepathUrls.clear()
+        if storeFile:
+            from arelle.WebCacheStore import WebCacheStore
+            self.cacheStore = WebCacheStore(storeFile, sharedFileSystem=sharedFileSystem)
+            
+    def storedContent(self, filepath):
+        ''' bytes of cache store content for a filepath returned by getfilename(storedContentOk=True), else None '''
+        url = self.storedFilepathUrls.get(filepath)
+        if url is not None and self.cacheStore is not None:
+            return self.cacheStore.content(url)
+        return None
+            
+    def urlCheckTime(self, url):
+        if self.cacheStore is not None:
+            return self.cacheStore.checkTime(url)
+        return self.cachedUrlCheckTimes.get(url)
+
+    def setUrlCheckTime(self, url, timeNowStr):
+        if self.cacheStore is not None:
+            self.cacheStore.setCheckTime(url, timeNowStr) # incremental, nothing to save later
+        else:
+            self.cachedUrlCheckTimes[url] = timeNowStr
+            self.cachedUrlCheckTimesModified = True
+
     @property
     def timeout(self):
         return self._timeout or WebCache.default_timeout
@@ -243,7 +277,10 @@ class WebCache:
                         .sub(lambda c: chr( int(c.group(0)[1:]) ), # remove ^nnn encoding
                          urlpart) for urlpart in urlparts)
     
-    def getfilename(self, url, base=None, reload=False, checkModifiedTime=False, normalize=False, filenameOnly=False):
+    def getfilename(self, url, base=None, reload=False, checkModifiedTime=False, normalize=False, filenameOnly=False, storedContentOk=False):
+        ''' returns cache filepath of url (downloading if not cached or newer on web), with a cache store
+        storedContentOk is for callers reading by FileSource.openFileStream (content may be only in the store),
+        otherwise the stored content is written to the filepath '''
         if url is None:
             return url
         if base is not None or normalize:
@@ -262,16 +299,24 @@ class WebCache:
                 filepath += DIRECTORY_INDEX_FILE
             if os.sep == '\\':
                 filepath = filepath.replace('/', '\\')
-            if self.workOffline or filenameOnly:
+            if filenameOnly:
+                return filepath
+            storedModifiedTime = None # web modification time of content in the cache store
+            if self.cacheStore is not None and not reload:
+                storedModifiedTime = self.cacheStore.modifiedTime(url)
+            if self.workOffline:
+                if storedModifiedTime is not None:
+                    return self.storedFilepath(url, filepath, storedContentOk)
                 return filepath
             filepathtmp = filepath + ".tmp"
             fileExt = os.path.splitext(filepath)[1]
             timeNow = time.time()
             timeNowStr = time.strftime('%Y-%m-%dT%H:%M:%S UTC', time.gmtime(timeNow))
             retrievingDueToRecheckInterval = False
-            if not reload and os.path.exists(filepath):
-                if url in self.cachedUrlCheckTimes and not checkModifiedTime:
-                    cachedTime = calendar.timegm(time.strptime(self.cachedUrlCheckTimes[url], '%Y-%m-%dT%H:%M:%S UTC'))
+            if not reload and (storedModifiedTime is not None or os.path.exists(filepath)):
+                urlCheckTime = None if checkModifiedTime else self.urlCheckTime(url)
+                if urlCheckTime:
+                    cachedTime = calendar.timegm(time.strptime(urlCheckTime, '%Y-%m-%dT%H:%M:%S UTC'))
                 else:
                     cachedTime = 0
                 if timeNow - cachedTime > self.maxAgeSeconds:
@@ -279,16 +324,22 @@ class WebCache:
                     newerOnWeb = False
                     try: # no provision here for proxy authentication!!!
                         remoteFileTime = lastModifiedTime( self.getheaders(quotedUrl) )
-                        if remoteFileTime and remoteFileTime > os.path.getmtime(filepath):
+                        if remoteFileTime and remoteFileTime > (storedModifiedTime if storedModifiedTime is not None
+                                                                else os.path.getmtime(filepath)):
                             newerOnWeb = True
                     except:
                         pass # for now, forget about authentication here
                     if not newerOnWeb:
                         # update ctime by copying file and return old file
-                        self.cachedUrlCheckTimes[url] = timeNowStr
-                        self.cachedUrlCheckTimesModified = True
+                        self.setUrlCheckTime(url, timeNowStr)
+                        if storedModifiedTime is not None:
+                            return self.storedFilepath(url, filepath, storedContentOk)
                         return filepath
                     retrievingDueToRecheckInterval = True
+                    if storedModifiedTime is not None: # stored content is returned if retrieval fails
+                        self.storedFilepath(url, filepath, storedContentOk)
+                elif storedModifiedTime is not None:
+                    return self.storedFilepath(url, filepath, storedContentOk)
                 else:
                     return filepath
             filedir = os.path.dirname(filepath)
@@ -444,6 +495,29 @@ class WebCache:
                             os.remove(filepathtmp)
                         return None
                 
+                webFileTime = lastModifiedTime(headers)
+                if self.cacheStore is not None:
+                    try:
+                        with io.open(filepathtmp, 'rb') as fh:
+                            self.cacheStore.put(url, fh.read(), webFileTime or timeNow, timeNowStr)
+                    except Exception as err:
+                        self.cntlr.addToLog(_("%(error)s \nUnsuccessful saving of %(URL)s in web cache store %(storeFile)s"),
+                                            messageCode="webCache:cacheStoreError",
+                                            messageArgs={"error": err, "URL": url, "storeFile": self.cacheStore.storeFile},
+                                            level=logging.ERROR)
+                    else: # content is only in the store
+                        os.remove(filepathtmp)
+                        if os.path.exists(filepath): # prior content, rewritten from store if a file is required
+                            try:
+                                os.remove(filepath)
+                            except OSError:
+                                pass # in use
+                        if self._logDownloads:
+                            self.cntlr.addToLog(_("Downloaded %(URL)s"),
+                                                messageCode="webCache:download",
+                                                messageArgs={"URL": url, "storeFile": self.cacheStore.storeFile},
+                                                level=logging.INFO)
+                        return self.storedFilepath(url, filepath, storedContentOk)
                 # rename temporarily named downloaded file to desired name                
                 if os.path.exists(filepath):
                     try:
@@ -465,11 +539,9 @@ class WebCache:
                                         messageCode="webCache:cacheDownloadRenamingError",
                                         messageArgs={"error": err, "filepath": filepath},
                                         level=logging.ERROR)
-                webFileTime = lastModifiedTime(headers)
                 if webFileTime: # set mtime to web mtime
                     os.utime(filepath,(webFileTime,webFileTime))
-                self.cachedUrlCheckTimes[url] = timeNowStr
-                self.cachedUrlCheckTimesModified = True
+                self.setUrlCheckTime(url, timeNowStr)
                 return filepath
         
         if url.startswith("file://"): url = url[7:]
@@ -478,14 +550,62 @@ class WebCache:
             url = url.replace('/', '\\')
         return url
     
+    def prefetch(self, url):
+        ''' Retrieves an http url not yet cached into its cache file, for use by worker threads: there is no
+        user interaction (logon, authentication or work offline dialogs), logging, or check time update,
+        which are left to the calling thread (such as by getfilename when the url is loaded).
+        Returns None if retrieved or already cached, else the exception or reason for not retrieving.
+        '''
+        filepath = self.urlToCacheFilepath(url)
+        if filepath.endswith("/"):
+            filepath += DIRECTORY_INDEX_FILE
+        if os.sep == '\\':
+            filepath = filepath.replace('/', '\\')
+        if os.path.exists(filepath):
+            return None
+        # temporary file unique to the thread, so concurrent prefetches and loads don't collide
+        filepathtmp = "{0}.{1}.tmp".format(filepath, threading.current_thread().ident)
+        urlScheme, schemeSep, urlSchemeSpecificPart = url.partition("://")
+        quotedUrl = urlScheme + schemeSep + quote(urlSchemeSpecificPart, '/?=&')
+        try:
+            filedir = os.path.dirname(filepath)
+            if not os.path.exists(filedir):
+                try:
+                    os.makedirs(filedir)
+                except OSError:
+                    pass # made by another thread
+            savedfile, headers, initialBytes = self.retrieve(quotedUrl, filename=filepathtmp)
+            if os.path.splitext(filepath)[1] in {".xsd", ".xml", ".xbrl"} and b"<html" in initialBytes:
+                os.remove(filepathtmp)
+                return _("file contents appear to be an html logon request")
+            webFileTime = lastModifiedTime(headers)
+            if webFileTime: # set mtime to web mtime
+                os.utime(filepathtmp,(webFileTime,webFileTime))
+            if not os.path.exists(filepath):
+                os.rename(filepathtmp, filepath)
+            else: # retrieved meanwhile by a load
+                os.remove(filepathtmp)
+            return None
+        except Exception as err:
+            if os.path.exists(filepathtmp):
+                os.remove(filepathtmp)
+            return err
+
+    def storedFilepath(self, url, filepath, storedContentOk):
+        # filepath of url content in the cache store, written to the filepath unless read by openFileStream
+        if storedContentOk:
+            self.storedFilepathUrls[filepath] = url
+        else:
+            self.cacheStore.materialize(url, filepath)
+        return filepath
+
     def internetRecheckFailedRecovery(self, filepath, url, err, timeNowStr):
         self.cntlr.addToLog(_("During refresh of web file ignoring error: %(error)s for %(URL)s"),
                             messageCode="webCache:unableToRefreshFile",
                             messageArgs={"URL": url, "error": err},
                             level=logging.info)
         # skip this checking cycle, act as if retrieval was ok
-        self.cachedUrlCheckTimes[url] = timeNowStr
-        self.cachedUrlCheckTimesModified = True
+        self.setUrlCheckTime(url, timeNowStr)
         return filepath
     
     def reportProgress(self, blockCount, blockSize, totalSize):
@@ -504,6 +624,9 @@ class WebCache:
             cachedProtocolDir = os.path.join(self.cacheDir, cachedProtocol)
             if os.path.exists(cachedProtocolDir):
                 shutil.rmtree(cachedProtocolDir, True)
+        if self.cacheStore is not None:
+            self.cacheStore.clear()
+        self.storedFilepathUrls.clear()
         
     def getheaders(self, url):
         if url and isHttpUrl(url):
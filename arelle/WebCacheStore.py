@@ -0,0 +1,166 @@
+'''
+Created on Oct 18, 2026
+
+@author: Mark V Systems Limited
+(c) Copyright 2026 Mark V Systems Limited, All rights reserved.
+
+Single-file, content-addressed store for the web cache.
+
+Downloaded web files are kept as blobs keyed by their sha256 digest in one sqlite
+database, with a url table holding the digest, web modification time and last check
+time of each url.  Check times are updated per url (instead of rewriting
+cachedUrlCheckTimes.json), and the store may be shared by multiple processes (such
+as workers on one server, or hosts sharing a cache directory), sqlite locking
+serializing writers.
+
+Content of stored urls is served from the store (by FileSource.openFileStream), so
+documents loaded by ModelDocument.load have no per-url files in the cache directory.
+Only callers needing an actual file (such as plug-in modules, packages, tar archives
+and lxml schema validation) have the url materialized in the cache directory.
+
+Locking: on a local file system sqlite's default (posix advisory) locks are used, and
+reads use memory mapped i/o.  These locks and memory mapping are unreliable on network
+file systems such as NFS, so a store shared over NFS must be opened with
+sharedFileSystem=True (--webCacheStoreShared), which selects sqlite's unix-dotfile
+locking (a lock file created exclusively, which NFS supports) and turns memory mapping
+off.  Dotfile locks are exclusive, so readers of a shared store are serialized too;
+the rollback journal (not WAL, which needs shared memory) is used in both cases.
+scripts/checkWebCacheStoreSharing.py exercises concurrent processes on a store file.
+
+Within a process the store's single connection is shared by threads, each operation
+holding the store's lock.
+'''
+import os, io, sys, hashlib, sqlite3, threading
+
+MMAP_SIZE = 256 * 1024 * 1024 # memory mapped read size of a local store
+
+class WebCacheStore:
+    def __init__(self, storeFile, busyTimeout=60.0, sharedFileSystem=False):
+        self.storeFile = storeFile
+        storeDir = os.path.dirname(storeFile)
+        if storeDir and not os.path.exists(storeDir):
+            os.makedirs(storeDir)
+        self.lock = threading.Lock()
+        if sharedFileSystem and not sys.platform.startswith("win"):
+            # dotfile locking works on network file systems where posix advisory locks may not
+            connectTo = "file:{0}?vfs=unix-dotfile".format(os.path.abspath(storeFile).replace("?", "%3f").replace("#", "%23"))
+            uriKwargs = {"uri": True} # python 3.4 or later
+        else:
+            connectTo = storeFile
+            uriKwargs = {}
+        # isolation_level None: each statement (or explicit transaction) commits on its own
+        self.conn = sqlite3.connect(connectTo, timeout=busyTimeout, isolation_level=None,
+                                    check_same_thread=False, **uriKwargs)
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        if not sharedFileSystem:
+            self.conn.execute("PRAGMA mmap_size={0}".format(MMAP_SIZE))
+        self.conn.execute("CREATE TABLE IF NOT EXISTS urls ("
+                          "url TEXT PRIMARY KEY, "
+                          "digest TEXT, "
+                          "modified REAL, "
+                          "checked TEXT)")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS blobs ("
+                          "digest TEXT PRIMARY KEY, "
+                          "content BLOB)")
+        self.materializedDigests = {} # filepath: digest of content written by this process
+
+    def close(self):
+        with self.lock:
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
+            self.materializedDigests.clear()
+
+    def checkTime(self, url):
+        with self.lock:
+            row = self.conn.execute("SELECT checked FROM urls WHERE url = ?", (url,)).fetchone()
+        if row is not None:
+            return row[0]
+        return None
+
+    def setCheckTime(self, url, checkTime):
+        with self.lock:
+            # urls cached before the store was used (files only) have no row yet
+            if self.conn.execute("UPDATE urls SET checked = ? WHERE url = ?", (checkTime, url)).rowcount == 0:
+                self.conn.execute("INSERT OR IGNORE INTO urls (url, checked) VALUES (?, ?)", (url, checkTime))
+
+    def modifiedTime(self, url):
+        ''' returns web modification time of stored url (0 if not known), None if url content is not stored '''
+        with self.lock:
+            row = self.conn.execute("SELECT modified FROM urls WHERE url = ? AND digest IS NOT NULL", (url,)).fetchone()
+        if row is not None:
+            return row[0] or 0
+        return None
+
+    def content(self, url):
+        ''' returns bytes of stored url content, None if not stored '''
+        with self.lock:
+            row = self.conn.execute("SELECT content FROM urls JOIN blobs ON urls.digest = blobs.digest "
+                                    "WHERE url = ?", (url,)).fetchone()
+        if row is not None:
+            return bytes(row[0])
+        return None
+
+    def put(self, url, content, modifiedTime, checkTime):
+        digest = hashlib.sha256(content).hexdigest()
+        with self.lock:
+            conn = self.conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                # identical content (e.g., same schema served from mirrored urls) is stored once
+                conn.execute("INSERT OR IGNORE INTO blobs (digest, content) VALUES (?, ?)",
+                             (digest, sqlite3.Binary(content)))
+                conn.execute("INSERT OR REPLACE INTO urls (url, digest, modified, checked) VALUES (?, ?, ?, ?)",
+                             (url, digest, modifiedTime, checkTime))
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return digest
+
+    def materialize(self, url, filepath):
+        ''' writes stored content of url to filepath (for callers needing a file) unless already current,
+        returns True if url is stored '''
+        with self.lock:
+            row = self.conn.execute("SELECT urls.digest, modified, length(content) FROM urls JOIN blobs ON urls.digest = blobs.digest "
+                                    "WHERE url = ?", (url,)).fetchone()
+        if row is None: # not stored (or only its check time is stored)
+            return False
+        digest, modifiedTime, size = row
+        if self.materializedDigests.get(filepath) == digest and os.path.exists(filepath):
+            return True
+        try: # written by another process (or before the store was used): same size and web modification time
+            fileStat = os.stat(filepath)
+            if fileStat.st_size == size and modifiedTime and int(fileStat.st_mtime) == int(modifiedTime):
+                self.materializedDigests[filepath] = digest
+                return True
+        except OSError:
+            pass # no file
+        content = self.content(url)
+        if content is None: # removed meanwhile
+            return False
+        filedir = os.path.dirname(filepath)
+        if not os.path.exists(filedir):
+            try:
+                os.makedirs(filedir)
+            except OSError:
+                pass # created concurrently by another process
+        # write under temporary name so concurrent local readers never see a partial file
+        filepathtmp = "{0}.{1}.{2}.tmp".format(filepath, os.getpid(), threading.current_thread().ident)
+        with io.open(filepathtmp, 'wb') as fh:
+            fh.write(content)
+        if modifiedTime:
+            os.utime(filepathtmp, (modifiedTime, modifiedTime))
+        os.replace(filepathtmp, filepath) # atomic, filepath is never missing
+        self.materializedDigests[filepath] = digest
+        return True
+
+    def clear(self):
+        with self.lock:
+            conn = self.conn
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("DELETE FROM urls")
+            conn.execute("DELETE FROM blobs")
+            conn.execute("COMMIT")
+            conn.execute("VACUUM")
+            self.materializedDigests.clear()
@@ -79,6 +79,60 @@ predefinedAttributeTypes = {
 
 xAttributesSharedEmptyDict = {}
 
+# lexical values of these types are validated independently of their element (unlike QName), and are 
+# highly repetitive in instances, so their validation results are memoized (as are those of enumerations)
+memoizableXsdTypes = {"boolean", "date", "dateTime", "XBRLI_DATEUNION", 
+                      "decimal", "float", "double", "integer",
+                      "nonPositiveInteger","negativeInteger","nonNegativeInteger","positiveInteger",
+                      "long","unsignedLong", "int","unsignedInt", "short","unsignedShort", "byte","unsignedByte",
+                      "XBRLI_DECIMALSUNION", "XBRLI_PRECISIONUNION", "XBRLI_NONZERODECIMAL",
+                      "language", "token", "NMTOKEN", "Name", "NCName",
+                      "gYearMonth", "gYear", "gMonthDay", "gDay", "gMonth"}
+lexicalValueMemoSize = 1024 # maximum memoized values per lexical validator, 0 to not memoize
+
+class LexicalValidator(): # use slotted class for execution efficiency
+    """Whitespace, pattern and list handling of a base xsd type with its facets, derived once per
+    (base type, facets) instead of for each value, with a bounded memo of valid lexical values 
+    to their (xValid, xValue, sValue) for memoizable types."""
+    __slots__ = ("baseXsdType", "facets", "isList", "pattern", "whitespaceReplace", "whitespaceCollapse", "memo")
+
+    def __init__(self, baseXsdType, facets):
+        self.facets = facets
+        self.whitespaceReplace = (baseXsdType == "normalizedString")
+        self.whitespaceCollapse = (not self.whitespaceReplace and baseXsdType != "string")
+        self.isList = baseXsdType in {"IDREFS", "ENTITIES", "NMTOKENS"}
+        if self.isList:
+            baseXsdType = baseXsdType[:-1] # remove plural
+        self.baseXsdType = baseXsdType
+        self.pattern = baseXsdTypePatterns.get(baseXsdType)
+        if facets:
+            if "pattern" in facets:
+                self.pattern = facets["pattern"]
+                # note multiple patterns are or'ed togetner, which isn't yet implemented!
+            if "whiteSpace" in facets:
+                self.whitespaceReplace, self.whitespaceCollapse = {"preserve":(False,False), "replace":(True,False), "collapse":(False,True)}[facets["whiteSpace"]]
+        if lexicalValueMemoSize > 0 and not self.isList and (
+            baseXsdType in memoizableXsdTypes or (facets and "enumeration" in facets and baseXsdType != "QName")):
+            self.memo = {}
+        else:
+            self.memo = None
+
+def lexicalValidator(modelXbrl, baseXsdType, facets):
+    # facets dicts are cached by their types, so validators are cached per DTS by (type, facets identity)
+    try:
+        lexicalValidators = modelXbrl.lexicalValidators
+    except AttributeError: # e.g., facet validation of an object without modelXbrl lexical validators
+        return LexicalValidator(baseXsdType, facets)
+    key = (baseXsdType, id(facets) if facets else None)
+    try:
+        validator = lexicalValidators[key]
+        if validator.facets is facets or not facets:
+            return validator
+    except KeyError:
+        pass
+    validator = lexicalValidators[key] = LexicalValidator(baseXsdType, facets)
+    return validator
+
 def validate(modelXbrl, elt, recurse=True, attrQname=None, ixFacts=False):
     global ModelInlineValueObject
     if ModelInlineValueObject is None:
@@ -273,22 +327,15 @@ def validateValue(modelXbrl, elt, attrTag, baseXsdType, value, isNillable=False,
                 raise ValueError("missing value for not nillable element")
             '''
             xValid = VALID
-            whitespaceReplace = (baseXsdType == "normalizedString")
-            whitespaceCollapse = (not whitespaceReplace and baseXsdType != "string")
-            isList = baseXsdType in {"IDREFS", "ENTITIES", "NMTOKENS"}
-            if isList:
-                baseXsdType = baseXsdType[:-1] # remove plural
-            pattern = baseXsdTypePatterns.get(baseXsdType)
-            if facets:
-                if "pattern" in facets:
-                    pattern = facets["pattern"]
-                    # note multiple patterns are or'ed togetner, which isn't yet implemented!
-                if "whiteSpace" in facets:
-                    whitespaceReplace, whitespaceCollapse = {"preserve":(False,False), "replace":(True,False), "collapse":(False,True)}[facets["whiteSpace"]]
-            if whitespaceReplace:
+            validator = lexicalValidator(modelXbrl, baseXsdType, facets)
+            baseXsdType = validator.baseXsdType
+            isList = validator.isList
+            pattern = validator.pattern
+            if validator.whitespaceReplace:
                 value = normalizeWhitespacePattern.sub(' ', value)
-            elif whitespaceCollapse:
+            elif validator.whitespaceCollapse:
                 value = collapseWhitespacePattern.sub(' ', value.strip())
+            memo = validator.memo
             if baseXsdType == "noContent":
                 if len(value) > 0 and not value.isspace():
                     raise ValueError("value content not permitted")
@@ -297,6 +344,8 @@ def validateValue(modelXbrl, elt, attrTag, baseXsdType, value, isNillable=False,
                 xValid = VALID_NO_CONTENT # notify others that element may contain subelements (for stringValue needs)
             elif not value and isNil and isNillable: # rest of types get None if nil/empty value
                 xValue = sValue = None
+            elif memo is not None and value in memo:
+                xValid, xValue, sValue = memo[value]
             else:
                 if pattern is not None:
                     if ((isList and any(pattern.match(v) is None for v in value.split())) or
@@ -446,6 +495,8 @@ def validateValue(modelXbrl, elt, attrTag, baseXsdType, value, isNillable=False,
                     else: # no lexical pattern, forget compiling value
                         xValue = value
                     sValue = value
+                if memo is not None and len(memo) < lexicalValueMemoSize:
+                    memo[value] = (xValid, xValue, sValue)
         except (ValueError, InvalidOperation) as err:
             if ModelInlineValueObject is not None and isinstance(elt, ModelInlineValueObject):
                 errElt = "{0} fact {1}".format(elt.elementQname, elt.qname)
@@ -88,7 +88,8 @@ def tdNetLoader(modelXbrl, mappedUri, filepath, **kwargs):
     while hasMoreSections:
         # treat tdnet as an RSS feed object
         try:
-            tdInfoDoc = html.parse(filepath)
+            _file, = modelXbrl.fileSource.file(filepath, binary=True) # may be web cache store content
+            tdInfoDoc = html.parse(_file)
         except (IOError, EnvironmentError):
             return None # give up, use ordinary loader
         
@@ -7,12 +7,63 @@ Saves extracted instance document.
 
 (Does not currently support multiple target instance documents in a document set.)
 
+Web-located documents of a document set are fetched into the web cache concurrently (by
+prefetchWorkers threads, without user interaction) before they are loaded.  Parsing, discovery
+and the harvest of ix elements remain on the loading thread: lxml trees are bound to the thread
+that parsed them, and model object class lookup calls back into the DTS.
+
 (c) Copyright 2013 Mark V Systems Limited, All rights reserved.
 '''
 from arelle import ModelXbrl, ValidateXbrlDimensions, XmlUtil, XbrlConst
 from arelle.PrototypeDtsObject import LocPrototype
-from arelle.ModelDocument import ModelDocument, ModelDocumentReference, Type, load
-import os
+from arelle.ModelDocument import ModelDocument, ModelDocumentReference, Type, load, mappedUrl
+from arelle.FileSource import SERVER_WEB_CACHE
+from arelle.UrlUtil import isHttpUrl
+import os, threading, time
+
+prefetchWorkers = 4 # concurrent web cache fetches of document set documents, 0 to not prefetch
+
+def prefetchDocuments(modelXbrl, urls):
+    # fetch web-located documents not yet cached into the web cache concurrently, so the serial loads find them
+    webCache = modelXbrl.modelManager.cntlr.webCache
+    if (prefetchWorkers <= 0 or webCache.workOffline or webCache.cacheDir == SERVER_WEB_CACHE or
+        webCache.cacheStore is not None): # single store connection is not shared among fetching threads
+        return
+    webUrls = []
+    for url in urls:
+        if (isHttpUrl(url) and url not in webUrls and # a url listed twice would be fetched twice
+            not modelXbrl.fileSource.isInArchive(url)):
+            webUrls.append(url)
+    if len(webUrls) < 2:
+        return
+    pendingUrls = webUrls[::-1] # pop in document set order
+    fetchErrors = {}
+    lock = threading.Lock()
+    def fetchUrls():
+        while True:
+            with lock:
+                if not pendingUrls:
+                    return
+                url = pendingUrls.pop()
+            err = webCache.prefetch(url) # no dialogs or logging from worker threads
+            if err is not None:
+                with lock:
+                    fetchErrors[url] = err
+    threads = [threading.Thread(target=fetchUrls) for i in range(min(prefetchWorkers, len(webUrls)))]
+    for thread in threads:
+        thread.daemon = True
+        thread.start()
+    for thread in threads:
+        thread.join()
+    timeNowStr = time.strftime('%Y-%m-%dT%H:%M:%S UTC', time.gmtime())
+    for url in webUrls:
+        if url in fetchErrors:
+            # retried (with any logon or authentication dialog) and reported if not loadable when loaded
+            modelXbrl.info("info:ixdsPrefetchUnsuccessful",
+                           _("Document set document %(url)s was not prefetched: %(error)s"),
+                           modelObject=modelXbrl, url=url, error=fetchErrors[url])
+        elif webCache.urlCheckTime(url) is None: # just fetched, so load needn't recheck it
+            webCache.setUrlCheckTime(url, timeNowStr)
 
 class ModelInlineXbrlDocumentSet(ModelDocument):
         
@@ -22,17 +73,21 @@ class ModelInlineXbrlDocumentSet(ModelDocument):
             self.targetDocumentId = targetId
             self.targetDocumentPreferredFilename = instanceElt.get('preferredFilename')
             self.targetDocumentSchemaRefs = set()  # union all the instance schemaRefs
-            for ixbrlElt in instanceElt.iter(tag="{http://disclosure.edinet-fsa.go.jp/2013/manifest}ixbrl"):
-                uri = ixbrlElt.textValue.strip()
-                if uri:
-                    doc = load(self.modelXbrl, uri, base=self.filepath, referringElement=instanceElt)
-                    if doc is not None and doc not in self.referencesDocument:
-                        referencedDocument = ModelDocumentReference("inlineDocument", instanceElt)
-                        referencedDocument.targetId = targetId
-                        self.referencesDocument[doc] = referencedDocument
-                        for referencedDoc in doc.referencesDocument.keys():
-                            if referencedDoc.type == Type.SCHEMA:
-                                self.targetDocumentSchemaRefs.add(doc.relativeUri(referencedDoc.uri))
+            uris = [uri
+                    for ixbrlElt in instanceElt.iter(tag="{http://disclosure.edinet-fsa.go.jp/2013/manifest}ixbrl")
+                    for uri in (ixbrlElt.textValue.strip(),)
+                    if uri]
+            normalizeUrl = self.modelXbrl.modelManager.cntlr.webCache.normalizeUrl
+            prefetchDocuments(self.modelXbrl, [mappedUrl(self.modelXbrl, normalizeUrl(uri, self.filepath)) for uri in uris])
+            for uri in uris:
+                doc = load(self.modelXbrl, uri, base=self.filepath, referringElement=instanceElt)
+                if doc is not None and doc not in self.referencesDocument:
+                    referencedDocument = ModelDocumentReference("inlineDocument", instanceElt)
+                    referencedDocument.targetId = targetId
+                    self.referencesDocument[doc] = referencedDocument
+                    for referencedDoc in doc.referencesDocument.keys():
+                        if referencedDoc.type == Type.SCHEMA:
+                            self.targetDocumentSchemaRefs.add(doc.relativeUri(referencedDoc.uri))
         return True
 
 def saveTargetDocument(modelXbrl, targetDocumentFilename, targetDocumentSchemaRefs):
@@ -36,10 +36,46 @@ class SphinxContext:
         self.staticSeverity = None
         self.dynamicSeverity = None
         self.dimensionIsExplicit = {}  # qname of dimension (axis), True if explicit, False if typed
+        self.factIndexes = {}  # fact indexes (by period, entity identifier, typed dimension) built on first use
+        self.preconditionResults = None  # dict of precondition results by name, when rule base is compiled
         if modelXbrl is not None:
             self.formulaOptions = modelXbrl.modelManager.formulaOptions
             self.defaultDimensionAspects = set(modelXbrl.qnameDimensionDefaults.keys())
         
+    def factIndex(self, indexKey, factKey):
+        # dict by factKey(fact) of sets of non-nil facts having a context, factKey returning None excludes a fact
+        try:
+            return self.factIndexes[indexKey]
+        except KeyError:
+            index = self.factIndexes[indexKey] = {}
+            for fact in self.modelXbrl.nonNilFactsInInstance:
+                if fact.context is not None:
+                    key = factKey(fact)
+                    if key is not None:
+                        index.setdefault(key, set()).add(fact)
+            return index
+            
+    def periodFacts(self, period):
+        return self.factIndex(Aspect.PERIOD, factPeriodKey).get(period, EMPTY_SET)
+    
+    def entityIdentifierFacts(self, entityIdentifier):
+        return self.factIndex(Aspect.ENTITY_IDENTIFIER, factEntityIdentifierKey).get(entityIdentifier, EMPTY_SET)
+    
+    def typedDimFacts(self, aspect, value):
+        # facts passing typedDimTest(aspect, value, fact), or None if value is not indexable
+        index = self.factIndex(aspect, lambda fact: factTypedDimKey(aspect, fact))
+        if value is NONE or value is DEFAULT:
+            facts = index.get(TYPED_DIM_NIL_OR_ABSENT, EMPTY_SET)
+        else:
+            facts = EMPTY_SET
+        if value is NONDEFAULT:
+            return facts.union(*[typedFacts for key, typedFacts in index.items() if key is not TYPED_DIM_NIL_OR_ABSENT])
+        if isinstance(value, _STR_BASE):
+            return facts | index.get(value, EMPTY_SET)
+        if value is NONE:
+            return facts
+        return None # other values are tested per fact
+        
     def close(self):
         # dereference grammar
         for prog in self.sphinxProgs:
@@ -128,26 +164,30 @@ class HyperspaceBinding:
             withAspectsQualified = hyperspaceBindings.withRestrictionBindings[-1].aspectsQualified
         else:
             withAspectsQualified = set()
-        # axes from macros need to be expanded
-        self.aspectAxisTuples = []
-        self.axesAspects = set()
-        for hsAxis in node.axes:
-            if hsAxis.aspect: # no aspect if just a where clause
-                aspect = evaluate(hsAxis.aspect, self.sCtx, value=True)
-                if aspect not in self.aspectsDefined and not isinstance(aspect, QName):
-                    raise SphinxException(node, "sphinx:aspectValue", 
-                          _("Hyperspace aspect indeterminate %(aspect)s"),
-                          aspect=aspect)
-                if isinstance(aspect, QName):
-                    if aspect not in self.sCtx.dimensionIsExplicit: # probably dynamic macro aspect
-                        concept = self.sCtx.modelXbrl.qnameConcepts.get(aspect)
-                        if concept is None or not concept.isDimensionItem:
-                            raise SphinxException(node, "sphinxDynamicHyperspace:axisNotDimension",
-                                _("Axis aspect is not a dimension in the DTS %(aspect)s"),
-                                aspect=aspect)
-                        self.sCtx.dimensionIsExplicit[aspect] = concept.isExplicitDimension                        
-                self.axesAspects.add(aspect) # resolved aspect value
-                self.aspectAxisTuples.append( (aspect, hsAxis) )
+        if node.staticAspectAxisTuples is not None: # axes aspects were static and resolved when compiled
+            self.aspectAxisTuples = node.staticAspectAxisTuples
+            self.axesAspects = set(aspect for aspect, hsAxis in self.aspectAxisTuples)
+        else:
+            # axes from macros need to be expanded
+            self.aspectAxisTuples = []
+            self.axesAspects = set()
+            for hsAxis in node.axes:
+                if hsAxis.aspect: # no aspect if just a where clause
+                    aspect = evaluate(hsAxis.aspect, self.sCtx, value=True)
+                    if aspect not in self.aspectsDefined and not isinstance(aspect, QName):
+                        raise SphinxException(node, "sphinx:aspectValue", 
+                              _("Hyperspace aspect indeterminate %(aspect)s"),
+                              aspect=aspect)
+                    if isinstance(aspect, QName):
+                        if aspect not in self.sCtx.dimensionIsExplicit: # probably dynamic macro aspect
+                            concept = self.sCtx.modelXbrl.qnameConcepts.get(aspect)
+                            if concept is None or not concept.isDimensionItem:
+                                raise SphinxException(node, "sphinxDynamicHyperspace:axisNotDimension",
+                                    _("Axis aspect is not a dimension in the DTS %(aspect)s"),
+                                    aspect=aspect)
+                            self.sCtx.dimensionIsExplicit[aspect] = concept.isExplicitDimension                        
+                    self.axesAspects.add(aspect) # resolved aspect value
+                    self.aspectAxisTuples.append( (aspect, hsAxis) )
         self.aspectsQualified = self.axesAspects | withAspectsQualified
         self.reset()  # will raise StopIteration if no facts or fallback
         
@@ -202,15 +242,29 @@ class HyperspaceBinding:
                  sourceFileLine=self.node.sourceFileLine, variable=str(self.node), factCount=len(facts))
         if self.isWithRestrictionNode: # if withNode, combine facts into partitions by qualified aspects
             factsPartitions = []
+            if any(fact.isTuple or fact.context is None for fact in facts):
+                bucketedPartitions = None # tuples match any non-concept aspect, compare with every partition
+            else:
+                # partitions are bucketed by a hash of the qualified aspect values which all matching facts share,
+                # so each fact is only compared with the partitions of its bucket
+                bucketedPartitions = {}
+                aspectsQualified = tuple(self.aspectsQualified)
             for fact in facts:
                 matched = False
-                for partition in factsPartitions:
+                if bucketedPartitions is None:
+                    candidatePartitions = factsPartitions
+                else:
+                    candidatePartitions = bucketedPartitions.setdefault(factAspectsKey(fact, aspectsQualified), [])
+                for partition in candidatePartitions:
                     if aspectsMatch(self.sCtx, fact, partition[0], self.aspectsQualified):
                         partition.append(fact)
                         matched = True
                         break
                 if not matched:
-                    factsPartitions.append([fact,])
+                    partition = [fact,]
+                    factsPartitions.append(partition)
+                    if bucketedPartitions is not None:
+                        candidatePartitions.append(partition)
             self.factIter = iter([set(p) for p in factsPartitions])  # must be sets
             self.yieldedFactsPartition = []
         else: # just a hyperspaceExpression node
@@ -266,16 +320,25 @@ class HyperspaceBinding:
             aspect, hsAxis = aspectAxis
             # value is an astHyperspaceAxis
             if hsAxis.restriction:
-                restriction = evaluate(hsAxis.restriction, self.sCtx, value=True)
+                restriction = hsAxis.constantRestriction
+                if restriction is None:
+                    restriction = evaluate(hsAxis.restriction, self.sCtx, value=True)
                 if aspect == Aspect.CONCEPT:
                     aspectQualifiedFacts = [modelXbrl.factsByQname[qn]
                                             for qn in restriction
                                             if isinstance(qn, QName)]
                     facts = facts & set.union(*aspectQualifiedFacts) if aspectQualifiedFacts else set()
                 elif aspect == Aspect.PERIOD:
-                    facts = set(f for f in facts if isPeriodEqualTo(f, restriction))
+                    try:
+                        facts = facts & set().union(*[self.sCtx.periodFacts(period) for period in restriction])
+                    except TypeError: # unhashable restriction value
+                        facts = set(f for f in facts if isPeriodEqualTo(f, restriction))
                 elif aspect == Aspect.ENTITY_IDENTIFIER:
-                    facts = set(f for f in facts if isEntityIdentifierEqualTo(f, restriction))
+                    try:
+                        facts = facts & set().union(*[self.sCtx.entityIdentifierFacts(entityIdentifier) 
+                                                      for entityIdentifier in restriction])
+                    except TypeError: # unhashable restriction value
+                        facts = set(f for f in facts if isEntityIdentifierEqualTo(f, restriction))
                 elif isinstance(aspect, QName):
                     if self.sCtx.dimensionIsExplicit.get(aspect):
                         # explicit dim facts (value None will match the default member)
@@ -293,10 +356,13 @@ class HyperspaceBinding:
                             aspectQualifiedFacts.append(modelXbrl.factsByDimMemQname(aspect, qn))
                         facts = facts & set.union(*aspectQualifiedFacts) if aspectQualifiedFacts else set()
                     else:
-                        facts = facts & set(fact 
-                                            for fact in facts
-                                            for typedDimValue in hsAxis.restriction
-                                            if typedDimTest(aspect, typedDimValue, fact))
+                        typedDimFacts = set()
+                        for typedDimValue in hsAxis.restriction:
+                            valueFacts = self.sCtx.typedDimFacts(aspect, typedDimValue)
+                            if valueFacts is None: # not indexable value
+                                valueFacts = set(fact for fact in facts if typedDimTest(aspect, typedDimValue, fact))
+                            typedDimFacts |= valueFacts
+                        facts = facts & typedDimFacts
             if hsAxis.whereExpr and facts:  # process where against facts passing restriction
                 whereMatchedFacts = set()
                 asVars = set()
@@ -327,6 +393,55 @@ class HyperspaceBinding:
                      sourceFileLine=self.node.sourceFileLine, variable=str(self.node), factCount=len(facts))
         return facts
 
+EMPTY_SET = frozenset()
+TYPED_DIM_NIL_OR_ABSENT = object()
+TYPED_DIM_VALUE = object() # aspect key of typed dimension values (which are compared by aspectsMatch)
+
+def factPeriodKey(fact):
+    # period as compared by isPeriodEqualTo
+    context = fact.context
+    if context.isInstantPeriod:
+        return context.instantDatetime
+    elif context.isStartEndPeriod:
+        return (context.startDatetime, context.endDatetime)
+    elif context.isForeverPeriod:
+        return (None, None)
+    return None
+
+def factEntityIdentifierKey(fact):
+    return fact.context.entityIdentifier
+
+def factTypedDimKey(aspect, fact):
+    # typed member text, as tested by typedDimTest
+    modelDim = fact.context.dimValue(aspect)
+    if isinstance(modelDim, ModelDimensionValue):
+        memElt = modelDim.typedMember
+        if memElt is not None and memElt.get("{http://www.w3.org/2001/XMLSchema-instance}nil") != "true":
+            return memElt.textValue
+    return TYPED_DIM_NIL_OR_ABSENT
+
+def factAspectsKey(fact, aspects):
+    # hashable key of aspect values which is equal for facts matching on aspects (but may be equal for non-matching facts)
+    context = fact.context
+    key = []
+    for aspect in aspects:
+        if aspect == Aspect.CONCEPT:
+            key.append(fact.qname)
+        elif aspect == Aspect.UNIT:
+            unit = fact.unit
+            key.append(unit.hash if unit is not None else None)
+        elif aspect == Aspect.PERIOD:
+            key.append(context.periodHash)
+        elif aspect == Aspect.ENTITY_IDENTIFIER:
+            key.append(context.entityIdentifierHash)
+        elif isinstance(aspect, QName):
+            dimValue = context.dimValue(aspect)
+            if isinstance(dimValue, ModelDimensionValue):
+                key.append(dimValue.memberQname if dimValue.isExplicit else TYPED_DIM_VALUE)
+            else: # default member QName or None
+                key.append(dimValue)
+    return tuple(key)
+
 def isPeriodEqualTo(fact, periodRestriction):
     context = fact.context
     if context is not None:
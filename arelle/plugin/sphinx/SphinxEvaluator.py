@@ -12,13 +12,14 @@ Mark V Systems conveys neither rights nor license for the Sphinx language.
 
 import operator
 from .SphinxContext import HyperspaceBindings, HyperspaceBinding
-from .SphinxParser import (astFunctionReference, astHyperspaceExpression, astNode, 
-                           astFormulaRule, astReportRule,
-                           astVariableReference)
+from .SphinxParser import (astBinaryOperation, astFunctionReference, astHyperspaceAxis,
+                           astHyperspaceExpression, astIf, astNode, 
+                           astFormulaRule, astNumericLiteral, astQnameLiteral, astReportRule,
+                           astStringLiteral, astUnaryOperation, astVariableReference)
 from .SphinxMethods import (methodImplementation, functionImplementation, 
                             aggreateFunctionImplementation, aggreateFunctionAcceptsFactArgs,
                             moduleInit as SphinxMethodsModuleInit)
-from arelle.ModelFormulaObject import Aspect
+from arelle.ModelFormulaObject import Aspect, aspectModels
 from arelle.ModelValue import QName
 from arelle.ModelInstanceObject import ModelFact
 from arelle.ModelXbrl import DEFAULT, NONDEFAULT, DEFAULTorNONDEFAULT
@@ -42,6 +43,13 @@ class SphinxSpecialValue:
 
 UNBOUND = SphinxSpecialValue("unbound")
 NONE = SphinxSpecialValue("none")
+NOT_CONSTANT = SphinxSpecialValue("not constant") # compiled node value depends on evaluation
+
+binaryOperators = {'+': operator.add, '-': operator.sub, '*': operator.mul, '/': operator.truediv,
+                   '<': operator.lt, '>': operator.gt, '<=': operator.le, '>=': operator.ge,
+                   '==': operator.eq, '!=': operator.ne,
+                   'and': operator.and_, 'or': operator.or_,
+                   }
 
 
 def evaluateRuleBase(sphinxContext):
@@ -52,6 +60,8 @@ def evaluateRuleBase(sphinxContext):
         
     clearEvaluation(sphinxContext)
     
+    compileEvaluation(sphinxContext)
+    
     # check any rule-base preconditions
     for preconditionNode in sphinxContext.ruleBasePreconditionNodes:
         preconditionPasses = evaluate(preconditionNode, sphinxContext)
@@ -67,6 +77,7 @@ def evaluateRuleBase(sphinxContext):
     # dereference constants
     for constantNode in sphinxContext.constants.values():
         constantNode.value = None
+    sphinxContext.preconditionResults = None
         
 def clearEvaluation(sphinxContext):
     sphinxContext.tags.clear()
@@ -74,13 +85,139 @@ def clearEvaluation(sphinxContext):
     while sphinxContext.hyperspaceBindings:
         sphinxContext.hyperspaceBindings.close() # resets sphinxContext.hyperspaceBindings to parent bindings
         
+def compileEvaluation(sphinxContext):
+    # resolve each node's evaluation function once per rule base evaluation (instead of dispatching
+    # on node class name for every node evaluation), fold literal expressions into constant values,
+    # resolve references to declared constants, static hyperspace axes aspects and constant axis
+    # restrictions.  When tracing expression evaluation nodes are left uncompiled, so that the
+    # tree-walking evaluation traces each node.
+    formulaOptions = sphinxContext.formulaOptions
+    isTracing = (formulaOptions.traceVariableSetExpressionEvaluation or 
+                 formulaOptions.traceVariableExpressionEvaluation)
+    compiledNodes = {}
+    for prog in sphinxContext.sphinxProgs:
+        for node in prog:
+            compileNodeEvaluation(node, sphinxContext, isTracing, compiledNodes)
+    sphinxContext.preconditionResults = None if isTracing else {}
+    
+def compileNodeEvaluation(node, sphinxContext, isTracing, compiledNodes):
+    # returns value of node evaluation (with value=True) if constant, otherwise NOT_CONSTANT
+    if isinstance(node, (list, tuple, set)):
+        for item in node:
+            compileNodeEvaluation(item, sphinxContext, isTracing, compiledNodes)
+        return NOT_CONSTANT
+    elif not isinstance(node, astNode):
+        return node # evaluates to itself
+    elif node in compiledNodes:
+        return compiledNodes[node]
+    compiledNodes[node] = NOT_CONSTANT
+    for expr in list(node.__dict__.values()):
+        if isinstance(expr, (astNode, list, tuple, set)):
+            compileNodeEvaluation(expr, sphinxContext, isTracing, compiledNodes)
+    if isinstance(node, astHyperspaceExpression):
+        node.staticAspectAxisTuples = None if isTracing else staticAspectAxisTuples(node, sphinxContext)
+    elif isinstance(node, astHyperspaceAxis):
+        node.constantRestriction = None
+        if not isTracing and isinstance(node.restriction, (list, tuple)):
+            restriction = [compileNodeEvaluation(expr, sphinxContext, isTracing, compiledNodes)
+                           for expr in node.restriction]
+            if NOT_CONSTANT not in restriction:
+                node.constantRestriction = restriction
+    if isTracing:
+        node.compiledEvaluation = None
+        return NOT_CONSTANT
+    
+    constantValue = NOT_CONSTANT
+    compiledEvaluation = evaluator.get(node.__class__.__name__)
+    if isinstance(node, (astNumericLiteral, astQnameLiteral)):
+        constantValue = node.value
+    elif isinstance(node, astStringLiteral):
+        constantValue = node.text
+    elif isinstance(node, astBinaryOperation):
+        op = node.op
+        if op in binaryOperators:
+            leftValue = compileNodeEvaluation(node.leftExpr, sphinxContext, isTracing, compiledNodes)
+            rightValue = compileNodeEvaluation(node.rightExpr, sphinxContext, isTracing, compiledNodes)
+            if (leftValue is not NOT_CONSTANT and rightValue is not NOT_CONSTANT and
+                not (op == "/" and rightValue == 0)):
+                try:
+                    constantValue = binaryOperators[op](leftValue, rightValue)
+                    compiledEvaluation = constantEvaluation(constantValue)
+                except Exception:
+                    pass # left to be reported when evaluated
+    elif isinstance(node, astUnaryOperation):
+        exprValue = compileNodeEvaluation(node.expr, sphinxContext, isTracing, compiledNodes)
+        if exprValue is not NOT_CONSTANT:
+            if node.op == "brackets":  # evaluation returns the bracketed node, but its value is constant
+                constantValue = exprValue
+            elif node.op in ("+", "-", "not"):
+                try:
+                    constantValue = unaryOperators[node.op](exprValue)
+                    compiledEvaluation = constantEvaluation(constantValue)
+                except Exception:
+                    pass # left to be reported when evaluated
+    elif isinstance(node, astIf):
+        conditionValue = compileNodeEvaluation(node.condition, sphinxContext, isTracing, compiledNodes)
+        if conditionValue is not NOT_CONSTANT:
+            compiledEvaluation = ifEvaluation(node.thenExpr if conditionValue else node.elseExpr)
+    elif isinstance(node, astVariableReference):
+        compiledEvaluation = variableReferenceEvaluation(node.variableName, 
+                                                         sphinxContext.constants.get(node.variableName))
+    node.compiledEvaluation = compiledEvaluation
+    compiledNodes[node] = constantValue
+    return constantValue
+
+def constantEvaluation(constantValue):
+    def evaluateConstantValue(node, sphinxContext):
+        return constantValue
+    return evaluateConstantValue
+
+def ifEvaluation(expr):
+    def evaluateIfConstantCondition(node, sphinxContext):
+        return evaluate(expr, sphinxContext)
+    return evaluateIfConstantCondition
+
+def variableReferenceEvaluation(variableName, constantNode):
+    def evaluateResolvedVariableReference(node, sphinxContext):
+        try:
+            return sphinxContext.localVariables[variableName]
+        except KeyError:
+            if constantNode is not None:
+                return evaluateConstant(constantNode, sphinxContext)
+            raise SphinxException(node, 
+                                  "sphinx:variableName", 
+                                  _("unassigned variable name %(name)s"),
+                                  name=variableName)
+    return evaluateResolvedVariableReference
+
+def staticAspectAxisTuples(node, sphinxContext):
+    # (aspect, axis) tuples of hyperspace expression if every axis aspect is static and valid, otherwise None
+    # (so that dynamic, e.g., macro parameter, and invalid aspects are resolved and reported when bound)
+    aspectAxisTuples = []
+    for hsAxis in node.axes:
+        aspect = hsAxis.aspect
+        if aspect: # no aspect if just a where clause
+            if isinstance(aspect, astNode):
+                return None
+            elif isinstance(aspect, QName):
+                if aspect not in sphinxContext.dimensionIsExplicit:
+                    concept = sphinxContext.modelXbrl.qnameConcepts.get(aspect)
+                    if concept is None or not concept.isDimensionItem:
+                        return None
+                    sphinxContext.dimensionIsExplicit[aspect] = concept.isExplicitDimension
+            elif aspect not in aspectModels["dimensional"]:
+                return None
+            aspectAxisTuples.append( (aspect, hsAxis) )
+    return aspectAxisTuples
+        
 def evaluate(node, sphinxContext, value=False, fallback=None, hsBoundFact=False):
     if isinstance(node, astNode):
+        nodeEvaluator = node.compiledEvaluation or evaluator[node.__class__.__name__]
         if fallback is None:
-            result = evaluator[node.__class__.__name__](node, sphinxContext)
+            result = nodeEvaluator(node, sphinxContext)
         else:
             try:
-                result = evaluator[node.__class__.__name__](node, sphinxContext)
+                result = nodeEvaluator(node, sphinxContext)
             except StopIteration:
                 if sphinxContext.formulaOptions.traceVariableSetExpressionEvaluation:
                     sphinxContext.modelXbrl.info("sphinx:trace",
@@ -153,11 +290,7 @@ def evaluateBinaryOperation(node, sphinxContext):
         if op == "/" and rightValue == 0:  # prevent divide by zero
             return UNBOUND
     try:
-        result = {'+': operator.add, '-': operator.sub, '*': operator.mul, '/': operator.truediv,
-                  '<': operator.lt, '>': operator.gt, '<=': operator.le, '>=': operator.ge,
-                  '==': operator.eq, '!=': operator.ne,
-                  'and': operator.and_, 'or': operator.or_,
-                  }[op](leftValue, rightValue)
+        result = binaryOperators[op](leftValue, rightValue)
         return result
     except KeyError:
         sphinxContext.modelXbrl.error("sphinx:error",
@@ -442,9 +575,17 @@ def evaluatePreconditionDeclaration(node, sphinxContext):
 
 def evaluatePreconditionReference(node, sphinxContext):
     preconditionPasses = True
+    preconditionResults = sphinxContext.preconditionResults
     for name in node.names:
         if name in sphinxContext.preconditionNodes:
-            if not evaluate(sphinxContext.preconditionNodes[name], sphinxContext, value=True):
+            # preconditions don't depend on rule bindings, when compiled each is evaluated once per rule base
+            if preconditionResults is not None and name in preconditionResults:
+                result = preconditionResults[name]
+            else:
+                result = evaluate(sphinxContext.preconditionNodes[name], sphinxContext, value=True)
+                if preconditionResults is not None:
+                    preconditionResults[name] = result
+            if not result:
                 preconditionPasses = False
             clearEvaluation(sphinxContext)
             if not preconditionPasses:
@@ -610,9 +751,7 @@ def evaluateUnaryOperation(node, sphinxContext):
     if value is UNBOUND:
         return UNBOUND
     try:
-        result = {'+': operator.pos, '-': operator.neg, 'not': operator.not_,
-                  'values': noop,
-                  }[node.op](value)
+        result = unaryOperators[node.op](value)
         return result
     except KeyError:
         sphinxContext.modelXbrl.error("sphinx:error",
@@ -620,6 +759,10 @@ def evaluateUnaryOperation(node, sphinxContext):
              modelObject=node, op=node.op)
     return None
 
+unaryOperators = {'+': operator.pos, '-': operator.neg, 'not': operator.not_,
+                  'values': noop,
+                  }
+
 def evaluateValuesIteration(node, sphinxContext):
     hsBindings = sphinxContext.hyperspaceBindings
     if hsBindings.aggregationNode is None:
@@ -280,6 +280,8 @@ def compileWith( sourceStr, loc, toks ):
     return astWith(sourceStr, loc, toks[1], toks[2:-1], toks[-1])
 
 class astNode:
+    compiledEvaluation = None # evaluation function resolved by SphinxEvaluator.compileEvaluation
+    
     def __init__(self, sourceStr=None, loc=None):
         self.sphinxFile = sphinxFile
         self.sourceStr = sourceStr
@@ -400,6 +402,8 @@ class astFunctionReference(astNode):
                                                     ", ".join(str(a) for a in self.args))
 
 class astHyperspaceAxis(astNode):
+    constantRestriction = None # restriction values, when folded to constants by compileEvaluation
+    
     def __init__(self, sourceStr, loc, toks):
         STATE_AXIS_NAME_EXPECTED = 0
         STATE_AXIS_NAMED = 1
@@ -495,6 +499,8 @@ class astHyperspaceAxis(astNode):
         return s
         
 class astHyperspaceExpression(astNode):
+    staticAspectAxisTuples = None # (aspect, axis) tuples, when all axis aspects are static and resolved by compileEvaluation
+    
     def __init__(self, sourceStr, loc, toks):
         super(astHyperspaceExpression, self).__init__(sourceStr, loc)
         self.isClosed = False
@@ -506,7 +506,8 @@ def checkForBOMs(modelXbrl, file, mappedUri, filepath):
     if (modelXbrl.modelManager.validateDisclosureSystem and
         modelXbrl.modelManager.disclosureSystem.SBRNL): 
         #must read file in binary and return nothing to not replace standard loading
-        with open(filepath, 'rb') as fb:
+        _file, = modelXbrl.fileSource.file(filepath, binary=True) # may be web cache store content
+        with _file as fb:
             startingBytes = fb.read(8)
             if re.match(b"\\x00\\x00\\xFE\\xFF|\\xFF\\xFE\\x00\\x00|\\x2B\\x2F\\x76\\x38|\\x2B\\x2F\\x76\\x39|\\x2B\\x2F\\x76\\x2B|\\x2B\\x2F\\x76\\x2F|\\xDD\\x73\\x66\\x73|\\xEF\\xBB\\xBF|\\x0E\\xFE\\xFF|\\xFB\\xEE\\x28|\\xFE\\xFF|\\xFF\\xFE",
                         startingBytes):
@@ -372,17 +372,14 @@ def final(val, conceptsUsed):
                                     if filingELR:
                                         break
                                 if filingELR:
-                                    # are there any compatible facts for this sum?
-                                    for totalFact in val.modelXbrl.factsByQname[totalConcept.qname]:
-                                        for itemFact in val.modelXbrl.factsByQname[itemQname]:
-                                            if (totalFact.context is not None and totalFact.context.isEqualTo(itemFact.context) and
-                                                totalFact.unit is not None and totalFact.unit.isEqualTo(itemFact.unit)):
-                                                foundFiledItemCalc = False
-                                                # is there a summation in the filing
-                                                for rel in val.modelXbrl.relationshipSet(XbrlConst.summationItem).fromModelObject(totalConcept):
-                                                    if rel.toModelObject is itemConcept:
-                                                        foundFiledItemCalc = True
-                                                if not foundFiledItemCalc:
+                                    # is there a summation in the filing (independent of the facts)
+                                    foundFiledItemCalc = any(rel.toModelObject is itemConcept
+                                                             for rel in val.modelXbrl.relationshipSet(XbrlConst.summationItem).fromModelObject(totalConcept))
+                                    if not foundFiledItemCalc:
+                                        # are there any compatible facts for this sum?
+                                        for totalFact in val.modelXbrl.factsByQname[totalConcept.qname]:
+                                            if totalFact.context is not None and totalFact.unit is not None:
+                                                for itemFact in val.modelXbrl.factsByQnameContextUnit(itemQname, totalFact.context, totalFact.unit):
                                                     issues.append((filingELR,
                                                                    ugtELR,
                                                                    itemName,
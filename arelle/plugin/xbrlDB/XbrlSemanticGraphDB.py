@@ -21,9 +21,17 @@ to do:
 6) test some filings with text blocks (shred them?)  (30mB - 50mB sized text blocks?)
 7) add mappings to, or any missing relationships, of Charlie's financial model
 
+Vertices and edges of data points, aspect proxies, relationship sets and validation messages
+are sent through a GraphBatch, in parameterized bulk scripts of at most GRAPHBATCHSIZE vertices
+or edges (so script size and round trips grow linearly with the filing), or, when host is
+"graphsonFile" or "graphCsvFile", written with locally assigned ids to bulk load files at the
+database path (a GraphSON file, or -vertices.csv and -edges.csv files), with no server needed.
+When filings of an RSS feed are stored, each filing is written to its own bulk load files (the
+database path suffixed by its accession number), so a rolled back filing discards only its files.
+
 '''
 
-import os, io, re, time, json, socket, logging, zlib
+import os, io, re, time, json, socket, logging, zlib, csv
 from math import isnan, isinf
 from arelle.ModelDtsObject import ModelConcept, ModelResource, ModelRelationship
 from arelle.ModelInstanceObject import ModelFact, ModelInlineFact
@@ -37,12 +45,19 @@ from urllib.error import HTTPError, URLError
 TRACEGREMLINFILE = None
 #TRACEGREMLINFILE = r"c:\temp\rexstertrace.log"  # uncomment to trace SQL on connection (very big file!!!)
 
+GRAPHSONFILE_HOSTNAME = "graphsonFile"
+GRAPHCSVFILE_HOSTNAME = "graphCsvFile"
+GRAPHFILE_HOSTNAMES = (GRAPHSONFILE_HOSTNAME, GRAPHCSVFILE_HOSTNAME)
+
+GRAPHBATCHSIZE = 10000 # vertices or edges per bulk gremlin script or file write
+
 def insertIntoDB(modelXbrl, 
                  user=None, password=None, host=None, port=None, database=None, timeout=None,
-                 product=None, rssItem=None, **kwargs):
-    db = None
+                 product=None, rssItem=None, graphBatchSize=None, **kwargs):
+    xsgdb = None
     try:
-        xsgdb = XbrlSemanticGraphDatabaseConnection(modelXbrl, user, password, host, port, database, timeout)
+        xsgdb = XbrlSemanticGraphDatabaseConnection(modelXbrl, user, password, host, port, database, timeout, product,
+                                                    batchSize=graphBatchSize, rssItem=rssItem)
         xsgdb.verifyGraphs()
         xsgdb.insertXbrl(rssItem=rssItem)
         xsgdb.close()
@@ -55,6 +70,8 @@ def insertIntoDB(modelXbrl,
         raise # reraise original exception with original traceback    
     
 def isDBPort(host, port, timeout=10):
+    if host in GRAPHFILE_HOSTNAMES:
+        return True
     # determine if postgres port
     t = 2
     while t < timeout:
@@ -97,6 +114,13 @@ def dbString(s): # compress long strings
         return ''.join(map(chr,zlib.compress(s.encode()))) # compress as utf-8 but return as string
     return s
 
+def javaStringHashCode(s): # same as java's (and groovy's) String.hashCode(), of utf-16 code units
+    h = 0
+    b = s.encode('utf-16-be')
+    for i in range(0, len(b), 2):
+        h = (31 * h + (b[i] << 8 | b[i+1])) & 0xFFFFFFFF
+    return h - 0x100000000 if h & 0x80000000 else h
+
 class XPDBException(Exception):
     def __init__(self, code, message, **kwargs ):
         self.code = code
@@ -106,30 +130,265 @@ class XPDBException(Exception):
     def __repr__(self):
         return _('[{0}] exception: {1}').format(self.code, self.message % self.kwargs)
             
+class GraphBatch():
+    ''' Adds vertices and edges in bulk payloads of at most batchSize vertices or edges (all in one
+    payload if batchSize is 0), as parameterized gremlin scripts through the connection's execute,
+    or to bulkLoadFile if not None.  Vertex ids are returned as each list of vertices is added
+    (so that edges may refer to them), edges are accumulated and sent when batchSize is reached or
+    on flush. '''
+    def __init__(self, connection, batchSize=GRAPHBATCHSIZE, bulkLoadFile=None):
+        self.connection = connection
+        self.batchSize = batchSize
+        self.bulkLoadFile = bulkLoadFile
+        self.edges = []
+        self.verticesCount = 0
+        self.edgesCount = 0
+        
+    def batches(self, items):
+        if not self.batchSize:
+            yield items
+        else:
+            for i in range(0, len(items), self.batchSize):
+                yield items[i:i+self.batchSize]
+                
+    def addVertices(self, activity, vertices, parentId=None, label=None):
+        ''' adds vertices (property dicts), each with an edge labeled label from parentId if not None,
+        returns list of vertex ids in order of vertices '''
+        if not vertices:
+            return []
+        vertexIds = []
+        for vertexBatch in self.batches(vertices):
+            if self.bulkLoadFile is not None:
+                vertexIds.extend(self.bulkLoadFile.addVertices(vertexBatch, parentId, label))
+            else:
+                vertexIds.extend(int(id)
+                                 for id in self.connection.execute(activity, """
+                    parentV = (parent_id == null ? null : g.v(parent_id))
+                    vertex_ids = []
+                    vertices.each{
+                        v = g.addVertex(it)
+                        vertex_ids << v.id
+                        if (parentV != null) g.addEdge(parentV, v, label)
+                    }
+                    vertex_ids
+                    """, 
+                    params={'parent_id': parentId,
+                            'label': label,
+                            'vertices': vertexBatch}
+                    )["results"])
+        self.verticesCount += len(vertexIds)
+        if parentId is not None:
+            self.edgesCount += len(vertexIds)
+        return vertexIds
+    
+    def addVertex(self, activity, vertex, parentId=None, label=None):
+        return self.addVertices(activity, [vertex], parentId, label)[0]
+    
+    def addVertexGroups(self, activity, groups):
+        ''' adds groups of (vertices, parent, label) in payloads of at most batchSize vertices, so that
+        singleton vertices (such as containers) share a payload with their contents, parent is None,
+        a vertex id, or a (groupIndex, vertexIndex) tuple for a vertex of an earlier group of groups,
+        returns list of vertex id lists in order of groups '''
+        if not any(vertices for vertices, parent, label in groups):
+            return [[] for group in groups]
+        entries = [] # (vertex, parentId, parentEntryIndex, label)
+        groupStarts = []
+        for vertices, parent, label in groups:
+            if isinstance(parent, tuple):
+                parentId, parentEntryIndex = None, groupStarts[parent[0]] + parent[1]
+            else:
+                parentId, parentEntryIndex = parent, None
+            groupStarts.append(len(entries))
+            entries.extend((vertex, parentId, parentEntryIndex, label) for vertex in vertices)
+        vertexIds = []
+        for entryBatch in self.batches(entries):
+            if self.bulkLoadFile is not None:
+                for vertex, parentId, parentEntryIndex, label in entryBatch:
+                    if parentEntryIndex is not None:
+                        parentId = vertexIds[parentEntryIndex]
+                    vertexIds.extend(self.bulkLoadFile.addVertices([vertex], parentId, label))
+            else:
+                batchStart = len(vertexIds)
+                batchEntries = []
+                for vertex, parentId, parentEntryIndex, label in entryBatch:
+                    entry = {'vertex': vertex, 'label': label}
+                    if parentEntryIndex is not None and parentEntryIndex >= batchStart:
+                        entry['parent_index'] = parentEntryIndex - batchStart # added by this payload
+                    elif parentEntryIndex is not None:
+                        entry['parent_id'] = vertexIds[parentEntryIndex]
+                    elif parentId is not None:
+                        entry['parent_id'] = parentId
+                    batchEntries.append(entry)
+                vertexIds.extend(int(id)
+                                 for id in self.connection.execute(activity, """
+                    vertices_added = []
+                    entries.each{
+                        v = g.addVertex(it.vertex)
+                        vertices_added << v
+                        if (it.parent_index != null) {
+                            g.addEdge(vertices_added[it.parent_index], v, it.label)
+                        } else if (it.parent_id != null) {
+                            g.addEdge(g.v(it.parent_id), v, it.label)
+                        }
+                    }
+                    vertices_added.collect{it.id}
+                    """, 
+                    params={'entries': batchEntries}
+                    )["results"])
+        self.verticesCount += len(vertexIds)
+        self.edgesCount += sum(1 for vertex, parentId, parentEntryIndex, label in entries
+                               if parentId is not None or parentEntryIndex is not None)
+        return [vertexIds[groupStart:groupStart + len(groups[i][0])]
+                for i, groupStart in enumerate(groupStarts)]
+    
+    def addEdge(self, fromId, toId, label, properties=None):
+        edge = {'from_id': fromId, 'to_id': toId, 'label': label}
+        if properties:
+            edge['properties'] = properties
+        self.edges.append(edge)
+        if self.batchSize and len(self.edges) >= self.batchSize:
+            self.flush()
+            
+    def flush(self, activity="Insert edges"):
+        if self.edges:
+            edges = self.edges
+            self.edges = []
+            if self.bulkLoadFile is not None:
+                self.bulkLoadFile.addEdges(edges)
+            else:
+                self.connection.execute(activity, """
+                    edges.each{
+                        if (it.properties) {
+                            g.addEdge(g.v(it.from_id), g.v(it.to_id), it.label, it.properties)
+                        } else {
+                            g.addEdge(g.v(it.from_id), g.v(it.to_id), it.label)
+                        }
+                    }
+                    []
+                    """, 
+                    params={'edges': edges})
+            self.edgesCount += len(edges)
+            
+class GraphBulkLoadFile():
+    ''' Writes vertices and edges, with sequentially assigned ids, to a GraphSON file (vertices are
+    written as added and edges spooled to a temporary file which is appended to the vertices on close),
+    or to CSV files of vertices (_id, _class, properties json) and edges (_id, _outV, _inV, _label,
+    properties json), named by adding -vertices.csv and -edges.csv to the file path sans extension.
+    Existing files of the file path are replaced, and removed on close if discarded. '''
+    def __init__(self, filePath, format="graphson"):
+        self.filePath = filePath
+        self.format = format
+        self.lastVertexId = 0
+        self.lastEdgeId = 0
+        if format == "csv":
+            basePath = os.path.splitext(filePath)[0]
+            self.filePaths = (basePath + "-vertices.csv", basePath + "-edges.csv")
+        else:
+            self.filePaths = (filePath, filePath + ".edges.tmp")
+        self.verticesFile = io.open(self.filePaths[0], "w", encoding="utf-8", newline='' if format == "csv" else None)
+        self.edgesFile = io.open(self.filePaths[1], "w+", encoding="utf-8", newline='' if format == "csv" else None)
+        if format == "csv":
+            self.verticesWriter = csv.writer(self.verticesFile)
+            self.edgesWriter = csv.writer(self.edgesFile)
+            self.verticesWriter.writerow(("_id", "_class", "properties"))
+            self.edgesWriter.writerow(("_id", "_outV", "_inV", "_label", "properties"))
+        else:
+            self.verticesFile.write('{"mode":"NORMAL",\n "vertices":[')
+            
+    def writeGraphson(self, file, isFirst, element):
+        file.write('\n  ' if isFirst else ',\n  ')
+        file.write(json.dumps(element, ensure_ascii=False))
+        
+    def addVertices(self, vertices, parentId=None, label=None):
+        vertexIds = []
+        edges = []
+        for vertex in vertices:
+            self.lastVertexId += 1
+            vertexId = self.lastVertexId
+            vertexIds.append(vertexId)
+            if self.format == "csv":
+                self.verticesWriter.writerow((vertexId, vertex.get('_class'), 
+                                              json.dumps(vertex, ensure_ascii=False)))
+            else:
+                element = vertex.copy()
+                element['_id'] = vertexId
+                element['_type'] = 'vertex'
+                self.writeGraphson(self.verticesFile, vertexId == 1, element)
+            if parentId is not None:
+                edges.append({'from_id': parentId, 'to_id': vertexId, 'label': label})
+        if edges:
+            self.addEdges(edges)
+        return vertexIds
+    
+    def addEdges(self, edges):
+        for edge in edges:
+            self.lastEdgeId += 1
+            properties = edge.get('properties') or {}
+            if self.format == "csv":
+                self.edgesWriter.writerow((self.lastEdgeId, edge['from_id'], edge['to_id'], edge['label'],
+                                           json.dumps(properties, ensure_ascii=False)))
+            else:
+                element = properties.copy()
+                element['_id'] = self.lastEdgeId
+                element['_type'] = 'edge'
+                element['_outV'] = edge['from_id']
+                element['_inV'] = edge['to_id']
+                element['_label'] = edge['label']
+                self.writeGraphson(self.edgesFile, self.lastEdgeId == 1, element)
+                
+    def close(self, discard=False):
+        if self.format != "csv" and not discard:
+            self.verticesFile.write('],\n "edges":[')
+            self.edgesFile.seek(0)
+            for line in self.edgesFile:
+                self.verticesFile.write(line)
+            self.verticesFile.write(']\n}\n')
+        self.verticesFile.close()
+        self.edgesFile.close()
+        if discard:
+            for filePath in self.filePaths:
+                os.remove(filePath)
+        elif self.format != "csv":
+            os.remove(self.filePaths[1])
 
 
 class XbrlSemanticGraphDatabaseConnection():
-    def __init__(self, modelXbrl, user, password, host, port, database, timeout, product):
+    def __init__(self, modelXbrl, user, password, host, port, database, timeout, product, batchSize=None, rssItem=None):
         self.modelXbrl = modelXbrl
         self.disclosureSystem = modelXbrl.modelManager.disclosureSystem
         #self.conn = RexProConnection(host, int(port or '8182'), (database or 'emptygraph'),
         #                             user=user, password=password)
-        connectionUrl = "http://{0}:{1}".format(host, port or '8182')
-        self.url = connectionUrl + '/graphs/' + database
-        # Create an OpenerDirector with support for Basic HTTP Authentication...
-        auth_handler = urllib.request.HTTPBasicAuthHandler()
-        if user:
-            auth_handler.add_password(realm='rexster',
-                                      uri=connectionUrl,
-                                      user=user,
-                                      passwd=password)
-        self.conn = urllib.request.build_opener(auth_handler)
-        self.timeout = timeout or 60
+        self.isBulkLoadFile = host in GRAPHFILE_HOSTNAMES
+        self.bulkLoadFile = None
+        if self.isBulkLoadFile:
+            filePath = database
+            if rssItem is not None: # one of multiple filings, each has its own files
+                filingId = getattr(rssItem, "accessionNumber", None) or os.path.splitext(os.path.basename(rssItem.url))[0]
+                filePathBase, filePathExt = os.path.splitext(database)
+                filePath = "{0}-{1}{2}".format(filePathBase, re.sub(r"[^\w.-]", "_", filingId), filePathExt)
+            self.bulkLoadFile = GraphBulkLoadFile(filePath, 
+                                                  "csv" if host == GRAPHCSVFILE_HOSTNAME else "graphson")
+        else:
+            connectionUrl = "http://{0}:{1}".format(host, port or '8182')
+            self.url = connectionUrl + '/graphs/' + database
+            # Create an OpenerDirector with support for Basic HTTP Authentication...
+            auth_handler = urllib.request.HTTPBasicAuthHandler()
+            if user:
+                auth_handler.add_password(realm='rexster',
+                                          uri=connectionUrl,
+                                          user=user,
+                                          passwd=password)
+            self.conn = urllib.request.build_opener(auth_handler)
+            self.timeout = timeout or 60
+        self.graphBatch = GraphBatch(self, GRAPHBATCHSIZE if batchSize is None else batchSize, self.bulkLoadFile)
         self.verticePropTypes = {}
         
     def close(self, rollback=False):
         try:
-            self.conn.close()
+            if self.bulkLoadFile is not None:
+                self.bulkLoadFile.close(discard=rollback)
+            else:
+                self.conn.close()
             self.__dict__.clear() # dereference everything
         except Exception as ex:
             self.__dict__.clear() # dereference everything
@@ -178,13 +437,24 @@ class XbrlSemanticGraphDatabaseConnection():
         return results
     
     def commit(self):
-        self.execute("Commit transaction", "g.commit()")
+        self.graphBatch.flush()
+        if not self.isBulkLoadFile:
+            self.execute("Commit transaction", "g.commit()")
     
     def rollback(self):
-        self.execute("Rollback transaction", "g.rollback()")
+        self.graphBatch.edges = []
+        if not self.isBulkLoadFile:
+            self.execute("Rollback transaction", "g.rollback()")
     
     def loadGraphRootVertices(self):
         self.showStatus("Load/Create graph root vertices")
+        if self.isBulkLoadFile: # new graph, add root vertices
+            rootId = self.graphBatch.addVertex("Create graph root vertices",
+                                               {'_class':'semantic_root', '_rlkey':'semantic_root'})
+            for rootClass in XBRLDBGRAPHS:
+                setattr(self, "root_" + rootClass + "_id", 
+                        self.graphBatch.addVertex("Create graph root vertices", {'_class':rootClass}, rootId, rootClass))
+            return XBRLDBGRAPHS
         # try to create root index
         results = self.execute("Load/Create graph root vertices", """
             def r, v
@@ -266,6 +536,10 @@ class XbrlSemanticGraphDatabaseConnection():
             #finalVcount, finalEcount = self.getDBsize()
             #self.modelXbrl.modelManager.addToLog("added vertices: {0}, edges: {1}, total vertices: {2}, edges: {3}".format(
             #              finalVcount - initialVcount, finalEcount - initialEcount, finalVcount, finalEcount))
+            self.modelXbrl.info("info",
+                                _("Graph DB insertion added %(vertexCount)s vertices and %(edgeCount)s edges"),
+                                modelObject=self.modelXbrl, 
+                                vertexCount=self.graphBatch.verticesCount, edgeCount=self.graphBatch.edgesCount)
             self.showStatus("DB insertion completed", clearAfter=5000)
         except Exception as ex:
             self.showStatus("DB insertion failed due to exception", clearAfter=5000)
@@ -301,25 +575,29 @@ class XbrlSemanticGraphDatabaseConnection():
             new_filing['filing_date'] = datetimeNowStr
             new_filing['entry_url'] = self.modelXbrl.fileSource.url
             new_filing['filing_number'] = filing_number = str(intNow)
-        for id in self.execute("Insert filing " + filingType, """
-            r = g.v(root_filings_id)
-            // check if filing already has a vertex
-            vIt = r.out(new_filing.filing_number)
-            // use prior vertex, or if none, create new vertex for it
-            filing = (vIt.hasNext() ? vIt.next() : g.addVertex(new_filing) )
-            // TBD: modify filing timestamp (last-updated-at, if it already existed)
-            // check if vertex has edge to root_filings vertex
-            vIn = filing.in
-            // if no edge, add one
-            vIn.hasNext() && vIn.next() == r ?: g.addEdge(r, filing, new_filing.filing_number)
-            filing.id
-            """, 
-            params={'root_filings_id': self.root_filings_id,
-                    'new_filing': new_filing,
-                    'filing_type': filingType,
-                    'datetime_now': datetimeNowStr,
-                   })["results"]:
-            self.filing_id = int(id)
+        if self.isBulkLoadFile:
+            self.filing_id = self.graphBatch.addVertex("Insert filing " + filingType, new_filing,
+                                                       self.root_filings_id, filing_number)
+        else:
+            for id in self.execute("Insert filing " + filingType, """
+                r = g.v(root_filings_id)
+                // check if filing already has a vertex
+                vIt = r.out(new_filing.filing_number)
+                // use prior vertex, or if none, create new vertex for it
+                filing = (vIt.hasNext() ? vIt.next() : g.addVertex(new_filing) )
+                // TBD: modify filing timestamp (last-updated-at, if it already existed)
+                // check if vertex has edge to root_filings vertex
+                vIn = filing.in
+                // if no edge, add one
+                vIn.hasNext() && vIn.next() == r ?: g.addEdge(r, filing, new_filing.filing_number)
+                filing.id
+                """, 
+                params={'root_filings_id': self.root_filings_id,
+                        'new_filing': new_filing,
+                        'filing_type': filingType,
+                        'datetime_now': datetimeNowStr,
+                       })["results"]:
+                self.filing_id = int(id)
             
         # relationshipSets are a dts property
         self.relationshipSets = [(arcrole, ELR, linkqname, arcqname)
@@ -336,6 +614,21 @@ class XbrlSemanticGraphDatabaseConnection():
                    'url': modelDocument.uri,
                    'document_type': modelDocument.gettype()}
             documents.append(doc)
+        if self.isBulkLoadFile: # new graph, all documents are new
+            graphBatch = self.graphBatch
+            self.report_id = graphBatch.addVertex("Insert report", {'_class': 'report'}, self.filing_id, 'reports')
+            doc_ids = graphBatch.addVertices("Insert documents", documents)
+            self.document_ids = dict( (doc['url'], doc_ids[i]) for i, doc in enumerate(documents) )
+            self.document_isNew = dict( (doc['url'], True) for doc in documents )
+            entry_url = self.modelXbrl.modelDocument.uri
+            entry_id = self.document_ids[entry_url]
+            graphBatch.addEdge(self.report_id, entry_id, 'entry_point')
+            graphBatch.addEdge(self.report_id, entry_id, 'filed_document')
+            for url, doc_id in self.document_ids.items():
+                graphBatch.addEdge(self.root_documents_id, doc_id, url)
+                if url != entry_url:
+                    graphBatch.addEdge(entry_id, doc_id, 'referenced_document')
+            return
         results = self.execute("Insert documents", """
             results = []
             rDoc = g.v(root_documents_id)
@@ -468,81 +761,46 @@ class XbrlSemanticGraphDatabaseConnection():
                     arcroleTypes = [modelRoleType
                                  for modelRoleTypes in self.modelXbrl.arcroleTypes.values()
                                  for modelRoleType in modelRoleTypes]
+                    # new document, its data dictionary and all of its contents are new vertices
+                    graphBatch = self.graphBatch
+                    document_id = self.document_ids[modelDocument.uri]
                     activity = "Insert data dictionary types, aspects, roles, and arcroles for " + modelDocument.uri
-                    results = self.execute(activity, "//" + activity + """
-                        reportV = g.v(report_id)
-                        docV = g.v(document_id)
-                        // add dictV if it doesn't exist
-                        dictIt = docV.out('doc_data_dictionary')
-                        dictV = (dictIt.hasNext() ? dictIt.next() : g.addVertex(dict) )
-                        // add edge from reportV to dictV if not present
-                        vReportIn = reportV.in('report_data_dictionary').has('id',reportV.id)
-                        vReportIn.hasNext() ?: g.addEdge(reportV, dictV, 'report_data_dictionary')
-                        // add edge from docV to dictV if not present
-                        vDictIn = dictV.in('doc_data_dictionary').has('id',docV.id)
-                        vDictIn.hasNext() ?: g.addEdge(docV, dictV, 'doc_data_dictionary')
-                        type_ids = []
-                        types.each{
-                            typeV = g.addVertex(it)
-                            type_ids << typeV.id
-                            g.addEdge(dictV, typeV, 'data_type')
-                        }
-                        aspectsV = g.addVertex(['_class':'aspects'])
-                        g.addEdge(dictV, aspectsV, 'aspects')
-                        aspect_ids = []
-                        aspects.each{
-                            aspectV = g.addVertex(it)
-                            aspect_ids << aspectV.id
-                            g.addEdge(dictV, aspectV, 'aspect')
-                            g.addEdge(aspectsV, aspectV, it.name.hashCode().toString() )
-                        }
-                        role_type_ids = []
-                        roletypes.each{
-                            roleTypeV = g.addVertex(it)
-                            role_type_ids << roleTypeV.id
-                            g.addEdge(docV, roleTypeV, 'role_type')
-                        }
-                        arcrole_type_ids = []
-                        arcroletypes.each{
-                            arcroleTypeV = g.addVertex(it)
-                            arcrole_type_ids << arcroleTypeV.id
-                            g.addEdge(docV, arcroleTypeV, 'arcrole_type')
-                        }
-                        [dictV.id, type_ids, aspect_ids, role_type_ids, arcrole_type_ids]
-                        """, 
-                        params={
-                        'report_id': self.report_id,
-                        'document_id': self.document_ids[modelDocument.uri],
-                        'dict': {
-                            '_class': 'data_dictionary',
-                            'namespace': modelDocument.targetNamespace},
-                        'types': [{
-                            '_class': 'data_type',
-                            'name': modelType.name
-                              } for modelType in modelTypes],
-                        'aspects': conceptAspects,
-                        'roletypes': [{
-                            '_class': 'role_type',
-                            'uri': modelRoleType.roleURI,
-                            'definition': modelRoleType.definition or ''
-                              } for modelRoleType in roleTypes],
-                        'arcroletypes': [{
-                            '_class': 'arcrole_type',
-                            'uri': modelRoleType.arcroleURI,
-                            'definition': modelRoleType.definition or '',
-                            'cyclesAllowed': modelRoleType.cyclesAllowed
-                              } for modelRoleType in arcroleTypes],
-                        })["results"]
-                    dict_id, type_ids, aspect_ids, role_type_ids, arcrole_type_ids = results
-                    self.dict_id = int(dict_id)
+                    # dictionary and aspects vertices are in the same payloads as their contents
+                    dict_ids, type_ids, aspectsV_ids, aspect_ids, role_type_ids, arcrole_type_ids = graphBatch.addVertexGroups(activity, (
+                        ([{'_class': 'data_dictionary',
+                           'namespace': modelDocument.targetNamespace}], 
+                         document_id, 'doc_data_dictionary'),
+                        ([{'_class': 'data_type',
+                           'name': modelType.name
+                           } for modelType in modelTypes], 
+                         (0, 0), 'data_type'),
+                        ([{'_class':'aspects'}], (0, 0), 'aspects'),
+                        (conceptAspects, (0, 0), 'aspect'),
+                        ([{'_class': 'role_type',
+                           'uri': modelRoleType.roleURI,
+                           'definition': modelRoleType.definition or ''
+                           } for modelRoleType in roleTypes], 
+                         document_id, 'role_type'),
+                        ([{'_class': 'arcrole_type',
+                           'uri': modelRoleType.arcroleURI,
+                           'definition': modelRoleType.definition or '',
+                           'cyclesAllowed': modelRoleType.cyclesAllowed
+                           } for modelRoleType in arcroleTypes], 
+                         document_id, 'arcrole_type')))
+                    self.dict_id = dict_id = dict_ids[0]
+                    aspectsV_id = aspectsV_ids[0]
+                    graphBatch.addEdge(self.report_id, dict_id, 'report_data_dictionary')
+                    for iC, aspect_id in enumerate(aspect_ids):
+                        # edge label is the name's hash, as accessed by existing documents' aspect lookups
+                        graphBatch.addEdge(aspectsV_id, aspect_id, str(javaStringHashCode(conceptAspects[iC]['name'])))
                     for iT, type_id in enumerate(type_ids):
-                        self.type_id[modelTypes[iT].qname] = int(type_id)
+                        self.type_id[modelTypes[iT].qname] = type_id
                     for iC, aspect_id in enumerate(aspect_ids):
-                        self.aspect_id[modelConcepts[iC].qname] = int(aspect_id)
+                        self.aspect_id[modelConcepts[iC].qname] = aspect_id
                     for iRT, roleType_id in enumerate(role_type_ids):
-                        self.roleType_id[roleTypes[iRT].roleURI] = int(roleType_id)
+                        self.roleType_id[roleTypes[iRT].roleURI] = roleType_id
                     for iAT, arcroleType_id in enumerate(arcrole_type_ids):
-                        self.arcroleType_id[arcroleTypes[iAT].arcroleURI] = int(arcroleType_id)
+                        self.arcroleType_id[arcroleTypes[iAT].arcroleURI] = arcroleType_id
                     '''
                     results = self.execute("Insert data dictionary types, and arcroles for " + 
                                            modelDocument.uri, """
@@ -691,7 +949,8 @@ class XbrlSemanticGraphDatabaseConnection():
                     for iC, aspect_id in enumerate(results):
                         self.aspect_id[modelConcepts[iC].qname] = int(aspect_id) if aspect_id is not None else None
                 
-        typeDerivationEdges = []
+        # edges are only from vertices of new documents, which can't yet have any edges
+        graphBatch = self.graphBatch
         for modelType in self.modelXbrl.qnameTypes.values():
             if self.document_isNew[modelType.modelDocument.uri]:
                 qnamesDerivedFrom = modelType.qnameDerivedFrom
@@ -699,49 +958,30 @@ class XbrlSemanticGraphDatabaseConnection():
                     qnamesDerivedFrom = (qnamesDerivedFrom,)
                 for qnameDerivedFrom in qnamesDerivedFrom:
                     if modelType.qname in self.type_id and qnameDerivedFrom in self.type_id:
-                        typeDerivationEdges.append({
-                                'from_id': self.type_id[modelType.qname],
-                                'to_id': self.type_id[qnameDerivedFrom],
-                                'rel': "derived_from"})
-        ### was ### g.addEdge(g.v(it.from_id), g.v(it.to_id), it.rel)
-        self.execute("Insert type derivation edges", """
-            e.each{
-                fromV = g.v(it.from_id)
-                toV = g.v(it.to_id)
-                vOutIt = fromV.out(it.rel).has('id',toV.id)
-                vOutIt.hasNext() ?: g.addEdge(fromV, toV, it.rel)
-            }
-            """, 
-            params={'e': typeDerivationEdges})
-        aspectEdges = []
+                        graphBatch.addEdge(self.type_id[modelType.qname],
+                                           self.type_id[qnameDerivedFrom],
+                                           "derived_from")
+        graphBatch.flush("Insert type derivation edges")
         for modelConcept in self.modelXbrl.qnameConcepts.values():
             if self.document_isNew[modelConcept.modelDocument.uri]:
                 if modelConcept.qname in self.aspect_id:
                     if modelConcept.typeQname in self.type_id:
-                        aspectEdges.append({'from_id': self.aspect_id[modelConcept.qname],
-                                            'to_id': self.type_id[modelConcept.typeQname],
-                                            'rel': "data_type"})
+                        graphBatch.addEdge(self.aspect_id[modelConcept.qname],
+                                           self.type_id[modelConcept.typeQname],
+                                           "data_type")
                     if modelConcept.substitutesForQname in self.type_id:
-                        aspectEdges.append({'from_id': self.aspect_id[modelConcept.qname],
-                                            'to_id': self.type_id[modelConcept.substitutesForQname.typeQname],
-                                            'rel': "substitutes_for"})
+                        graphBatch.addEdge(self.aspect_id[modelConcept.qname],
+                                           self.type_id[modelConcept.substitutesForQname.typeQname],
+                                           "substitutes_for")
                     baseXbrliTypeQnames = modelConcept.baseXbrliTypeQname # may be union or single
                     if not isinstance(baseXbrliTypeQnames, (list,tuple)):
                         baseXbrliTypeQnames = (baseXbrliTypeQnames,) # was single base type
                     for baseXbrliTypeQname in baseXbrliTypeQnames:
                         if baseXbrliTypeQname in self.type_id:
-                            aspectEdges.append({'from_id': self.aspect_id[modelConcept.qname],
-                                                'to_id': self.type_id[baseXbrliTypeQname],
-                                                'rel': "base_xbrli_type"})
-        self.execute("Insert aspect edges for data type, substitutes for, and base xbrli type", """
-            e.each{
-                fromV = g.v(it.from_id)
-                toV = g.v(it.to_id)
-                vOutIt = fromV.out(it.rel).has('id',toV.id)
-                vOutIt.hasNext() ?: g.addEdge(fromV, toV, it.rel)
-            }
-        """, 
-        params={'e': aspectEdges})
+                            graphBatch.addEdge(self.aspect_id[modelConcept.qname],
+                                               self.type_id[baseXbrliTypeQname],
+                                               "base_xbrli_type")
+        graphBatch.flush("Insert aspect edges for data type, substitutes for, and base xbrli type")
         
     '''
     def insertValidCombinations(self):
@@ -770,23 +1010,14 @@ class XbrlSemanticGraphDatabaseConnection():
                         for qname in qnames 
                         if qname not in self.aspect_proxy_id and qname in self.aspect_id]
         #print ("missing qnames: " + ", ".join(str(q) for q in aspectQnames if q not in self.aspect_id))
-        results = self.execute("Insert aspect proxies", """
-            reportV = g.v(report_id)
-            aspectProxyV_ids = []
-            aspect_ids.each{
-                aspectV = g.v(it)
-                aspectProxyV = g.addVertex(['_class':'aspect_proxy'])
-                aspectProxyV_ids << aspectProxyV.id
-                g.addEdge(aspectV, aspectProxyV, 'proxy')
-                g.addEdge(reportV, aspectProxyV, 'report_aspect_proxy')
-            }
-            aspectProxyV_ids
-            """, 
-            params={'report_id': self.report_id,
-                    'aspect_ids': [self.aspect_id[qname] for qname in aspectQnames]}
-            )["results"]
+        graphBatch = self.graphBatch
+        results = graphBatch.addVertices("Insert aspect proxies", 
+                                         [{'_class':'aspect_proxy'} for qname in aspectQnames],
+                                         self.report_id, 'report_aspect_proxy')
         for i, proxy_id in enumerate(results):
             self.aspect_proxy_id[aspectQnames[i]] = proxy_id
+            graphBatch.addEdge(self.aspect_id[aspectQnames[i]], proxy_id, 'proxy')
+        graphBatch.flush("Insert aspect proxy edges")
         
     def periodAspectValue(self, context):
         if context.isForeverPeriod:
@@ -849,43 +1080,34 @@ class XbrlSemanticGraphDatabaseConnection():
                             datapoint['decimals'] = fact.decimals
                     datapoint['value'] = dbString( str(fact.value) ) # compress if very long
                 dataPoints.append(datapoint)
-            results = self.execute("Insert data points", """
-                docV = g.v(document_id)
-                dpIt = docV.out('data_points')
-                datapointsV = (dpIt.hasNext() ? dpIt.next() : g.addVertex(datapoints_set) )
-                dpE = docV.out('data_points').has('id', datapointsV.id)
-                dpE.hasNext() ?: g.addEdge(docV, datapointsV, 'data_points')
-                datapointV_ids = []
-                datapoints.each{
-                    dpV = g.addVertex(it)
-                    datapointV_ids << dpV.id
-                    g.addEdge(datapointsV, dpV, 'data_point')
-                }
-                [datapointsV.id, datapointV_ids]
-                """, 
-                params={'document_id': self.document_ids[instanceDocument.uri],
-                        'datapoints_set': {
-                            '_class': 'datapoints_set'},
-                        'datapoints': dataPoints}
-                )["results"]
-            datapointsV_id, datapointVids_list = results
-            dataPointVertexIds = dict((dataPointObjectIndices[i], int(id))
+            graphBatch = self.graphBatch
+            document_id = self.document_ids[instanceDocument.uri]
+            if self.isBulkLoadFile:
+                datapointsV_id = graphBatch.addVertex("Insert data points set", {'_class': 'datapoints_set'},
+                                                      document_id, 'data_points')
+            else:
+                results = self.execute("Insert data points set", """
+                    docV = g.v(document_id)
+                    dpIt = docV.out('data_points')
+                    datapointsV = (dpIt.hasNext() ? dpIt.next() : g.addVertex(datapoints_set) )
+                    dpE = docV.out('data_points').has('id', datapointsV.id)
+                    dpE.hasNext() ?: g.addEdge(docV, datapointsV, 'data_points')
+                    datapointsV.id
+                    """, 
+                    params={'document_id': document_id,
+                            'datapoints_set': {
+                                '_class': 'datapoints_set'}}
+                    )["results"]
+                datapointsV_id = int(results[0])
+            datapointVids_list = graphBatch.addVertices("Insert data points", dataPoints, datapointsV_id, 'data_point')
+            dataPointVertexIds = dict((dataPointObjectIndices[i], id)
                                       for i, id in enumerate(datapointVids_list))
                     
-            results = self.execute("Insert entity identifiers", """
-                entIdentV_ids = []
-                entityIdentifiers.each{
-                    entIdentV = g.addVertex(it)
-                    entIdentV_ids << entIdentV.id
-                }
-                entIdentV_ids
-                """, 
-                params={'entityIdentifiers': [{'_class':'entity_identifier',
-                                               'scheme': e[0], 
-                                               'identifier': e[1]} 
-                                              for e in entityIdentifiers]}
-                )["results"]
-            entityIdentifierVertexIds = [int(entIdent_id) for entIdent_id in results]
+            entityIdentifierVertexIds = graphBatch.addVertices("Insert entity identifiers", 
+                                                               [{'_class':'entity_identifier',
+                                                                 'scheme': e[0], 
+                                                                 'identifier': e[1]} 
+                                                                for e in entityIdentifiers])
                     
             p = []
             for period in periods:
@@ -899,31 +1121,12 @@ class XbrlSemanticGraphDatabaseConnection():
                     p.append({'_class': 'period',
                               'start_date': period[0], 
                               'end_date': period[1]})
-            results = self.execute("Insert periods", """
-                periodV_ids = []
-                periods.each{
-                    periodV = g.addVertex(it)
-                    periodV_ids << periodV.id
-                }
-                periodV_ids
-                """, 
-                params={'periods': p}
-                )["results"]
-            periodVertexIds = [int(period_id) for period_id in results]
+            periodVertexIds = graphBatch.addVertices("Insert periods", p)
                     
-            results = self.execute("Insert units", """
-                unitV_ids = []
-                units.each{
-                    unitV = g.addVertex(it)
-                    unitV_ids << unitV.id
-                }
-                unitV_ids
-                """, 
-                params={'units': [{'_class':'unit', 
-                                   'measures': u} 
-                                  for u in units]}
-                )["results"]
-            unitVertexIds = [int(unit_id) for unit_id in results]
+            unitVertexIds = graphBatch.addVertices("Insert units", 
+                                                   [{'_class':'unit', 
+                                                     'measures': u} 
+                                                    for u in units])
                     
             if dimensions:
                 self.showStatus("insert aspect value selection groups")
@@ -937,21 +1140,9 @@ class XbrlSemanticGraphDatabaseConnection():
                                            'name': dimQn.localName + '-' + str(len(aspValSels)+1),
                              '             typed_value': value})
                 
-                results = self.execute("Insert aspect value selection groups", """
-                    aspectValSelGroupV = g.addVertex(aspect_val_sel_group)
-                    aspectValSelV_ids = []
-                    aspect_val_sels.each{
-                        aspectValSelV = g.addVertex(it)
-                        aspectValSelV_ids << aspectValSelV.id
-                        g.addEdge(aspectValSelGroupV, aspectValSelV, 'aspect_value_selection_group')
-                    }
-                    [aspectValSelGroupV.id, aspectValSelV_ids]
-                    """, 
-                    params={'aspect_val_sel_group': {'_class': 'aspect_value_selection_group'},
-                            'aspect_val_sels': aspValSels}
-                    )["results"]
-                aspValSelGrpV_id, aspValSelV_ids_list = results
-                aspValSelVertexIds = [int(aspValSel_id) for aspValSel_id in aspValSelV_ids_list]
+                aspValSelGrpV_ids, aspValSelVertexIds = graphBatch.addVertexGroups("Insert aspect value selection groups", (
+                    ([{'_class': 'aspect_value_selection_group'}], None, None),
+                    (aspValSels, (0, 0), 'aspect_value_selection_group')))
 
             else:
                 aspValSelVertexIds = []
@@ -961,33 +1152,19 @@ class XbrlSemanticGraphDatabaseConnection():
         self.showStatus("insert aspect proxies")
         self.insertAspectProxies(aspectQnamesUsed)
 
+        graphBatch = self.graphBatch
         if dimensions:                    
             self.showStatus("insert dimension member edges")
             # connect aspectValueSelection to concept dimension and member concepts   
-            self.execute("Insert dimension member edges", """
-                aspects.each{
-                    g.addEdge(g.v(it.aspValSel_id), g.v(it.dimension_id), 'aspect')
-                }
-                aspect_values.each{
-                    g.addEdge(g.v(it.aspValSel_id), g.v(it.member_id), 'aspect_value')
-                }
-                []
-                """, 
-                params={'aspects': [{
-                            'aspValSel_id': aspValSel_id,
-                            'dimension_id': self.aspect_proxy_id[dimQn]}
-                            for i, aspValSel_id in enumerate(aspValSelVertexIds) 
-                            for dimQn,isExplicit,memQn in dimensions[i:i+1]],
-                        'aspect_values': [{
-                            'aspValSel_id': aspValSel_id,
-                            'member_id': self.aspect_proxy_id[memQn]}
-                            for i, aspValSel_id in enumerate(aspValSelVertexIds) 
-                            for dimQn,isExplicit,memQn in dimensions[i:i+1]
-                            if isExplicit]}
-                )["results"]    
+            for i, aspValSel_id in enumerate(aspValSelVertexIds):
+                dimQn, isExplicit, memQn = dimensions[i]
+                graphBatch.addEdge(aspValSel_id, self.aspect_proxy_id[dimQn], 'aspect')
+                if isExplicit:
+                    graphBatch.addEdge(aspValSel_id, self.aspect_proxy_id[memQn], 'aspect_value')
+            graphBatch.flush("Insert dimension member edges")
         
         # add aspect proxy relationships
-        edges = []
+        self.showStatus("insert aspect relationship edges")
         if self.modelXbrl.modelDocument.type in (Type.INSTANCE, Type.INLINEXBRL):
             # aspect value - aspect relationships
             for aspectProxyId, rel, aspectValueVertexIds in (
@@ -995,90 +1172,53 @@ class XbrlSemanticGraphDatabaseConnection():
                 (self.aspect_proxy_id[XbrlConst.qnXbrliPeriod], 'period_aspects', periodVertexIds),
                 (self.aspect_proxy_id[XbrlConst.qnXbrliUnit], 'unit_aspects', unitVertexIds) ):
                 for aspectValueVertexId in aspectValueVertexIds:
-                    edges.append({'from_id': aspectValueVertexId,
-                                  'to_id': aspectProxyId,
-                                  'rel': rel})
+                    graphBatch.addEdge(aspectValueVertexId, aspectProxyId, rel)
         # fact - aspect relationships
         for i, factObjectIndex in enumerate(dataPointObjectIndices):
             fact =  self.modelXbrl.modelObjects[factObjectIndex]
             dataPoint_id = dataPointVertexIds[factObjectIndex]
             # fact concept aspect
-            edges.append({
-                'from_id': dataPoint_id,
-                'to_id': self.aspect_proxy_id[fact.qname],
-                'rel': "base_item"})
+            graphBatch.addEdge(dataPoint_id, self.aspect_proxy_id[fact.qname], "base_item")
             context = fact.context
             if context is not None:
                 # entityIdentifier aspect
-                edges.append({
-                    'from_id': dataPoint_id,
-                    'to_id': entityIdentifierVertexIds[entityIdentifiers.index(context.entityIdentifier)],
-                    'rel': "entity_identifier"})
+                graphBatch.addEdge(dataPoint_id, 
+                                   entityIdentifierVertexIds[entityIdentifiers.index(context.entityIdentifier)], 
+                                   "entity_identifier")
                 # period aspect
-                edges.append({
-                    'from_id': dataPoint_id,
-                    'to_id': periodVertexIds[periods.index(self.periodAspectValue(context))],
-                    'rel': "period"})
+                graphBatch.addEdge(dataPoint_id, 
+                                   periodVertexIds[periods.index(self.periodAspectValue(context))], 
+                                   "period")
                 # dimension aspectValueSelections
                 for dimVal in context.qnameDims.values():
                     key = (dimVal.dimensionQname, dimVal.isExplicit,
                            dimVal.memberQname if dimVal.isExplicit else dimVal.typedMember.stringValue)
-                    edges.append({
-                        'from_id': dataPoint_id,
-                        'to_id': dimValAspValSelVertexIds[key],
-                        'rel': "aspect_value_selection"})
+                    graphBatch.addEdge(dataPoint_id, dimValAspValSelVertexIds[key], "aspect_value_selection")
             if fact.isNumeric and fact.unit is not None:
                 # unit aspect
                 u = str(fact.unit.measures)  # string for now
-                edges.append({
-                    'from_id': dataPoint_id,
-                    'to_id': unitVertexIds[units.index(u)],
-                    'rel': "_unit"})
+                graphBatch.addEdge(dataPoint_id, unitVertexIds[units.index(u)], "_unit")
             for tupleFact in fact.modelTupleFacts:
                 # edge to tuple from item
-                edges.append({
-                    'from_id': dataPointVertexIds[tupleFact.objectIndex],
-                    'to_id': dataPoint_id,
-                    'rel': "tuple"})
-
-        self.showStatus("insert aspect relationship edges")
-        results = self.execute("Insert aspect relationship edges", """
-            e.each{g.addEdge(g.v(it.from_id), g.v(it.to_id), it.rel)}
-            []
-            """, 
-            params={'e': edges})["results"]
+                graphBatch.addEdge(dataPointVertexIds[tupleFact.objectIndex], dataPoint_id, "tuple")
+        graphBatch.flush("Insert aspect relationship edges")
         
     def insertRelationshipSets(self):
         self.showStatus("insert relationship sets")
-        results = self.execute("Insert relationship sets", """
-            reportV = g.v(report_id)
-            relSetsV = g.addVertex(relSets)
-            g.addEdge(reportV, relSetsV, 'relationship_sets')
-            relSetV_ids = []
-            relSet.each{
-                relSetV = g.addVertex(it)
-                relSetV_ids << relSetV.id
-                g.addEdge(relSetsV, relSetV, 'relationship_set')}
-            [relSetsV.id, relSetV_ids]
-            """, 
-            params={
-                'report_id': self.report_id,
-                'relSets': {
-                    '_class': 'relationship_sets'},
-                'relSet': [{
-                    '_class': 'relationship_set',
-                    'arcrole': arcrole,
-                    'linkrole': linkrole,
-                    'linkdefinition': self.modelXbrl.roleTypeDefinition(linkrole) or '',
-                    'linkname': str(linkqname),
-                    'arcname': str(arcqname)
-                    } for arcrole, linkrole, linkqname, arcqname in self.relationshipSets]
-            })["results"]
-        relSetsV_id, relSetV_ids_list = results
-        relationshipSetIDs = [int(relSet_id) for relSet_id in relSetV_ids_list]
+        graphBatch = self.graphBatch
+        relSetsV_ids, relationshipSetIDs = graphBatch.addVertexGroups("Insert relationship sets", (
+                ([{'_class': 'relationship_sets'}], self.report_id, 'relationship_sets'),
+                ([{'_class': 'relationship_set',
+                   'arcrole': arcrole,
+                   'linkrole': linkrole,
+                   'linkdefinition': self.modelXbrl.roleTypeDefinition(linkrole) or '',
+                   'linkname': str(linkqname),
+                   'arcname': str(arcqname)
+                   } for arcrole, linkrole, linkqname, arcqname in self.relationshipSets],
+                 (0, 0), 'relationship_set')))
         
         # do tree walk to build relationships with depth annotated, no targetRole navigation
-        relE = [] # fromV, toV, label
+        # (relationship edges are sent by graphBatch as each batch fills up)
         resources = set()
         aspectQnamesUsed = set()
         resourceIDs = {} # index by object
@@ -1146,7 +1286,7 @@ class XbrlSemanticGraphDatabaseConnection():
                         if doVertices:
                             thisRelId = 0
                         else:
-                            relE.append({'from_id': sourceId, 'to_id': targetId, 'label': 'rel', 'properties': _relProp})
+                            graphBatch.addEdge(sourceId, targetId, 'rel', _relProp)
                         seq += 1
                         seq = walkTree(targetRelSet.fromModelObject(toModelObject), seq, depth+1, relationshipSet, visited, targetRelationshipSetId, doVertices)
                     visited.remove(rel)
@@ -1161,7 +1301,7 @@ class XbrlSemanticGraphDatabaseConnection():
                 for rootConcept in relationshipSet.rootConcepts:
                     if not doVertices:
                         aspectId = self.aspect_proxy_id[rootConcept.qname]
-                        relE.append({'from_id': relationshipSetId, 'to_id': aspectId, 'label': 'root'})
+                        graphBatch.addEdge(relationshipSetId, aspectId, 'root')
                     seq = walkTree(relationshipSet.fromModelObject(rootConcept), seq, 1, relationshipSet, set(), relationshipSetId, doVertices)
             if doVertices:
                 if resources:
@@ -1174,29 +1314,13 @@ class XbrlSemanticGraphDatabaseConnection():
                             resourceParam['role'] = resource.role
                         resourceV.append(resourceParam)
                         resourceObjs.append(resource) # need these in a list in same order as resoureV
-                    for i, v_id in enumerate(self.execute("Insert relationship set concept-to-resource relationships", """
-                        resourceV_ids = []
-                        resourceV.each{resourceV_ids << g.addVertex(it).id}
-                        resourceV_ids
-                        """, 
-                        params={'resourceV': resourceV}
-                        )["results"]):
-                        resourceIDs[resourceObjs[i]] = int(v_id)
+                    for i, v_id in enumerate(graphBatch.addVertices("Insert relationship set concept-to-resource relationships",
+                                                                    resourceV)):
+                        resourceIDs[resourceObjs[i]] = v_id
                     
                 self.insertAspectProxies(aspectQnamesUsed)
             else:
-                self.execute("Insert relationship edges", """
-                    relE.each{
-                        if (it.properties) {
-                            g.addEdge(g.v(it.from_id), g.v(it.to_id), it.label, it.properties)
-                        } else {
-                            g.addEdge(g.v(it.from_id), g.v(it.to_id), it.label)
-                        }
-                    }
-                    []
-                    """, 
-                    params={'relE': relE}
-                    )["results"]
+                graphBatch.flush("Insert relationship edges")
                 
                 # TBD: do we want to link resources to the report (by role, class, or otherwise?)
                     
@@ -1238,22 +1362,13 @@ class XbrlSemanticGraphDatabaseConnection():
                              'refs': msgRefIds})
         if messages:
             self.showStatus("insert validation messages")
-            results = self.execute("Insert validation messages", """
-                filingV = g.v(filing_id)
-                msgsV = g.addVertex(['_class':'messages'])
-                g.addEdge(filingV, msgsV, 'validation_messages')
-                msgV_ids = []
-                messages.each{
-                    msgV = g.addVertex(it.subMap(['_class','seq','code','level','text']))
-                    msgV_ids << msgV.id
-                    g.addEdge(msgsV, msgV, 'message')
-                    it['refs'].each{
-                        g.addEdge(msgV, g.v(it), 'message_ref')
-                    }}
-                msgV_ids
-                """, 
-                params={
-                    'filing_id': self.filing_id,
-                    'messages': messages
-                })["results"]
-            relationshipSetIDs = [int(msg_id) for msg_id in results]
+            graphBatch = self.graphBatch
+            msgsV_ids, msgV_ids = graphBatch.addVertexGroups("Insert validation messages", (
+                ([{'_class':'messages'}], self.filing_id, 'validation_messages'),
+                ([dict((k, msg[k]) for k in ('_class','seq','code','level','text'))
+                  for msg in messages],
+                 (0, 0), 'message')))
+            for i, msgV_id in enumerate(msgV_ids):
+                for ref_id in messages[i]['refs']:
+                    graphBatch.addEdge(msgV_id, ref_id, 'message_ref')
+            graphBatch.flush("Insert validation message references")
@@ -5,6 +5,15 @@ representation of XBRL information.
 
 This module may save directly to a JSON Server (TBD) or to append to a file of JSON.
 
+When host is "jsonLinesFile", records (filing, report, documents, data types, aspects,
+role types, aspect proxies, data points, relationship sets, relationships, resources and
+messages) are instead streamed as they are produced, one JSON object per line with its
+"@type" and "@id", in chunks of JSONLINESCHUNKSIZE lines, without holding the filing's
+whole JSON tree in memory.  References between records are by id (such as the document,
+report or relSetId of a record and the dataPoints and aspectProxies of a message).
+The lines are spooled to a temporary file which is appended to the JSON Lines file on
+commit (and discarded on rollback), so a failed insertion leaves no partial records.
+
 This module provides the execution context for saving a dts and instances in 
 XBRL JSON graph.  It may be loaded by Arelle's RSS feed, or by individual
 DTS and instances opened by interactive or command line/web service mode.
@@ -12,9 +21,10 @@ DTS and instances opened by interactive or command line/web service mode.
 Example dialog or command line parameters for operation:
 
     host:  the supporting host for JSON Server or "jsonFile" to append to a JSON file
+           (or "jsonLinesFile" to append JSON Lines records)
     port:  the host port (80 is default) if a JSON Server
     user, password:  if needed for server
-    database:  the top level path segment for the JSON Server or disk file path if jsonFile
+    database:  the top level path segment for the JSON Server or disk file path if jsonFile or jsonLinesFile
     timeout: 
     
 
@@ -35,7 +45,7 @@ to do:
 
 '''
 
-import os, io, time, json, socket, logging, zlib, datetime
+import os, io, time, json, socket, logging, zlib, datetime, shutil, tempfile
 from arelle.ModelDtsObject import ModelConcept, ModelResource, ModelRelationship
 from arelle.ModelInstanceObject import ModelFact
 from arelle.ModelDocument import Type
@@ -50,13 +60,17 @@ TRACEJSONFILE = None
 #TRACEJSONFILE = r"c:\temp\jsonDBtrace.log"  # uncomment to trace JSON on connection (very big file!!!)
 
 JSONFILE_HOSTNAME = "jsonFile"
+JSONLINESFILE_HOSTNAME = "jsonLinesFile"
+
+JSONLINESCHUNKSIZE = 10000 # streamed records per file write (0 to write all at end)
 
 def insertIntoDB(modelXbrl, 
                  user=None, password=None, host=None, port=None, database=None, timeout=None,
-                 product=None, rssItem=None, **kwargs):
+                 product=None, rssItem=None, jsonLinesChunkSize=None, **kwargs):
     jsondb = None
     try:
-        jsondb = XbrlSemanticJsonDatabaseConnection(modelXbrl, user, password, host, port, database, timeout)
+        jsondb = XbrlSemanticJsonDatabaseConnection(modelXbrl, user, password, host, port, database, timeout,
+                                                    chunkSize=jsonLinesChunkSize)
         jsondb.insertXbrl(rssItem=rssItem)
         jsondb.close()
     except Exception as ex:
@@ -68,7 +82,7 @@ def insertIntoDB(modelXbrl,
         raise # reraise original exception with original traceback    
     
 def isDBPort(host, port, db, timeout=10):
-    if host == JSONFILE_HOSTNAME:
+    if host in (JSONFILE_HOSTNAME, JSONLINESFILE_HOSTNAME):
         return True
     # determine if postgres port
     t = 2
@@ -132,15 +146,53 @@ def jsonDefaultEncoder(obj):
         return XmlUtil.dateunionValue(obj)
     raise TypeError("Type {} is not supported for json output".format(type(obj).__name__))
 
+class JsonLinesWriter():
+    ''' Serializes each record, with its @type and @id, as a line of JSON when it is written, passing
+    lines to sink in chunks of chunkSize records (all at flush if chunkSize is 0). '''
+    def __init__(self, sink, chunkSize=JSONLINESCHUNKSIZE):
+        self.sink = sink
+        self.chunkSize = chunkSize
+        self.lines = []
+        self.recordsCount = 0
+        
+    def __len__(self):
+        return self.recordsCount
+        
+    def write(self, recordType, recordId, record):
+        record['@type'] = recordType
+        record['@id'] = recordId
+        self.lines.append(json.dumps(record,
+                                     sort_keys=True,  # allow comparability of json files
+                                     ensure_ascii=False, 
+                                     default=jsonDefaultEncoder))
+        self.lines.append('\n')
+        self.recordsCount += 1
+        if self.chunkSize and len(self.lines) >= 2 * self.chunkSize:
+            self.flush()
+            
+    def flush(self):
+        if self.lines:
+            data = ''.join(self.lines)
+            del self.lines[:]
+            self.sink(data)
+
 class XbrlSemanticJsonDatabaseConnection():
-    def __init__(self, modelXbrl, user, password, host, port, database, timeout):
+    def __init__(self, modelXbrl, user, password, host, port, database, timeout, chunkSize=None):
         self.modelXbrl = modelXbrl
         self.disclosureSystem = modelXbrl.modelManager.disclosureSystem
         #self.conn = RexProConnection(host, int(port or '8182'), (database or 'emptygraph'),
         #                             user=user, password=password)
-        self.isJsonFile = host == JSONFILE_HOSTNAME
+        self.isJsonFile = host in (JSONFILE_HOSTNAME, JSONLINESFILE_HOSTNAME)
+        self.jsonLines = None
+        self.jsonLinesSpoolFile = None
+        self.pendingAspectProxies = []
         if self.isJsonFile:
             self.jsonFile = database
+            if host == JSONLINESFILE_HOSTNAME:
+                # spooled until commit, the temporary file is removed when closed
+                self.jsonLinesSpoolFile = tempfile.TemporaryFile(mode='w+t', encoding='utf-8')
+                self.jsonLines = JsonLinesWriter(self.jsonLinesSpoolFile.write,
+                                                 JSONLINESCHUNKSIZE if chunkSize is None else chunkSize)
         else:
             connectionUrl = "http://{0}:{1}".format(host, port or '80')
             self.url = connectionUrl + '/' + database
@@ -157,6 +209,8 @@ class XbrlSemanticJsonDatabaseConnection():
         
     def close(self, rollback=False):
         try:
+            if self.jsonLinesSpoolFile is not None: # uncommitted records are discarded
+                self.jsonLinesSpoolFile.close()
             if not self.isJsonFile:
                 self.conn.close()
             self.__dict__.clear() # dereference everything
@@ -227,7 +281,15 @@ class XbrlSemanticJsonDatabaseConnection():
         return results
     
     def commit(self, graph):
-        self.execute("Saving RDF Graph", graph=graph)
+        if self.jsonLines is not None: # records were streamed as produced
+            self.jsonLines.flush()
+            self.jsonLinesSpoolFile.seek(0)
+            with io.open(self.jsonFile, 'at', encoding='utf-8') as fh:
+                shutil.copyfileobj(self.jsonLinesSpoolFile, fh)
+            self.jsonLinesSpoolFile.close()
+            self.jsonLinesSpoolFile = None
+        else:
+            self.execute("Saving RDF Graph", graph=graph)
     
     def loadGraphRootVertices(self):
         self.showStatus("Load/Create graph root vertices")
@@ -386,6 +448,15 @@ class XbrlSemanticJsonDatabaseConnection():
             self.filing['documents'].append(docUri)
             if modelDocument.uri == self.modelXbrl.modelDocument.uri: # entry document
                 self.report['entryPoint'] = docUri
+        jsonLines = self.jsonLines
+        if jsonLines is not None:
+            jsonLines.write("filing", self.filingURI, 
+                            dict((k,v) for k,v in self.filing.items() if k != 'reports'))
+            jsonLines.write("report", self.reportURI, 
+                            dict((k,v) for k,v in self.report.items() if not isinstance(v, dict)))
+            for docUri, document in documents.items():
+                jsonLines.write("document", docUri, 
+                                dict((k,v) for k,v in document.items() if k != 'resources'))
                 
     def conceptsUsed(self):
         conceptsUsed = set(f.qname for f in self.modelXbrl.factsInInstance)
@@ -450,8 +521,11 @@ class XbrlSemanticJsonDatabaseConnection():
                                  if modelConcept.modelDocument is modelDocument and
                                     (isNewDocument or modelConcept in conceptsUsed)]
                 if docUri not in self.existingDocumentUris:
-                    # adding document as new
-                    document['dataTypes'] = dataTypes = {}
+                    # adding document as new (streamed records aren't kept in the document)
+                    jsonLines = self.jsonLines
+                    dataTypes = {}
+                    if jsonLines is None:
+                        document['dataTypes'] = dataTypes
                     for modelType in self.modelXbrl.qnameTypes.values():
                         if modelType.modelDocument is modelDocument:
                             dataTypes[modelType.name] = dataType = {
@@ -481,7 +555,11 @@ class XbrlSemanticJsonDatabaseConnection():
                                 propertyValue = getattr(modelType, prop, None)
                                 if propertyValue:
                                     dataType[prop] = propertyValue
-                    document['aspects'] = aspects = {}
+                            if jsonLines is not None:
+                                jsonLines.write("dataType", dataType['url'], dataTypes.pop(modelType.name))
+                    aspects = {}
+                    if jsonLines is None:
+                        document['aspects'] = aspects
                     for modelConcept in modelConcepts:
                         aspects[modelConcept.name] = aspect = {
                             'document': modelObjectDocumentUri(modelConcept),
@@ -511,7 +589,11 @@ class XbrlSemanticJsonDatabaseConnection():
                         substitutionGroup = modelConcept.substitutionGroup
                         if substitutionGroup is not None:
                             aspect['substitutionGroup'] = modelObjectNameUri(substitutionGroup)
-                    document['roleTypes'] = roleTypes = {}
+                        if jsonLines is not None:
+                            jsonLines.write("aspect", aspect['url'], aspects.pop(modelConcept.name))
+                    roleTypes = {}
+                    if jsonLines is None:
+                        document['roleTypes'] = roleTypes
                     for modelRoleTypes in self.modelXbrl.roleTypes.values():
                         for modelRoleType in modelRoleTypes:
                             roleTypes[modelRoleType.roleURI] = roleType = {
@@ -522,7 +604,11 @@ class XbrlSemanticJsonDatabaseConnection():
                                 'usedOn': [modelObjectUri(self.modelXbrl.qnameConcepts[qn]) 
                                            for qn in modelRoleType.usedOns]
                                 }
-                    document['arcroleTypes'] = arcroleTypes = {}
+                            if jsonLines is not None:
+                                jsonLines.write("roleType", roleType['url'], roleTypes.pop(modelRoleType.roleURI))
+                    arcroleTypes = {}
+                    if jsonLines is None:
+                        document['arcroleTypes'] = arcroleTypes
                     for modelArcroleTypes in self.modelXbrl.arcroleTypes.values():
                         for modelArcroleType in modelArcroleTypes:
                             arcroleTypes[modelRoleType.roleURI] = arcroleType = {
@@ -534,6 +620,8 @@ class XbrlSemanticJsonDatabaseConnection():
                                            for qn in modelArcroleType.usedOns],
                                 'cyclesAllowed': modelArcroleType.cyclesAllowed
                                 }
+                            if jsonLines is not None:
+                                jsonLines.write("arcroleType", arcroleType['url'], arcroleTypes.pop(modelRoleType.roleURI))
 
                     activity = "Insert data dictionary types, aspects, roles, and arcroles for " + modelDocument.uri
 
@@ -569,15 +657,25 @@ class XbrlSemanticJsonDatabaseConnection():
             
     def insertAspectProxy(self, aspectQName, aspectProxyUri):
         concept = self.modelXbrl.qnameConcepts[aspectQName]
-        self.report['aspectProxies'][aspectProxyUri] = aspectProxy = {
+        aspectProxy = {
             'report': self.reportURI,
             'document': modelObjectDocumentUri(concept),
             'name': concept.name
             }
+        if self.jsonLines is not None: # caller may still add properties, stream by writeAspectProxies
+            self.pendingAspectProxies.append((aspectProxyUri, aspectProxy))
+        else:
+            self.report['aspectProxies'][aspectProxyUri] = aspectProxy
         self.aspect_proxy[aspectQName] = aspectProxy
         self.aspect_proxy_uri[aspectQName] = aspectProxyUri
         return aspectProxy
     
+    def writeAspectProxies(self):
+        # stream aspect proxies inserted since prior call (when writing json lines)
+        for aspectProxyUri, aspectProxy in self.pendingAspectProxies:
+            self.jsonLines.write("aspectProxy", aspectProxyUri, aspectProxy)
+        del self.pendingAspectProxies[:]
+    
     def aspectQnameProxy(self, qname):
         if hasattr(qname, "modelDocument"):
             return self.aspect_proxy.get(qname.qname)
@@ -606,16 +704,29 @@ class XbrlSemanticJsonDatabaseConnection():
             periodProxies = {}
             entityIdentifierAspectProxies = {}
             dataPoints = self.report['dataPoints']
+            jsonLines = self.jsonLines
+            # pre-encoded strings used for each fact
+            documentUris = {} # by modelDocument
+            identifierPrefixName = qnamePrefix_Name(XbrlConst.qnXbrliIdentifier)
+            periodPrefixName = qnamePrefix_Name(XbrlConst.qnXbrliPeriod)
+            unitPrefixName = qnamePrefix_Name(XbrlConst.qnXbrliUnit)
             for fact in self.modelXbrl.factsInInstance:
                 self.insertAspectProxies( (fact.qname,) )
                 factId = XmlUtil.elementFragmentIdentifier(fact)
-                dataPoints[factId] = dataPoint = {
-                    'document': modelObjectDocumentUri(fact),
+                factDocument = fact.modelDocument
+                try:
+                    documentUri = documentUris[factDocument]
+                except KeyError:
+                    documentUri = documentUris[factDocument] = modelObjectDocumentUri(fact)
+                dataPoint = {
+                    'document': documentUri,
                     'id': factId,
                     'sourceLine': fact.sourceline,
-                    'dataPointUrl': modelObjectUri(fact),
+                    'dataPointUrl': '#'.join((documentUri, factId)),
                     'baseItem': self.aspectQnameProxyId(fact.qname)
                     }
+                if jsonLines is None:
+                    dataPoints[factId] = dataPoint
                 
                 context = fact.context
                 concept = fact.concept
@@ -623,7 +734,7 @@ class XbrlSemanticJsonDatabaseConnection():
                     if context.entityIdentifier not in entityIdentifierAspectProxies:
                         entityScheme, entityIdentifier = context.entityIdentifier
                         entityIdentifierAspectProxy = "{}/{}".format(
-                                                  qnamePrefix_Name(XbrlConst.qnXbrliIdentifier),
+                                                  identifierPrefixName,
                                                   entityIdentifier)
                         e = self.insertAspectProxy(XbrlConst.qnXbrliIdentifier, entityIdentifierAspectProxy)
                         e['scheme'] = entityScheme
@@ -644,7 +755,7 @@ class XbrlSemanticJsonDatabaseConnection():
                         period = "duration/{}/{}".format(startDate, endDate)
                     if period not in periodProxies:
                         periodProxy = "{}/{}".format(
-                                                  qnamePrefix_Name(XbrlConst.qnXbrliPeriod),
+                                                  periodPrefixName,
                                                   period)
                         p = self.insertAspectProxy(XbrlConst.qnXbrliPeriod, periodProxy)
                         p['isForever'] = context.isForeverPeriod
@@ -699,7 +810,7 @@ class XbrlSemanticJsonDatabaseConnection():
                         if fact.unit is not None:
                             unit = fact.unit
                             unitProxy = "{}/{}".format(
-                                                      qnamePrefix_Name(XbrlConst.qnXbrliUnit),
+                                                      unitPrefixName,
                                                       unit.id)
                             dataPoint['unit'] = unitProxy
                             if unit.id not in unitIDs:
@@ -725,6 +836,9 @@ class XbrlSemanticJsonDatabaseConnection():
                     if fact.modelTupleFacts:
                         dataPoint['tuple'] = [XmlUtil.elementFragmentIdentifier(tupleFact)
                                               for tupleFact in fact.modelTupleFacts]
+                if jsonLines is not None:
+                    self.writeAspectProxies()
+                    jsonLines.write("dataPoint", dataPoint['dataPointUrl'], dataPoint)
 
         
     def resourceId(self,i):
@@ -741,6 +855,9 @@ class XbrlSemanticJsonDatabaseConnection():
             if arcqname:
                 aspectQnamesUsed.add(arcqname)
         self.insertAspectProxies(aspectQnamesUsed)
+        jsonLines = self.jsonLines
+        if jsonLines is not None:
+            self.writeAspectProxies()
         
         relationshipSets = self.report['relationshipSets']
         relSetIds = {}
@@ -761,6 +878,9 @@ class XbrlSemanticJsonDatabaseConnection():
                     'roots': [],
                     'relationships': []
                     }
+                if jsonLines is not None: # roots are the depth 1 relationship records
+                    jsonLines.write("relationshipSet", relSetId, 
+                                    dict((k,v) for k,v in relationshipSet.items() if not isinstance(v, list)))
         
         # do tree walk to build relationships with depth annotated, no targetRole navigation
         relE = [] # fromV, toV, label
@@ -851,7 +971,13 @@ class XbrlSemanticJsonDatabaseConnection():
                             _relProp['relId'] = relId
                             _relProp['relSetKey'] = relationshipSetKey
 
-                            relE.append(_relProp)
+                            if jsonLines is not None: # stream while walking
+                                jsonLines.write("relationship", relId,
+                                                dict((k,v)
+                                                     for k,v in _relProp.items()
+                                                     if k not in ('relId', 'relSetKey', 'fromQname')))
+                            else:
+                                relE.append(_relProp)
                         seq += 1
                         seq = walkTree(targetRelSet.fromModelObject(toModelObject), relId, seq, depth+1, targetRelSetKey, targetRelSet, visited, targetRelSetId, doVertices)
                     visited.remove(rel)
@@ -878,10 +1004,16 @@ class XbrlSemanticJsonDatabaseConnection():
                             r['language'] = resource.xmlLang
                         if resource.role:
                             r['role'] = resource.role
-                        self.documents[modelObjectDocumentUri(resource)]['resources'][
-                                        XmlUtil.elementFragmentIdentifier(resource)] = r
+                        if jsonLines is not None:
+                            r['document'] = modelObjectDocumentUri(resource)
+                            jsonLines.write("resource", resourceUri, r)
+                        else:
+                            self.documents[modelObjectDocumentUri(resource)]['resources'][
+                                            XmlUtil.elementFragmentIdentifier(resource)] = r
                     
                 self.insertAspectProxies(aspectQnamesUsed)
+                if jsonLines is not None:
+                    self.writeAspectProxies()
             else:
                 for j, rel in enumerate(relE):
                     relId = rel['relId']
@@ -914,15 +1046,18 @@ class XbrlSemanticJsonDatabaseConnection():
         
         messages = []
         messageRefs = [] # direct link to objects
+        jsonLines = self.jsonLines
         for i, logEntry in enumerate(logEntries):
             messageId = "message/{}".format(i+1)
-            self.report['messages'][messageId] = m = {
+            m = {
                 'code': logEntry['code'],
                 'level': logEntry['level'],
                 'value': logEntry['message']['text'],
                 'report': self.reportURI,
                 'messageId': messageId
                 }
+            if jsonLines is None:
+                self.report['messages'][messageId] = m
             # capture message ref's
             for ref in logEntry['refs']:
                 modelObject = self.modelXbrl.modelObject(ref.get('objectId',''))
@@ -930,12 +1065,19 @@ class XbrlSemanticJsonDatabaseConnection():
                 aspectObj = None
                 if isinstance(modelObject, ModelFact):
                     factId = XmlUtil.elementFragmentIdentifier(modelObject)
-                    dataPoint = self.report['dataPoints'][factId]
-                    dataPoint.setdefault('messages', []).append(messageId)
+                    if jsonLines is not None: # data point was already streamed, reference it from message
+                        m.setdefault('dataPoints', []).append(modelObjectUri(modelObject))
+                    else:
+                        dataPoint = self.report['dataPoints'][factId]
+                        dataPoint.setdefault('messages', []).append(messageId)
                 elif isinstance(modelObject, ModelConcept):
                     # be sure there's a proxy
                     self.insertAspectProxies( (modelObject.qname,))  # need imediate use of proxy
-                    self.aspectQnameProxy(modelObject.qname).setdefault('messages', []).append(messageId)
+                    if jsonLines is not None:
+                        self.writeAspectProxies()
+                        m.setdefault('aspectProxies', []).append(self.aspectQnameProxyId(modelObject.qname))
+                    else:
+                        self.aspectQnameProxy(modelObject.qname).setdefault('messages', []).append(messageId)
                 elif isinstance(modelObject, ModelRelationship):
                     ''' TBD
                     sourceId = qnamePrefix_Name(modelObject.fromModelObject.qname)
@@ -955,6 +1097,8 @@ class XbrlSemanticJsonDatabaseConnection():
                     '''
                 else:
                     continue
+            if jsonLines is not None:
+                jsonLines.write("message", messageId, m)
                         
         if messages:
             self.showStatus("insert validation messages")
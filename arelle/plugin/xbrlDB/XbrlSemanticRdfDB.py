@@ -6,6 +6,13 @@ representation of XBRL information.
 This module may save directly to a NanoSparqlServer or to append to a file of RDF Turtle.
 See http://sourceforge.net/apps/mediawiki/bigdata/index.php?title=NanoSparqlServer
 
+Except for RDF/XML files (which are serialized from a complete rdflib graph), triples are
+streamed as they are produced, N-Triples statements (which are also Turtle) being spooled
+in chunks of RDFCHUNKSIZE triples to a temporary file, so that memory stays bounded for 
+filings with millions of triples.  On commit the chunks are appended to the file or sent
+as SPARQL update requests to the server; an insertion that fails leaves no partial output.
+(A server failing during the commit's requests may still have stored the prior chunks.)
+
 This module provides the execution context for saving a dts and instances in 
 XBRL RDF graph.  It may be loaded by Arelle's RSS feed, or by individual
 DTS and instances opened by interactive or command line/web service mode.
@@ -13,9 +20,10 @@ DTS and instances opened by interactive or command line/web service mode.
 Example dialog or command line parameters for operation:
 
     host:  the supporting host for NanoSparqlServer or "rdfTurtleFile" to append to a turtle file
+           ("rdfNTriplesFile", "rdfNQuadsFile" or "rdfXmlFile" for those serializations)
     port:  the host port (80 is default) if a NanoSparqlServer
     user, password:  if needed for server
-    database:  the top level path segment for the NanoSparqlServer or disk file path if rdfTurtleFile
+    database:  the top level path segment for the NanoSparqlServer or disk file path if an rdf file
     timeout: 
     
 
@@ -40,7 +48,7 @@ rdflib pass
 
 '''
 
-import os, io, time, json, socket, logging, zlib, datetime
+import os, io, re, time, json, socket, logging, zlib, datetime, tempfile
 from arelle.ModelDtsObject import ModelConcept, ModelResource, ModelRelationship
 from arelle.ModelInstanceObject import ModelFact
 from arelle.ModelDocument import Type
@@ -54,13 +62,19 @@ TRACERDFFILE = None
 
 RDFTURTLEFILE_HOSTNAME = "rdfTurtleFile"
 RDFXMLFILE_HOSTNAME = "rdfXmlFile"
+RDFNTRIPLESFILE_HOSTNAME = "rdfNTriplesFile"
+RDFNQUADSFILE_HOSTNAME = "rdfNQuadsFile"
+RDFFILE_HOSTNAMES = (RDFTURTLEFILE_HOSTNAME, RDFXMLFILE_HOSTNAME, RDFNTRIPLESFILE_HOSTNAME, RDFNQUADSFILE_HOSTNAME)
+
+RDFCHUNKSIZE = 100000 # streamed triples per file write or SPARQL update request (0 for a single request)
 
 def insertIntoDB(modelXbrl, 
                  user=None, password=None, host=None, port=None, database=None, timeout=None,
-                 product=None, rssItem=None, **kwargs):
+                 product=None, rssItem=None, rdfChunkSize=None, **kwargs):
     rdfdb = None
     try:
-        rdfdb = XbrlSemanticRdfDatabaseConnection(modelXbrl, user, password, host, port, database, timeout)
+        rdfdb = XbrlSemanticRdfDatabaseConnection(modelXbrl, user, password, host, port, database, timeout,
+                                                  chunkSize=rdfChunkSize)
         rdfdb.insertXbrl(rssItem=rssItem)
         rdfdb.close()
     except Exception as ex:
@@ -72,7 +86,7 @@ def insertIntoDB(modelXbrl,
         raise # reraise original exception with original traceback    
     
 def isDBPort(host, port, db, timeout=10):
-    if host in (RDFTURTLEFILE_HOSTNAME, RDFXMLFILE_HOSTNAME):
+    if host in RDFFILE_HOSTNAMES:
         return True
     # determine if postgres port
     t = 2
@@ -161,6 +175,79 @@ def qnamePrefix_Name(qname, sep='_'):
 def modelObjectQnameUri(modelObject, sep='#'):
     return qnameUri(modelObject.qname, sep)
 
+def ntTerm(term):
+    # N-Triples form of term (rdflib's n3() uses long quoted strings for multi-line literals)
+    if isinstance(term, Literal):
+        s = '"{0}"'.format(str(term).replace('\\', '\\\\').replace('"', '\\"')
+                                     .replace('\n', '\\n').replace('\r', '\\r'))
+        if term.language:
+            return s + '@' + term.language
+        elif term.datatype:
+            return s + '^^<' + term.datatype + '>'
+        return s
+    return term.n3()
+
+TURTLE_PREFIX_PATTERN = re.compile(r"^[A-Za-z]([\w.-]*[\w-])?$")
+
+class RdfStreamWriter():
+    ''' Stands in for an rdflib graph, serializing triples as they are added into a temporary file,
+    in chunks of chunkSize triples (all in one chunk if chunkSize is 0), which commit passes to sink
+    as utf-8 bytes, and close discards.  Output is N-Triples, N-Quads (in graph graphName) or Turtle
+    (N-Triples statements after @prefix directives).
+    Unlike a graph, duplicate triples are not eliminated, which is harmless to RDF stores. '''
+    def __init__(self, format="turtle", chunkSize=RDFCHUNKSIZE, graphName=None):
+        self.spoolFile = tempfile.TemporaryFile()
+        self.chunkLengths = []
+        self.format = format
+        self.chunkSize = chunkSize
+        if format == "nquads":
+            self.statementEnd = " {0} .\n".format(ntTerm(graphName))
+        else:
+            self.statementEnd = " .\n"
+        self.prefixes = {}
+        self.lines = []
+        self.linesTriples = 0
+        self.triplesCount = 0
+        
+    def __len__(self):
+        return self.triplesCount
+        
+    def bind(self, prefix, namespace):
+        # terms are written as full IRIs, prefixes only make turtle output more readable
+        if (self.format == "turtle" and self.prefixes.get(prefix) != namespace and
+            TURTLE_PREFIX_PATTERN.match(prefix)):
+            self.prefixes[prefix] = namespace
+            self.lines.append("@prefix {0}: <{1}> .\n".format(prefix, namespace))
+            
+    def add(self, triple):
+        s, p, o = triple
+        self.lines.append(' '.join((ntTerm(s), ntTerm(p), ntTerm(o))) + self.statementEnd)
+        self.linesTriples += 1
+        self.triplesCount += 1
+        if self.chunkSize and self.linesTriples >= self.chunkSize:
+            self.flush()
+            
+    def flush(self):
+        # spool the pending lines as a chunk
+        if self.lines:
+            data = ''.join(self.lines).encode('utf-8')
+            del self.lines[:]
+            self.linesTriples = 0
+            self.spoolFile.write(data)
+            self.chunkLengths.append(len(data))
+            
+    def commit(self, sink):
+        self.flush() # remaining triples
+        self.spoolFile.seek(0)
+        for chunkLength in self.chunkLengths:
+            sink(self.spoolFile.read(chunkLength))
+        self.close()
+        
+    def close(self):
+        if self.spoolFile is not None:
+            self.spoolFile.close() # temporary file is removed on closing
+            self.spoolFile = None
+
 class XRDBException(Exception):
     def __init__(self, code, message, **kwargs ):
         self.code = code
@@ -173,7 +260,7 @@ class XRDBException(Exception):
 
 
 class XbrlSemanticRdfDatabaseConnection():
-    def __init__(self, modelXbrl, user, password, host, port, database, timeout):
+    def __init__(self, modelXbrl, user, password, host, port, database, timeout, chunkSize=None):
         try:
             initRdflibNamespaces()
         except ImportError:
@@ -185,7 +272,13 @@ class XbrlSemanticRdfDatabaseConnection():
         #                             user=user, password=password)
         self.isRdfTurtleFile = host == RDFTURTLEFILE_HOSTNAME
         self.isRdfXmlFile = host == RDFXMLFILE_HOSTNAME
-        if self.isRdfTurtleFile or self.isRdfXmlFile:
+        self.isRdfFile = host in RDFFILE_HOSTNAMES
+        self.rdfFormat = {RDFNTRIPLESFILE_HOSTNAME: "nt",
+                          RDFNQUADSFILE_HOSTNAME: "nquads",
+                          RDFXMLFILE_HOSTNAME: "pretty-xml"}.get(host, "turtle")
+        self.chunkSize = RDFCHUNKSIZE if chunkSize is None else chunkSize
+        self.rdfStreamWriter = None
+        if self.isRdfFile:
             self.turtleFile = database
         else:
             connectionUrl = "http://{0}:{1}".format(host, port or '80')
@@ -205,7 +298,9 @@ class XbrlSemanticRdfDatabaseConnection():
         
     def close(self, rollback=False):
         try:
-            if not (self.isRdfTurtleFile or self.isRdfXmlFile):
+            if self.rdfStreamWriter is not None: # uncommitted triples are discarded
+                self.rdfStreamWriter.close()
+            if not self.isRdfFile:
                 self.conn.close()
             self.__dict__.clear() # dereference everything
         except Exception as ex:
@@ -220,7 +315,11 @@ class XbrlSemanticRdfDatabaseConnection():
         self.modelXbrl.modelManager.showStatus(msg, clearAfter)
         
     def initializeGraph(self, graph=None):
-        g =  graph or DEFAULT_GRAPH_CLASS()
+        if graph is not None or self.isRdfXmlFile: # rdf/xml is serialized from a complete graph
+            g =  graph or DEFAULT_GRAPH_CLASS()
+        else:
+            g = self.rdfStreamWriter = RdfStreamWriter(self.rdfFormat, self.chunkSize,
+                                                       graphName=modelObjectDocumentUri(self.modelXbrl))
         g.bind("xml", XML)
         g.bind("xbrl", XBRL)
         g.bind("xbrli", XBRLI)
@@ -241,13 +340,14 @@ class XbrlSemanticRdfDatabaseConnection():
         g.bind("sec", SEC)
         return g
             
-    def execute(self, activity, graph=None, query=None):
-        if graph is not None:
+    def execute(self, activity, graph=None, query=None, data=None):
+        if graph is not None or data is not None:
             headers = {'User-agent':   'Arelle/1.0',
                        'Accept':       'application/sparql-results+json',
                        'Content-Type': "text/turtle; charset='UTF-8'"}
-            data = graph.serialize(format='pretty-xml' if self.isRdfXmlFile else 'turtle', 
-                                   encoding='utf=8')
+            if graph is not None:
+                data = graph.serialize(format='pretty-xml' if self.isRdfXmlFile else 'turtle', 
+                                       encoding='utf=8')
         elif query is not None:
             headers = {'User-agent':   'Arelle/1.0',
                        'Accept':       'application/sparql-results+json'}
@@ -259,12 +359,11 @@ class XbrlSemanticRdfDatabaseConnection():
             with io.open(TRACERDFFILE, "ab") as fh:
                 fh.write(b"\n\n>>> sent: \n")
                 fh.write(data)
-        if (self.isRdfTurtleFile or self.isRdfXmlFile) and data is not None:
+        if self.isRdfFile and data is not None:
             with io.open(self.turtleFile, "ab") as fh:
                 fh.write(data)
             return None
-        if graph is not None or query is not None:
-            url = self.url + "/sparql"
+        url = self.url + "/sparql"
         request = urllib.request.Request(url,
                                          data=data,
                                          headers=headers)
@@ -293,8 +392,19 @@ class XbrlSemanticRdfDatabaseConnection():
                                 activity=activity, error=error) 
         return results
     
+    def sparqlUpdate(self, data):
+        self.execute("Saving RDF Graph", data=data)
+    
     def commit(self, graph):
-        self.execute("Saving RDF Graph", graph=graph)
+        if isinstance(graph, RdfStreamWriter):
+            if self.isRdfFile:
+                with io.open(self.turtleFile, "ab") as fh:
+                    graph.commit(fh.write)
+            else:
+                graph.commit(self.sparqlUpdate)
+            self.rdfStreamWriter = None
+        else:
+            self.execute("Saving RDF Graph", graph=graph)
     
     def loadGraphRootVertices(self):
         self.showStatus("Load/Create graph root vertices")
@@ -422,7 +532,7 @@ class XbrlSemanticRdfDatabaseConnection():
         
     def identifyPreexistingDocuments(self):
         self.existingDocumentUris = set()
-        if not (self.isRdfTurtleFile or self.isRdfXmlFile):
+        if not self.isRdfFile:
             docFilters = []
             for modelDocument in self.modelXbrl.urlDocs.values():
                 if modelDocument.type == Type.SCHEMA:
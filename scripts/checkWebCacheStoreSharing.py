@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+#
+# this script checks a web cache store shared by concurrent processes: each process stores, reads,
+# updates check times of and materializes (into a cache directory beside the store) an overlapping set
+# of urls, and afterwards every url's stored content and materialized file are checked to be one of the
+# versions written for it (never partial or mixed).  To check a store on a network file system,
+# run it on (several) hosts with the store file on the shared file system and shared mode.
+#
+# usage: python scripts/checkWebCacheStoreSharing.py store-file [processes] [urls] [rounds] [shared]
+#
+#   shared: 1 to open the store as on a network file system (unix-dotfile locking, no mmap)
+#
+
+import os, sys, time, random, multiprocessing
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from arelle.WebCacheStore import WebCacheStore
+
+def urlContent(url, version):
+    # distinct size and content per version, long enough to span several database pages
+    return ("<!-- {0} version {1} -->\n".format(url, version) * (200 + version * 7)).encode("utf-8")
+
+def urlFilepath(cacheDir, url):
+    return os.path.join(cacheDir, url.rpartition("/")[2])
+
+def worker(storeFile, shared, processNumber, numUrls, numRounds, errors):
+    store = WebCacheStore(storeFile, sharedFileSystem=shared)
+    cacheDir = os.path.join(os.path.dirname(os.path.abspath(storeFile)), "materialized")
+    rand = random.Random(processNumber)
+    try:
+        for roundNumber in range(numRounds):
+            url = "http://example.com/doc{0}.xml".format(rand.randrange(numUrls))
+            version = rand.randrange(5)
+            action = rand.randrange(4)
+            if action == 0:
+                store.put(url, urlContent(url, version), 1000000000 + version, "2026-10-18T00:00:00 UTC")
+            elif action == 1:
+                content = store.content(url)
+                if content is not None and content not in [urlContent(url, v) for v in range(5)]:
+                    errors.put("process {0}: {1} content read is not a stored version".format(processNumber, url))
+            elif action == 2:
+                store.setCheckTime(url, "2026-10-18T00:00:{0:02} UTC".format(roundNumber % 60))
+            else:
+                store.materialize(url, urlFilepath(cacheDir, url))
+    except Exception as err:
+        errors.put("process {0}: {1}".format(processNumber, err))
+    store.close()
+
+def main():
+    if len(sys.argv) < 2:
+        print("usage: checkWebCacheStoreSharing.py store-file [processes] [urls] [rounds] [shared]")
+        sys.exit(2)
+    storeFile = sys.argv[1]
+    numProcesses = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    numUrls = int(sys.argv[3]) if len(sys.argv) > 3 else 20
+    numRounds = int(sys.argv[4]) if len(sys.argv) > 4 else 200
+    shared = len(sys.argv) > 5 and sys.argv[5] == "1"
+    WebCacheStore(storeFile, sharedFileSystem=shared).close() # create tables before workers start
+
+    errors = multiprocessing.Queue()
+    startedAt = time.time()
+    processes = [multiprocessing.Process(target=worker, args=(storeFile, shared, i, numUrls, numRounds, errors))
+                 for i in range(numProcesses)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    elapsed = time.time() - startedAt
+
+    errorMessages = []
+    while not errors.empty():
+        errorMessages.append(errors.get())
+    store = WebCacheStore(storeFile, sharedFileSystem=shared)
+    cacheDir = os.path.join(os.path.dirname(os.path.abspath(storeFile)), "materialized")
+    numStored = 0
+    for i in range(numUrls):
+        url = "http://example.com/doc{0}.xml".format(i)
+        versions = [urlContent(url, v) for v in range(5)]
+        content = store.content(url)
+        if content is not None:
+            numStored += 1
+            if content not in versions:
+                errorMessages.append("{0} stored content is not a stored version".format(url))
+        filepath = urlFilepath(cacheDir, url)
+        if os.path.exists(filepath):
+            with open(filepath, "rb") as fh:
+                if fh.read() not in versions:
+                    errorMessages.append("{0} materialized file is not a stored version".format(url))
+    if os.path.isdir(cacheDir):
+        for fileName in os.listdir(cacheDir):
+            if fileName.endswith(".tmp"):
+                errorMessages.append("temporary file left: {0}".format(fileName))
+    store.close()
+
+    print("{0} processes, {1} rounds each, {2} of {3} urls stored, {4:.2f} sec, {5} locking".format(
+          numProcesses, numRounds, numStored, numUrls, elapsed, "unix-dotfile" if shared else "posix"))
+    for message in errorMessages:
+        print(message)
+    if errorMessages:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+#
+# this script times loading of a synthetic multi-document inline XBRL document set served by a local
+# web server (with a per-request latency, as a remote filing system), serially (prefetchWorkers 0) and
+# with the inlineXbrlDocumentSet plug-in prefetching the set's documents concurrently
+#
+# usage: python scripts/timeIxdsLoad.py [documents] [facts per document] [latency ms] [prefetch workers]
+#
+
+import os, sys, time, shutil, tempfile, threading
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if sys.version[0] >= '3':
+    from http.server import HTTPServer, SimpleHTTPRequestHandler
+    from socketserver import ThreadingMixIn
+else:
+    from BaseHTTPServer import HTTPServer
+    from SimpleHTTPServer import SimpleHTTPRequestHandler
+    from SocketServer import ThreadingMixIn
+from arelle import Cntlr, PluginManager
+
+class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+def writeDocumentSet(docDir, numDocuments, numFacts):
+    with open(os.path.join(docDir, "bm.xsd"), "w") as fh:
+        fh.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                 '<schema xmlns="http://www.w3.org/2001/XMLSchema" xmlns:xbrli="http://www.xbrl.org/2003/instance"\n'
+                 ' targetNamespace="http://example.com/bm" elementFormDefault="qualified">\n'
+                 ' <import namespace="http://www.xbrl.org/2003/instance" schemaLocation="http://www.xbrl.org/2003/xbrl-instance-2003-12-31.xsd"/>\n')
+        for j in range(numFacts):
+            fh.write(' <element name="Amount{0}" id="bm_Amount{0}" type="xbrli:monetaryItemType" substitutionGroup="xbrli:item"'
+                     ' xbrli:periodType="duration" nillable="true"/>\n'.format(j))
+        fh.write('</schema>\n')
+    for i in range(numDocuments):
+        with open(os.path.join(docDir, "doc{0}.htm".format(i)), "w") as fh:
+            fh.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                     '<html xmlns="http://www.w3.org/1999/xhtml" xmlns:ix="http://www.xbrl.org/2008/inlineXBRL"\n'
+                     ' xmlns:xbrli="http://www.xbrl.org/2003/instance" xmlns:link="http://www.xbrl.org/2003/linkbase"\n'
+                     ' xmlns:xlink="http://www.w3.org/1999/xlink" xmlns:iso4217="http://www.xbrl.org/2003/iso4217"\n'
+                     ' xmlns:bm="http://example.com/bm">\n'
+                     '<head><title>document {0}</title></head>\n<body>\n'
+                     '<div style="display:none"><ix:header><ix:references>'
+                     '<link:schemaRef xlink:type="simple" xlink:href="bm.xsd"/></ix:references>\n'.format(i))
+            if i == 0: # contexts and units are in the first document of the set
+                fh.write('<ix:resources><xbrli:context id="c"><xbrli:entity>'
+                         '<xbrli:identifier scheme="http://example.com">bm</xbrli:identifier></xbrli:entity>'
+                         '<xbrli:period><xbrli:startDate>2013-01-01</xbrli:startDate><xbrli:endDate>2013-12-31</xbrli:endDate>'
+                         '</xbrli:period></xbrli:context>'
+                         '<xbrli:unit id="u"><xbrli:measure>iso4217:USD</xbrli:measure></xbrli:unit></ix:resources>\n')
+            fh.write('</ix:header></div>\n<table>\n')
+            for j in range(numFacts):
+                fh.write('<tr><td>Amount {0}</td><td><ix:nonFraction name="bm:Amount{0}" contextRef="c" unitRef="u" '
+                         'decimals="0">{1}</ix:nonFraction></td></tr>\n'.format(j, i * numFacts + j))
+            fh.write('</table>\n</body>\n</html>\n')
+    with open(os.path.join(docDir, "manifest.xml"), "w") as fh:
+        fh.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                 '<manifest xmlns="http://disclosure.edinet-fsa.go.jp/2013/manifest">\n'
+                 ' <instance id="bm" preferredFilename="bm.xbrl">\n')
+        for i in range(numDocuments):
+            fh.write('  <ixbrl>doc{0}.htm</ixbrl>\n'.format(i))
+        fh.write(' </instance>\n</manifest>\n')
+
+def main():
+    numDocuments = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    numFacts = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    latency = (int(sys.argv[3]) if len(sys.argv) > 3 else 100) / 1000.0
+    workers = int(sys.argv[4]) if len(sys.argv) > 4 else 4
+
+    docDir = tempfile.mkdtemp()
+    writeDocumentSet(docDir, numDocuments, numFacts)
+    class LatencyRequestHandler(SimpleHTTPRequestHandler):
+        def translate_path(self, path):
+            return os.path.join(docDir, path.lstrip("/").partition("?")[0])
+        def do_GET(self):
+            time.sleep(latency)
+            SimpleHTTPRequestHandler.do_GET(self)
+        def log_message(self, format, *args):
+            pass
+    server = ThreadingHTTPServer(("127.0.0.1", 0), LatencyRequestHandler)
+    serverThread = threading.Thread(target=server.serve_forever)
+    serverThread.daemon = True
+    serverThread.start()
+    baseUrl = "http://127.0.0.1:{0}/".format(server.server_address[1])
+
+    cntlr = Cntlr.Cntlr(logFileName="logToPrint")
+    PluginManager.addPluginModule("inlineXbrlDocumentSet") # as by --plugins, not saved
+    PluginManager.reset()
+    # the plug-in module as loaded by the plug-in manager, to set its prefetchWorkers
+    inlineXbrlDocumentSet = None
+    for pluginMethod in PluginManager.pluginClassMethods("ModelDocument.Discover"):
+        if pluginMethod.__name__ == "discoverInlineXbrlDocumentSet":
+            inlineXbrlDocumentSet = sys.modules[pluginMethod.__module__]
+    if inlineXbrlDocumentSet is None:
+        print("inlineXbrlDocumentSet plug-in not loadable")
+        sys.exit(1)
+    webCache = cntlr.webCache
+    serverCacheDir = os.path.dirname(webCache.urlToCacheFilepath(baseUrl + "manifest.xml"))
+
+    def timeLoad(prefetchWorkers):
+        # documents of the set are not cached, the standard taxonomy schemas are
+        if os.path.exists(serverCacheDir):
+            shutil.rmtree(serverCacheDir)
+        for url in list(webCache.cachedUrlCheckTimes.keys()):
+            if url.startswith(baseUrl):
+                del webCache.cachedUrlCheckTimes[url]
+        inlineXbrlDocumentSet.prefetchWorkers = prefetchWorkers
+        startedAt = time.time()
+        modelXbrl = cntlr.modelManager.load(baseUrl + "manifest.xml")
+        loadTime = time.time() - startedAt
+        numLoadedFacts = len(modelXbrl.facts)
+        cntlr.modelManager.close(modelXbrl)
+        return loadTime, numLoadedFacts
+
+    timeLoad(workers) # caches the standard taxonomy schemas, imports modules
+    serialTime, serialFacts = timeLoad(0)
+    parallelTime, parallelFacts = timeLoad(workers)
+    print("{0} documents of {1} facts, {2:.0f} ms latency per request".format(numDocuments, numFacts, latency * 1000))
+    print("serial load: {0:.3f} sec, {1} facts".format(serialTime, serialFacts))
+    print("{0} prefetch workers: {1:.3f} sec, {2} facts".format(workers, parallelTime, parallelFacts))
+
+    server.shutdown()
+    shutil.rmtree(docDir)
+    if os.path.exists(serverCacheDir):
+        shutil.rmtree(serverCacheDir)
+    if serialFacts != parallelFacts:
+        print("loaded facts differ")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+#!/usr/bin/env python
+#
+# this script times the ModelValue qname constructors and qname keyed dict lookups,
+# with qnames interned (as by default) and with interning turned off
+#
+# usage: python scripts/timeQNamePool.py [number of distinct qnames] [repetitions]
+#
+
+import os, sys, timeit
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from arelle import ModelValue
+
+def main():
+    numQnames = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    repetitions = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    # as parsed from a typical instance: few namespaces, each name seen many times
+    namespaces = ["http://xbrl.sec.gov/dei/2013-01-31",
+                  "http://fasb.org/us-gaap/2013-01-31",
+                  "http://www.example.com/20131231"]
+    clarkNames = ["{{{0}}}Concept{1}".format(namespaces[i % len(namespaces)], i)
+                  for i in range(numQnames)]
+    nsLocalNames = [name[1:].partition('}')[::2] for name in clarkNames]
+
+    defaultPoolMaxSize = ModelValue.qnamePoolMaxSize
+    for label, poolMaxSize in (("interned", defaultPoolMaxSize), ("not interned", 0)):
+        ModelValue.qnamePoolMaxSize = poolMaxSize
+        ModelValue.qnamePool.clear()
+        ModelValue.clarkNameQnames.clear()
+        conceptsByQname = dict((ModelValue.qnameClarkName(name), name) for name in clarkNames)
+        timeClark = timeit.timeit(lambda: [ModelValue.qnameClarkName(name) for name in clarkNames],
+                                  number=repetitions)
+        timeNsLocalName = timeit.timeit(lambda: [ModelValue.qnameNsLocalName(ns, ln) for ns, ln in nsLocalNames],
+                                        number=repetitions)
+        qnames = [ModelValue.qnameNsLocalName(ns, ln) for ns, ln in nsLocalNames]
+        timeLookup = timeit.timeit(lambda: [conceptsByQname[qn] for qn in qnames],
+                                   number=repetitions)
+        print("{0:>14}: qnameClarkName {1:.3f} sec, qnameNsLocalName {2:.3f} sec, dict lookup {3:.3f} sec, {4} of {5} lookups by the key object".format(
+              label, timeClark, timeNsLocalName, timeLookup, 
+              len(set(id(qn) for qn in qnames) & set(id(qn) for qn in conceptsByQname)), len(qnames)))
+    ModelValue.qnamePoolMaxSize = defaultPoolMaxSize
+    ModelValue.qnamePool.clear()
+    ModelValue.clarkNameQnames.clear()
+
+if __name__ == '__main__':
+    main()
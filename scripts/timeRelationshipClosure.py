@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+#
+# this script times descendant queries of a relationship set, by its closure index (as used by
+# isRelated for descendant axes) and by the recursive walk of fromModelObject relationships,
+# on a synthetic presentation-like tree with some multiple parents and a cycle,
+# checking that both give the same answers
+#
+# usage: python scripts/timeRelationshipClosure.py [number of nodes] [number of queries]
+#
+
+import os, sys, random, time, gettext
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from arelle import PythonUtil # define builtins as in Cntlr
+gettext.install("arelle")
+from arelle.ModelRelationshipSet import RelationshipClosureIndex
+
+class Relationship:
+    __slots__ = ("toModelObject",)
+    def __init__(self, toModelObject):
+        self.toModelObject = toModelObject
+
+class RelationshipSet:
+    # stands in for a ModelRelationshipSet, only fromModelObjects is used by the index
+    def __init__(self, relationshipsFrom):
+        self.relationshipsFrom = relationshipsFrom
+    def fromModelObjects(self):
+        return self.relationshipsFrom
+    def fromModelObject(self, modelFrom):
+        return self.relationshipsFrom.get(modelFrom, ())
+
+def isDescendant(relSet, modelFrom, modelTo, visited):
+    # the recursive walk of isRelated for a descendant axis
+    for rel in relSet.fromModelObject(modelFrom):
+        toConcept = rel.toModelObject
+        if toConcept == modelTo:
+            return True
+        if toConcept not in visited:
+            visited.add(toConcept)
+            if isDescendant(relSet, toConcept, modelTo, visited):
+                return True
+            visited.discard(toConcept)
+    return False
+
+def main():
+    numNodes = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    numQueries = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    random.seed(1)
+    relationshipsFrom = {}
+    for node in range(1, numNodes):
+        parent = random.randrange(max(0, node - 20), node) # deep and narrow, as presentation trees
+        relationshipsFrom.setdefault(parent, []).append(Relationship(node))
+        if node % 50 == 0: # a second parent
+            relationshipsFrom.setdefault(random.randrange(node), []).append(Relationship(node))
+    relationshipsFrom.setdefault(numNodes - 1, []).append(Relationship(numNodes // 2)) # a cycle
+    relSet = RelationshipSet(relationshipsFrom)
+    queries = [(random.randrange(numNodes), random.randrange(numNodes)) for i in range(numQueries)]
+
+    startedAt = time.time()
+    closureIndex = RelationshipClosureIndex(relSet)
+    indexBuildTime = time.time() - startedAt
+    startedAt = time.time()
+    indexAnswers = [closureIndex.isReachable(modelFrom, modelTo) for modelFrom, modelTo in queries]
+    indexQueryTime = time.time() - startedAt
+
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), numNodes + 100))
+    startedAt = time.time()
+    walkAnswers = [isDescendant(relSet, modelFrom, modelTo, set()) for modelFrom, modelTo in queries]
+    walkQueryTime = time.time() - startedAt
+
+    print("{0} nodes, {1} queries, {2} related".format(numNodes, numQueries, sum(indexAnswers)))
+    print("closure index: build {0:.3f} sec, queries {1:.3f} sec".format(indexBuildTime, indexQueryTime))
+    print("recursive walk: queries {0:.3f} sec".format(walkQueryTime))
+    if indexAnswers != walkAnswers:
+        print("answers differ for {0} queries".format(sum(a != b for a, b in zip(indexAnswers, walkAnswers))))
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()